@@ -1,3 +1,4 @@
+import logging
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -5,8 +6,21 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.staticfiles import StaticFiles
 from whitenoise import WhiteNoise
 from app.config import settings
+from app.db import engine, replica_router
 from app.routes import register_routers
+from app.services.activity_log_export_service import delete_expired_exports
+from app.utils.activity_log_archive import activity_log_archive
+from app.utils.activity_log_partitions import activity_log_partitions
+from app.utils.activity_log_policy import activity_log_aggregator
+from app.utils.activity_log_writer import activity_log_writer
+from app.utils.activity_rollup import activity_rollup
+from app.utils.api_key_usage import APIKeyUsageMiddleware, api_key_usage
+from app.utils.password_hasher import password_hasher
+from app.utils.permission_cache import permission_cache
+from app.utils.rate_limit import PostgresRateLimitBackend, RateLimitMiddleware, rate_limiter
+from app.utils.scheduler import scheduler
 
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Identity Services API", version="1.0")
 
@@ -31,9 +45,69 @@ app.add_middleware(
     TrustedHostMiddleware, allowed_hosts=allowed_hosts
 )
 
-# Ensure 'static/exports' directory exists
-STATIC_DIR = "static"
-EXPORTS_DIR = os.path.join(STATIC_DIR, "exports")
+# Count requests made with API keys (flushed by the "api-key-usage" job)
+app.add_middleware(APIKeyUsageMiddleware)
+
+# Added after the usage meter so it runs first: over-limit requests are turned away before
+# any dependency touches the DB or bcrypt (and are not metered)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
+# Periodic background jobs (the first run happens at startup)
+scheduler.register(
+    "activity-log-partitions",
+    settings.ACTIVITY_LOG_PARTITION_CHECK_INTERVAL_SECONDS,
+    activity_log_partitions.maintain,
+)
+if settings.ACTIVITY_LOG_ARCHIVE_AFTER_DAYS > 0:
+    scheduler.register(
+        "activity-log-archive",
+        settings.ACTIVITY_LOG_ARCHIVE_CHECK_INTERVAL_SECONDS,
+        activity_log_archive.run,
+    )
+# Staff permissions for permission_required (misses still load on demand)
+scheduler.register(
+    "permission-cache-warm",
+    settings.PERMISSION_CACHE_TTL_SECONDS / 2,
+    permission_cache.warm,
+)
+scheduler.register(
+    "activity-log-aggregates",
+    settings.ACTIVITY_LOG_AGGREGATE_FLUSH_INTERVAL_SECONDS,
+    activity_log_aggregator.flush,
+)
+scheduler.register(
+    "api-key-usage",
+    settings.API_KEY_USAGE_FLUSH_INTERVAL_SECONDS,
+    api_key_usage.flush,
+)
+scheduler.register(
+    "activity-rollup",
+    settings.ACTIVITY_ROLLUP_INTERVAL_SECONDS,
+    activity_rollup.run,
+)
+scheduler.register(
+    "activity-log-export-cleanup",
+    settings.ACTIVITY_LOG_EXPORT_CLEANUP_INTERVAL_SECONDS,
+    delete_expired_exports,
+)
+if isinstance(rate_limiter.backend, PostgresRateLimitBackend):
+    scheduler.register(
+        "rate-limit-prune",
+        settings.RATE_LIMIT_PRUNE_INTERVAL_SECONDS,
+        rate_limiter.backend.prune,
+    )
+if replica_router.replicas:
+    scheduler.register(
+        "replica-health-check",
+        settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS,
+        replica_router.check_health,
+    )
+
+# Ensure the static and (non-public) exports directories exist
+STATIC_DIR = settings.STATIC_DIR
+EXPORTS_DIR = settings.EXPORTS_DIR
+os.makedirs(STATIC_DIR, exist_ok=True)
 os.makedirs(EXPORTS_DIR, exist_ok=True)
 
 # Mount static files
@@ -46,6 +120,34 @@ app.add_middleware(
     prefix="static/"
 )
 
+@app.on_event("startup")
+async def start_background_workers():
+    password_hasher.start()
+    activity_log_writer.start()
+    scheduler.start()
+
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    await scheduler.stop()
+    # Persist the counters of aggregated activity types
+    try:
+        await activity_log_aggregator.flush()
+    except Exception:
+        logger.exception("Final activity log aggregate flush failed")
+    # Persist API-key usage counted since the last flush
+    try:
+        await api_key_usage.flush()
+    except Exception:
+        logger.exception("Final API key usage flush failed")
+    # Replay spilled activity logs; whatever the DB does not take stays on disk for the next start
+    activity_log_writer.stop()
+    password_hasher.stop()
+    await rate_limiter.backend.dispose()
+    await replica_router.dispose()
+    await engine.dispose()
+
+
 # Define API prefix
 api_prefix = "/api/v1"
 
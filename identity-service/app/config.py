@@ -2,6 +2,19 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+
+    # Connection pool (per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Read replicas (comma-separated async URLs, empty = primary only)
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = 5.0
+    READ_YOUR_WRITES_WINDOW_SECONDS: float = 5.0
+
     ALLOWED_HOSTS: str = "localhost"
     CORS_ORIGINS: str = "*"
 
@@ -10,6 +23,90 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15 
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7    
 
+    # Activity-log writer: local spill log (one directory per process) replayed into the DB
+    ACTIVITY_LOG_SPILL_DIR: str = "var/activity-log"
+    ACTIVITY_LOG_SPILL_SEGMENT_BYTES: int = 16 * 1024 * 1024
+    ACTIVITY_LOG_SPILL_FSYNC_INTERVAL_SECONDS: float = 0.2
+    ACTIVITY_LOG_SPILL_MAX_BYTES: int = 1024 * 1024 * 1024
+    ACTIVITY_LOG_BATCH_SIZE: int = 500
+    ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS: float = 1.0
+    ACTIVITY_LOG_DIMENSION_CACHE_SIZE: int = 10000  # LRU entries per dimension (user agents, IPs)
+
+    # activity_logs range partitions on timestamp ("day" or "month") and retention
+    ACTIVITY_LOG_PARTITION_INTERVAL: str = "month"
+    ACTIVITY_LOG_PARTITIONS_AHEAD: int = 3
+    ACTIVITY_LOG_PARTITION_CHECK_INTERVAL_SECONDS: float = 3600.0
+    ACTIVITY_LOG_RETENTION_DAYS: int = 0  # 0 = keep everything
+    ACTIVITY_LOG_RETENTION_MODE: str = "detach"  # "detach" keeps expired partitions as tables, "drop" deletes them
+
+    # Cold archive: partitions that ended more than ARCHIVE_AFTER_DAYS ago (and any detached ones) are
+    # written to compressed, indexed files in ARCHIVE_DIR and dropped. 0 = off. Keep RETENTION_DAYS at 0
+    # or above ARCHIVE_AFTER_DAYS, so partitions are archived before retention could drop them.
+    ACTIVITY_LOG_ARCHIVE_AFTER_DAYS: int = 0
+    ACTIVITY_LOG_ARCHIVE_DIR: str = "var/activity-archive"  # shared by all app hosts
+    ACTIVITY_LOG_ARCHIVE_BLOCK_ROWS: int = 2000  # rows per compressed block (the sparse index granularity)
+    ACTIVITY_LOG_ARCHIVE_CHECK_INTERVAL_SECONDS: float = 3600.0
+
+    # Per-activity-type logging policy: "pattern=persist|aggregate|sample:<percent>", comma-separated.
+    # login_failed, login_blocked, *_denied and *_error are always persisted.
+    ACTIVITY_LOG_POLICY: str = (
+        "session_validate_success=aggregate,get_user_success=aggregate,list_users_success=aggregate,"
+        "api_key_get_success=aggregate,api_key_list=aggregate,list_staff=aggregate,get_staff_success=aggregate,"
+        "activity_log_list=aggregate,activity_stats_get=aggregate,kyc_get_latest=sample:10"
+    )
+    ACTIVITY_LOG_DEFAULT_POLICY: str = "persist"
+    ACTIVITY_LOG_AGGREGATE_BUCKET_SECONDS: int = 300
+    ACTIVITY_LOG_AGGREGATE_FLUSH_INTERVAL_SECONDS: float = 30.0
+
+    # Hourly activity rollups behind /stats/activity
+    ACTIVITY_ROLLUP_INTERVAL_SECONDS: float = 60.0
+    ACTIVITY_ROLLUP_LAG_SECONDS: int = 120  # hours are rolled up once they ended this long ago
+    ACTIVITY_ROLLUP_LOOKBACK_HOURS: int = 1  # re-done every run to catch late writes
+    ACTIVITY_ROLLUP_MAX_HOURS_PER_RUN: int = 24
+
+    # Activity-log exports (files land in EXPORTS_DIR, outside STATIC_DIR: they are only
+    # downloaded through /activity-logs/exports/{id}/download, and deleted after RETENTION_HOURS)
+    STATIC_DIR: str = "static"
+    EXPORTS_DIR: str = "var/exports"  # shared by all app hosts
+    ACTIVITY_LOG_EXPORT_RETENTION_HOURS: float = 24.0
+    ACTIVITY_LOG_EXPORT_CLEANUP_INTERVAL_SECONDS: float = 600.0
+    ACTIVITY_LOG_EXPORT_CHUNK_SIZE: int = 5000
+    ACTIVITY_LOG_EXPORT_STREAM_MAX_DAYS: int = 31
+
+    # Verified access-token cache
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: float = 60.0
+
+    # Staff permission cache (per staff id, warmed at startup)
+    PERMISSION_CACHE_MAX_ENTRIES: int = 10000
+    PERMISSION_CACHE_TTL_SECONDS: float = 300.0
+
+    # Verified API-key cache (per key id)
+    API_KEY_CACHE_MAX_ENTRIES: int = 10000
+    API_KEY_CACHE_TTL_SECONDS: float = 60.0
+
+    # API-key usage meter: per-key hourly counters, flushed as batched upserts
+    API_KEY_USAGE_FLUSH_INTERVAL_SECONDS: float = 30.0
+    API_KEY_USAGE_FLUSH_BATCH_ROWS: int = 1000
+
+    # Rate limiting: token buckets per route group ("path-prefix=requests/seconds", longest prefix
+    # wins) and caller (user, API key or client IP). Backend "memory" keeps buckets per process;
+    # "postgres" shares them between workers through the rate_limit_buckets table.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: str = "/auth/login=10/60,/auth=30/60,/=300/60"
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_SHARDS: int = 16
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_DB_POOL_SIZE: int = 4
+    RATE_LIMIT_PRUNE_INTERVAL_SECONDS: float = 300.0
+
+    # POST /authz/check: most checks answered per request
+    AUTHZ_CHECK_MAX_BATCH: int = 500
+
+    # bcrypt process pool (0 workers = one per CPU core)
+    PASSWORD_HASH_WORKERS: int = 0
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
     model_config = SettingsConfigDict(
         env_file=".env",
         extra="ignore"
@@ -1,21 +1,90 @@
 from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
-from app.utils.config import settings
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from app.config import settings
+from app.utils.pool_metrics import InstrumentedQueuePool
+from app.utils.replica_router import Replica, ReplicaRouter, client_key
 
 # --- Database URL (async driver, e.g., postgresql+asyncpg://...) ---
 DATABASE_URL: str = settings.DATABASE_URL
+REPLICA_URLS = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
 
-# --- Async engine & session factory ---
-engine = create_async_engine(DATABASE_URL, echo=False, future=True)
+
+def create_engine_from_settings(url: str) -> AsyncEngine:
+    """Async engine with the pool sizing from Settings and checkout instrumentation."""
+    return create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+
+# --- Sync session classes (AsyncSession wraps one of these) ---
+class PrimarySession(Session):
+    """Read/write session on the primary; commits with writes start read-your-writes stickiness."""
+
+
+class ReadOnlySession(Session):
+    """Session bound to a replica (or the primary as fallback); refuses to flush changes."""
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _remember_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _mark_client_write(session):
+    if session.info.pop("wrote", False):
+        replica_router.mark_write(session.info.get("client_key"))
+
+
+@event.listens_for(ReadOnlySession, "before_flush")
+def _reject_write(session, flush_context, instances):
+    if session.new or session.dirty or session.deleted:
+        raise InvalidRequestError("Attempted to write through a read-only session")
+
+
+# --- Async engines & session factories ---
+engine = create_engine_from_settings(DATABASE_URL)
+
+replica_router = ReplicaRouter(
+    primary=engine,
+    replicas=[Replica(engine=create_engine_from_settings(url)) for url in REPLICA_URLS],
+    sticky_window=settings.READ_YOUR_WRITES_WINDOW_SECONDS,
+)
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
     class_=AsyncSession,
     expire_on_commit=False,
+    sync_session_class=PrimarySession,
 )
 
-# --- FastAPI dependency ---
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+ReadSessionLocal = sessionmaker(
+    class_=AsyncSession,
+    expire_on_commit=False,
+    sync_session_class=ReadOnlySession,
+)
+
+# --- FastAPI dependencies ---
+async def get_db(request: Request = None) -> AsyncGenerator[AsyncSession, None]:
+    """Session on the primary. `request` is optional so scripts and jobs can use it too."""
     async with AsyncSessionLocal() as session:
+        session.info["client_key"] = client_key(request)
+        yield session
+
+
+async def get_read_db(request: Request = None) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only units of work, routed to a replica when that is safe."""
+    async with ReadSessionLocal(bind=replica_router.engine_for_read(client_key(request))) as session:
         yield session
@@ -1,4 +1,18 @@
-from app.models.user import User
-from app.models.session import Session
-from app.models.role import Role, UserRoles
-from app.models.api_key import APIKey
+from app.models.base_model import Base, BaseModel
+from app.models.user_model import User, UserStatus
+from app.models.staff_model import Staff, StaffRole, Department
+from app.models.permission_model import Permission, staff_permissions
+from app.models.session_model import Session
+from app.models.api_key_model import APIKey, api_key_permissions
+from app.models.api_key_usage_model import APIKeyUsage
+from app.models.kyc_model import KYCVerification, KYCStatus
+from app.models.activity_log_model import ActivityLog
+from app.models.activity_dimension_model import UserAgent, IPAddress
+from app.models.activity_log_aggregate_model import ActivityLogAggregate
+from app.models.activity_rollup_model import (
+    ActivityRollupHourly,
+    ActivityRollupHourlyIP,
+    ActivityRollupHourlyUser,
+    ActivityRollupState,
+)
+from app.models.rate_limit_model import RateLimitBucket
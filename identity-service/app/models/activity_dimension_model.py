@@ -0,0 +1,37 @@
+import hashlib
+from typing import Optional
+from sqlalchemy import Column, Integer, Text, LargeBinary, Identity, Index
+from sqlalchemy.dialects.postgresql import INET
+from app.models.base_model import Base
+
+
+# Distinct user agents and IP addresses seen in activity_logs, interned so that each log
+# row stores two small integer keys instead of the repeated strings. The activity-log
+# writer resolves ids by `hash` (SHA-256 of the value), through an in-process LRU
+# (app.utils.activity_dimensions), so the unique index stays small however long the user
+# agents get.
+
+def content_hash(value: Optional[str]) -> Optional[bytes]:
+    """SHA-256 of the UTF-8 value; the same as sha256(convert_to(value, 'UTF8')) in PostgreSQL."""
+    return hashlib.sha256(value.encode()).digest() if value is not None else None
+
+
+class UserAgent(Base):
+    __tablename__ = "user_agents"
+
+    id = Column(Integer, Identity(), primary_key=True)
+    hash = Column(LargeBinary(32), nullable=False, unique=True)
+    value = Column(Text, nullable=False)
+
+
+class IPAddress(Base):
+    __tablename__ = "ip_addresses"
+
+    id = Column(Integer, Identity(), primary_key=True)
+    hash = Column(LargeBinary(32), nullable=False, unique=True)
+    value = Column(INET, nullable=False)
+
+    __table_args__ = (
+        # Subnet searches (value <<= '10.20.0.0/16') over the distinct addresses
+        Index("ix_ip_addresses_value", "value", postgresql_using="gist", postgresql_ops={"value": "inet_ops"}),
+    )
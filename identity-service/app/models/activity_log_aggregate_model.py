@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, BigInteger, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.base_model import BaseModel
+
+
+class ActivityLogAggregate(BaseModel):
+    """Event counts for activity types that are aggregated (or sampled) instead of logged row by row."""
+    __tablename__ = "activity_log_aggregates"
+
+    activity_type = Column(String(100), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+    bucket_seconds = Column(Integer, nullable=False)
+    count = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        # Flushes add to the existing count for the same key (anonymous events share user_id NULL)
+        UniqueConstraint(
+            "bucket_start", "activity_type", "user_id",
+            name="uq_activity_log_aggregates_key",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
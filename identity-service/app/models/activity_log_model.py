@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.models.base_model import BaseModel
@@ -8,11 +8,37 @@ from app.models.base_model import BaseModel
 class ActivityLog(BaseModel):
     __tablename__ = "activity_logs"
 
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    activity_type = Column(String(100), nullable=False, index=True)
+    # NULL for events without an authenticated subject (e.g. login_failed)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    activity_type = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
-    ip_address = Column(String(45), nullable=True, index=True)
-    user_agent = Column(Text, nullable=True)
-    timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    # Interned in the user_agents / ip_addresses dimension tables
+    ip_address_id = Column(Integer, ForeignKey("ip_addresses.id"), nullable=True)
+    user_agent_id = Column(Integer, ForeignKey("user_agents.id"), nullable=True)
+    # Partition key, so part of the primary key (id, timestamp)
+    timestamp = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), primary_key=True)
 
     user = relationship("User", back_populates="activity_logs")
+    # Many-to-one on tiny tables: joined in the same SELECT, never lazy-loaded
+    ip = relationship("IPAddress", lazy="joined")
+    agent = relationship("UserAgent", lazy="joined")
+
+    __table_args__ = (
+        # Keyset pagination (timestamp, id), overall and per user
+        Index("ix_activity_logs_timestamp_id", "timestamp", "id"),
+        Index("ix_activity_logs_user_id_timestamp_id", "user_id", "timestamp", "id"),
+        # Filter by type, newest first
+        Index("ix_activity_logs_activity_type_timestamp", "activity_type", "timestamp"),
+        # Filter by IP address, newest first
+        Index("ix_activity_logs_ip_address_id_timestamp", "ip_address_id", "timestamp"),
+        # Range partitions are created and retired by app.utils.activity_log_partitions
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+
+    @property
+    def ip_address(self):
+        return str(self.ip.value) if self.ip else None
+
+    @property
+    def user_agent(self):
+        return self.agent.value if self.agent else None
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, String, DateTime, BigInteger, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.base_model import Base
+
+
+# Hourly rollups of activity_logs (plus the policy aggregates), maintained by
+# app.utils.activity_rollup and read by the /stats/activity endpoint.
+
+class ActivityRollupHourly(Base):
+    __tablename__ = "activity_rollup_hourly"
+
+    hour = Column(DateTime(timezone=True), primary_key=True)
+    activity_type = Column(String(100), primary_key=True)
+    count = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        # Per-type series over a range
+        Index("ix_activity_rollup_hourly_activity_type_hour", "activity_type", "hour"),
+    )
+
+
+class ActivityRollupHourlyIP(Base):
+    __tablename__ = "activity_rollup_hourly_ip"
+
+    hour = Column(DateTime(timezone=True), primary_key=True)
+    activity_type = Column(String(100), primary_key=True)
+    ip_address = Column(String(45), primary_key=True)
+    count = Column(BigInteger, nullable=False)
+
+
+class ActivityRollupHourlyUser(Base):
+    __tablename__ = "activity_rollup_hourly_user"
+
+    hour = Column(DateTime(timezone=True), primary_key=True)
+    activity_type = Column(String(100), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+    count = Column(BigInteger, nullable=False)
+
+
+class ActivityRollupState(Base):
+    """Rollup watermark: every hour before `watermark` has been rolled up."""
+    __tablename__ = "activity_rollup_state"
+
+    name = Column(String(50), primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=False)
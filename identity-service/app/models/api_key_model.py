@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Table
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Table, Index, BigInteger
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.models.base_model import BaseModel
@@ -7,19 +7,33 @@ from app.models.base_model import BaseModel
 class APIKey(BaseModel):
     __tablename__ = "api_keys"
 
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), index=True)
-    key_hash = Column(String(255), nullable=False, index=True)
-    secret = Column(String(128), nullable=False, index=True)               
-    is_active = Column(Boolean, default=True, index=True)
-    expires_at = Column(DateTime, nullable=True, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"))
+    # Public part of the key ("krypta_<key_id>.<secret>"); NULL for keys created before the format
+    key_id = Column(String(16), nullable=True)
+    # SHA-256 of the whole key, which itself is never stored
+    key_hash = Column(String(255), nullable=False)
+    is_active = Column(Boolean, default=True)
+    expires_at = Column(DateTime, nullable=True)
+    # Latest request made with the key, written by the usage meter's periodic flush
+    last_used_at = Column(DateTime(timezone=True), nullable=True)
+    # Bit `Permission.bit` set per granted permission; kept in sync with `permissions` by api_key_service
+    permission_mask = Column(BigInteger, nullable=False, default=0, server_default="0")
 
     user = relationship("User", back_populates="api_keys")
     permissions = relationship("Permission", secondary="api_key_permissions") 
 
+    __table_args__ = (
+        # Keyset pagination (date_created, id), overall and per user
+        Index("ix_api_keys_date_created_id", "date_created", "id"),
+        Index("ix_api_keys_user_id_date_created_id", "user_id", "date_created", "id"),
+        # Authentication finds a presented key by its key id (one point read)
+        Index("ix_api_keys_key_id", "key_id", unique=True),
+    )
+
 
 api_key_permissions = Table(
     "api_key_permissions",
     BaseModel.metadata,
-    Column("api_key_id", ForeignKey("api_keys.id", ondelete="CASCADE"), primary_key=True, index=True),
+    Column("api_key_id", ForeignKey("api_keys.id", ondelete="CASCADE"), primary_key=True),
     Column("permission_id", ForeignKey("permissions.id", ondelete="CASCADE"), primary_key=True, index=True),
 )
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, DateTime, ForeignKey, BigInteger, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.base_model import BaseModel
+
+
+class APIKeyUsage(BaseModel):
+    """Requests (and failed requests) made with an API key, per hour."""
+    __tablename__ = "api_key_usage"
+
+    api_key_id = Column(UUID(as_uuid=True), ForeignKey("api_keys.id", ondelete="CASCADE"), nullable=False)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+    requests = Column(BigInteger, nullable=False, default=0)
+    errors = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        # Flushes add to the existing counts for the same key and hour; also serves per-key range reads
+        UniqueConstraint("api_key_id", "bucket_start", name="uq_api_key_usage_key"),
+    )
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Date, Text, Enum, ForeignKey
+from sqlalchemy import Column, String, Date, Text, Enum, ForeignKey, Index, desc
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from app.models.base_model import BaseModel
 import enum
 
@@ -17,19 +17,24 @@ class KYCVerification(BaseModel):
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     full_name = Column(String(255), nullable=True)
     date_of_birth = Column(Date, nullable=True)
-    nationality = Column(String(100), nullable=True, index=True)
+    nationality = Column(String(100), nullable=True)
     address_line1 = Column(String(255), nullable=True)
     address_line2 = Column(String(255), nullable=True)
-    city = Column(String(100), nullable=True, index=True)
-    state = Column(String(100), nullable=True, index=True)
+    city = Column(String(100), nullable=True)
+    state = Column(String(100), nullable=True)
     postal_code = Column(String(20), nullable=True)
     country = Column(String(100), nullable=True)
     document_type = Column(String(50), nullable=True)
     document_number = Column(String(100), nullable=True)
     document_image_url = Column(String(500), nullable=True)
     selfie_image_url = Column(String(500), nullable=True)
-    kyc_notes = Column(Text, nullable=True)
+    kyc_notes = deferred(Column(Text, nullable=True))
     status = Column(Enum(KYCStatus), default=KYCStatus.PENDING, index=True)
 
     # Relationship
     user = relationship("User", back_populates="kyc_verifications")
+
+    __table_args__ = (
+        # Latest KYC per user is a single index probe
+        Index("ix_kyc_verifications_user_id_date_created", "user_id", desc("date_created")),
+    )
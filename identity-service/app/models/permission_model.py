@@ -1,19 +1,35 @@
-from sqlalchemy import Column, String, ForeignKey, Table
+from sqlalchemy import Column, String, ForeignKey, Table, SmallInteger, Sequence
 from sqlalchemy.orm import relationship
 from app.models.base_model import BaseModel
 
+# Bit positions for the permission_mask columns (signed BIGINT, so 63 usable bits)
+MAX_PERMISSION_BIT = 62
+
+# Handed out once per permission and never reused, so a bit keeps its meaning in stored
+# masks and issued tokens even after its permission is deleted
+permission_bit_seq = Sequence(
+    "permissions_bit_seq", start=0, minvalue=0, maxvalue=MAX_PERMISSION_BIT, metadata=BaseModel.metadata
+)
+
 
 class Permission(BaseModel):
     __tablename__ = "permissions"
 
     name = Column(String(100), unique=True, nullable=False, index=True)
+    bit = Column(
+        SmallInteger, permission_bit_seq, server_default=permission_bit_seq.next_value(), unique=True, nullable=False
+    )
 
     staffs = relationship("Staff", secondary="staff_permissions", back_populates="permissions")
 
+    @property
+    def mask(self) -> int:
+        return 1 << self.bit
+
 
-UserPermissions = Table(
-    "user_permissions",
+staff_permissions = Table(
+    "staff_permissions",
     BaseModel.metadata,
-    Column("staff_id", ForeignKey("staffs.id", ondelete="CASCADE"), primary_key=True, index=True),
+    Column("staff_id", ForeignKey("staffs.id", ondelete="CASCADE"), primary_key=True),
     Column("permission_id", ForeignKey("permissions.id", ondelete="CASCADE"), primary_key=True, index=True),
 )
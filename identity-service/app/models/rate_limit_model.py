@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Text, Float, Boolean, DateTime
+from app.models.base_model import Base
+
+
+# Token buckets shared by every worker when RATE_LIMIT_BACKEND is "postgres"; written by
+# app.utils.rate_limit with one upsert per request. UNLOGGED: losing them in a crash only
+# resets the limits.
+
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+
+    key = Column(Text, primary_key=True)
+    tokens = Column(Float, nullable=False)
+    allowed = Column(Boolean, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
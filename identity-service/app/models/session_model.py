@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Index
+from sqlalchemy.dialects.postgresql import INET, UUID
 from sqlalchemy.orm import relationship
 from app.models.base_model import BaseModel
 
@@ -10,8 +10,13 @@ class Session(BaseModel):
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), index=True)
     refresh_token = Column(String(255), nullable=False, unique=True, index=True)
     user_agent = Column(String(255), nullable=True)
-    ip_address = Column(String(45), nullable=True, index=True)
-    is_valid = Column(Boolean, default=True, index=True)
-    expires_at = Column(DateTime, nullable=False, index=True)
+    ip_address = Column(INET, nullable=True)
+    is_valid = Column(Boolean, default=True)
+    expires_at = Column(DateTime, nullable=False)
 
     user = relationship("User", back_populates="sessions")
+
+    __table_args__ = (
+        # Subnet searches (ip_address <<= '10.20.0.0/16')
+        Index("ix_sessions_ip_address", "ip_address", postgresql_using="gist", postgresql_ops={"ip_address": "inet_ops"}),
+    )
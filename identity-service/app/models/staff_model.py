@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Enum, ForeignKey, Index
+from sqlalchemy import Column, Enum, ForeignKey, Index, BigInteger
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
@@ -28,8 +28,10 @@ class Staff(BaseModel):
     __tablename__ = "staffs"
 
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    department = Column(Enum(Department), nullable=False, default=Department.GENERAL, index=True)
-    role = Column(Enum(StaffRole), nullable=False, default=StaffRole.GENERAL, index=True)
+    department = Column(Enum(Department), nullable=False, default=Department.GENERAL)
+    role = Column(Enum(StaffRole), nullable=False, default=StaffRole.GENERAL)
+    # Bit `Permission.bit` set per granted permission; kept in sync with `permissions` by staff_service
+    permission_mask = Column(BigInteger, nullable=False, default=0, server_default="0")
 
     # --- Relationships ---
     permissions = relationship("Permission", secondary="staff_permissions", back_populates="staffs")
@@ -50,4 +52,6 @@ class Staff(BaseModel):
             unique=True,
             postgresql_where=(department == Department.SUPERUSER)
         ),
+        # Keyset pagination (date_created, id)
+        Index("ix_staffs_date_created_id", "date_created", "id"),
     )
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, String, Boolean, Enum, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from app.models.base_model import BaseModel
 import enum
 
@@ -18,24 +18,30 @@ class User(BaseModel):
     username = Column(String(50), unique=True, nullable=False, index=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
     phone_number = Column(String(20), nullable=False, index=True)
-    hashed_password = Column(String(255), nullable=False)
-    is_verified = Column(Boolean, default=False, index=True)
-    is_superuser = Column(Boolean, default=False, nullable=False, index=True)
-    status = Column(Enum(UserStatus), default=UserStatus.PENDING_KYC, index=True)
-    twofa_secret = Column(String(64), nullable=True)
+    # Secrets are only read by authentication, never by the per-request and list loads
+    hashed_password = deferred(Column(String(255), nullable=False), raiseload=True)
+    is_verified = Column(Boolean, default=False)
+    is_superuser = Column(Boolean, default=False, nullable=False)
+    status = Column(Enum(UserStatus), default=UserStatus.PENDING_KYC)
+    twofa_secret = deferred(Column(String(64), nullable=True), raiseload=True)
 
     __table_args__ = (
         Index("unique_superuser", "is_superuser", unique=True, postgresql_where=is_superuser.is_(True)),
+        # Keyset pagination (date_created, id)
+        Index("ix_users_date_created_id", "date_created", "id"),
     )
 
     # --- Relationships ---
+    # KYC history is only loaded on request (selectinload); use KYCService.get_latest_kyc for the newest record
     kyc_verifications = relationship(
         "KYCVerification",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="joined"
+        passive_deletes=True,
+        lazy="raise"
     )
-    permissions = relationship("Permission", secondary="user_permissions", back_populates="users")
-    api_keys = relationship("APIKey", back_populates="user")
-    sessions = relationship("Session", back_populates="user")
-    activity_logs = relationship("ActivityLog", back_populates="user", cascade="all, delete-orphan")
+    # Children are removed by the ON DELETE CASCADE foreign keys, never loaded just to be deleted
+    staff_profile = relationship("Staff", back_populates="user", uselist=False, passive_deletes=True)
+    api_keys = relationship("APIKey", back_populates="user", passive_deletes=True)
+    sessions = relationship("Session", back_populates="user", passive_deletes=True)
+    activity_logs = relationship("ActivityLog", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
@@ -1,15 +1,27 @@
 from fastapi import FastAPI
+from app.routes.activity_log_route import activity_log_router
 from app.routes.api_key_route import api_key_router
 from app.routes.auth_route import auth_router
+from app.routes.authz_route import authz_router
 from app.routes.kyc_routes import kyc_router
+from app.routes.metrics_route import metrics_router
+from app.routes.permission_route import permission_router
+from app.routes.session_route import session_router
 from app.routes.staff_route import staff_router
+from app.routes.stats_route import stats_router
 from app.routes.user_routes import user_router
 
 
 def register_routers(app: FastAPI):
     """Register all API routers here."""
+    app.include_router(activity_log_router)
     app.include_router(api_key_router)
     app.include_router(kyc_router)
+    app.include_router(metrics_router)
+    app.include_router(permission_router)
     app.include_router(auth_router)
+    app.include_router(authz_router)
+    app.include_router(session_router)
     app.include_router(staff_router)
+    app.include_router(stats_router)
     app.include_router(user_router)
\ No newline at end of file
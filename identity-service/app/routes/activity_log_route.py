@@ -0,0 +1,136 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from typing import Optional
+from datetime import datetime
+from app.schemas.activity_log_schema import (
+    ActivityLogExportCreate,
+    ActivityLogExportFilters,
+    ActivityLogExportJobResponse,
+    ActivityLogResponse,
+    ExportFormat,
+)
+from app.schemas.pagination_schema import Page
+from app.services import activity_log_export_service, activity_log_service
+from app.db import get_read_db
+from app.utils.principal import Principal
+from app.utils.current_user import get_current_user
+from app.utils.permission import permission_required
+
+activity_log_router = APIRouter(prefix="/activity-logs", tags=["Activity Logs"])
+
+
+# -------------------------
+# List activity logs
+# -------------------------
+@activity_log_router.get("/", response_model=Page[ActivityLogResponse])
+@permission_required("activitylog:list")
+async def list_activity_logs(
+    user_id: Optional[UUID] = None,
+    activity_type: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    network: Optional[str] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    request: Request = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return await activity_log_service.list_activity_logs(
+        db, user_id=user_id, activity_type=activity_type, since=since, until=until, network=network,
+        limit=limit, cursor=cursor,
+        actor=current_user, request=request,
+    )
+
+
+# -------------------------
+# Search the cold archive (partitions moved out of the database)
+# -------------------------
+@activity_log_router.get("/archive", response_model=Page[ActivityLogResponse])
+@permission_required("activitylog:list")
+async def search_archived_activity_logs(
+    user_id: Optional[UUID] = None,
+    activity_type: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    request: Request = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return await activity_log_service.search_archived_activity_logs(
+        user_id=user_id, activity_type=activity_type, since=since, until=until, limit=limit, cursor=cursor,
+        actor=current_user, request=request,
+    )
+
+
+# -------------------------
+# Export to a file (background job)
+# -------------------------
+@activity_log_router.post("/exports", response_model=ActivityLogExportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+@permission_required("activitylog:export")
+async def create_activity_log_export(
+    export_in: ActivityLogExportCreate,
+    background_tasks: BackgroundTasks,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    filters = ActivityLogExportFilters(**export_in.dict(exclude={"format"}))
+    job = activity_log_export_service.create_export_job(export_in.format, filters, actor=current_user, request=request)
+    background_tasks.add_task(activity_log_export_service.run_export_job, job, actor=current_user, request=request)
+    return job
+
+
+@activity_log_router.get("/exports/{job_id}", response_model=ActivityLogExportJobResponse)
+@permission_required("activitylog:export")
+async def get_activity_log_export(
+    job_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return activity_log_export_service.get_export_job(job_id)
+
+
+@activity_log_router.get("/exports/{job_id}/download")
+@permission_required("activitylog:export")
+async def download_activity_log_export(
+    job_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    path, file_name = activity_log_export_service.get_export_file(job_id, actor=current_user, request=request)
+    return FileResponse(path, media_type="application/gzip", filename=file_name)
+
+
+# -------------------------
+# Streamed export (small ranges)
+# -------------------------
+@activity_log_router.get("/export")
+@permission_required("activitylog:export")
+async def stream_activity_log_export(
+    since: datetime,
+    until: datetime,
+    format: ExportFormat = ExportFormat.NDJSON,
+    user_id: Optional[UUID] = None,
+    activity_type: Optional[str] = None,
+    ip_address: Optional[str] = None,
+    request: Request = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    filters = ActivityLogExportFilters(
+        user_id=user_id, activity_type=activity_type, ip_address=ip_address, since=since, until=until,
+    )
+    activity_log_export_service.check_stream_range(filters)
+    media_type = "application/x-ndjson" if format == ExportFormat.NDJSON else "text/csv"
+    return StreamingResponse(
+        activity_log_export_service.stream_export(format, filters, actor=current_user, request=request),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="activity_logs.{format.value}"'},
+    )
@@ -1,11 +1,15 @@
 from fastapi import APIRouter, Depends, Request, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from typing import List
-from app.schemas.api_key_schema import APIKeyResponse, APIKeyCreate, APIKeyUpdate
+from datetime import datetime
+from typing import List, Optional
+from app.schemas.pagination_schema import Page
+from app.schemas.api_key_schema import (
+    APIKeyResponse, APIKeyCreate, APIKeyCreatedResponse, APIKeyUpdate, APIKeyUsageBucket, APIKeyUsageSummary,
+)
 from app.services import api_key_service
-from app.db import get_db
-from app.models.user_model import User
+from app.db import get_db, get_read_db
+from app.utils.principal import Principal
 from app.utils.current_user import get_current_user
 from app.utils.permission import permission_required
 
@@ -15,16 +19,53 @@ api_key_router = APIRouter(prefix="/api-keys", tags=["API Keys"])
 # -------------------------
 # Create API Key
 # -------------------------
-@api_key_router.post("/", response_model=APIKeyResponse, status_code=status.HTTP_201_CREATED)
+@api_key_router.post("/", response_model=APIKeyCreatedResponse, status_code=status.HTTP_201_CREATED)
 @permission_required("apikey:create")
-def create_api_key(
+async def create_api_key(
     api_key_in: APIKeyCreate,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    api_key = api_key_service.create_api_key(db, api_key_in)
-    return api_key
+    """The response carries the full key; it cannot be retrieved again."""
+    api_key, key = await api_key_service.create_api_key(db, api_key_in)
+    return APIKeyCreatedResponse(**APIKeyResponse.from_orm(api_key).dict(), key=key)
+
+
+# -------------------------
+# API Key usage
+# -------------------------
+@api_key_router.get("/usage", response_model=Page[APIKeyUsageSummary])
+@permission_required("apikey:list")
+async def list_api_key_usage(
+    user_id: UUID = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    request: Request = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Request and error totals per key (default: last 30 days) with last_used_at, for billing and cleanup."""
+    return await api_key_service.list_api_key_usage(
+        db, user_id, since=since, until=until, limit=limit, cursor=cursor, actor=current_user, request=request,
+    )
+
+
+@api_key_router.get("/{api_key_id}/usage", response_model=List[APIKeyUsageBucket])
+@permission_required("apikey:read")
+async def get_api_key_usage(
+    api_key_id: UUID,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    request: Request = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return await api_key_service.get_api_key_usage(
+        db, api_key_id, since=since, until=until, actor=current_user, request=request,
+    )
 
 
 # -------------------------
@@ -32,28 +73,30 @@ def create_api_key(
 # -------------------------
 @api_key_router.get("/{api_key_id}", response_model=APIKeyResponse)
 @permission_required("apikey:read")
-def get_api_key(
+async def get_api_key(
     api_key_id: UUID,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    api_key = api_key_service.get_api_key(db, api_key_id)
+    api_key = await api_key_service.get_api_key(db, api_key_id)
     return api_key
 
 
 # -------------------------
 # List API Keys
 # -------------------------
-@api_key_router.get("/", response_model=List[APIKeyResponse])
+@api_key_router.get("/", response_model=Page[APIKeyResponse])
 @permission_required("apikey:list")
-def list_api_keys(
+async def list_api_keys(
     user_id: UUID = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
     request: Request = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    api_keys = api_key_service.list_api_keys(db, user_id)
+    api_keys = await api_key_service.list_api_keys(db, user_id, limit=limit, cursor=cursor)
     return api_keys
 
 
@@ -62,14 +105,14 @@ def list_api_keys(
 # -------------------------
 @api_key_router.put("/{api_key_id}", response_model=APIKeyResponse)
 @permission_required("apikey:update")
-def update_api_key(
+async def update_api_key(
     api_key_id: UUID,
     api_key_in: APIKeyUpdate,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    api_key = api_key_service.update_api_key(db, api_key_id, api_key_in)
+    api_key = await api_key_service.update_api_key(db, api_key_id, api_key_in)
     return api_key
 
 
@@ -78,11 +121,11 @@ def update_api_key(
 # -------------------------
 @api_key_router.delete("/{api_key_id}", status_code=status.HTTP_204_NO_CONTENT)
 @permission_required("apikey:delete")
-def delete_api_key(
+async def delete_api_key(
     api_key_id: UUID,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    api_key_service.delete_api_key(db, api_key_id)
+    await api_key_service.delete_api_key(db, api_key_id)
     return {"detail": "API Key deleted successfully"}
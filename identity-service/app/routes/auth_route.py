@@ -1,12 +1,17 @@
 from fastapi import APIRouter, Depends, Request, HTTPException, status, Form
-from sqlalchemy.orm import Session
-from datetime import timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta, timezone
 from app.services.user_service import UserService
 from app.services.session_service import SessionService
+from app.services import staff_service
 from app.db import get_db
 from app.utils.jwt import create_access_token, create_refresh_token
+from app.schemas.session_schema import SessionCreate
 from app.schemas.user_schema import UserResponse
 from app.utils.activity_logger import log_activity
+from app.utils.current_user import get_current_user
+from app.utils.permission_bits import encode_mask_claim
+from app.utils.principal import Principal
 
 auth_router = APIRouter(prefix="/auth", tags=["Auth"])
 
@@ -15,17 +20,17 @@ auth_router = APIRouter(prefix="/auth", tags=["Auth"])
 # Login
 # -------------------------
 @auth_router.post("/login", response_model=UserResponse)
-def login(
+async def login(
     request: Request,
     email: str,
     password: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Authenticate user, create session, and return JWTs."""
-    user = UserService.authenticate_user(db, email, password)
+    user = await UserService.authenticate_user(db, email, password, request=request)
     if not user:
         # Log failed login attempt
-        log_activity(db, None, "login_failed", request=request, current_user=None, actor=email)
+        log_activity(db, None, "login_failed", request=request, current_user=None, description=f"Failed login attempt for {email}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -35,21 +40,33 @@ def login(
     access_token_expires = timedelta(minutes=30)
     refresh_token_expires = timedelta(days=7)
 
+    claims = {"sub": str(user.id)}
+    # Staff carry their permission bitset, so services holding the token can check
+    # permissions without a lookup (bit names from GET /permissions/bits); it reflects
+    # the permissions at login time
+    permission_mask = await staff_service.get_permission_mask(db, user.id)
+    if permission_mask is not None:
+        claims["perm"] = encode_mask_claim(permission_mask)
     access_token = create_access_token(
-        data={"sub": str(user.id)}, expires_delta=access_token_expires
+        data=claims, expires_delta=access_token_expires
     )
     refresh_token = create_refresh_token(
         data={"sub": str(user.id)}, expires_delta=refresh_token_expires
     )
 
     # Create session via service
-    SessionService.create_session(
-        db=db,
-        user_id=user.id,
-        refresh_token=refresh_token,
-        expires_delta=refresh_token_expires,
-        user_agent=request.headers.get("user-agent", "unknown"),
-        ip_address=request.client.host if request.client else None,
+    await SessionService.create_session(
+        db,
+        SessionCreate(
+            user_id=user.id,
+            refresh_token=refresh_token,
+            # sessions.expires_at is stored without a time zone, in UTC
+            expires_at=(datetime.now(timezone.utc) + refresh_token_expires).replace(tzinfo=None),
+            user_agent=request.headers.get("user-agent", "unknown"),
+            ip_address=request.client.host if request.client else None,
+        ),
+        actor=user,
+        request=request,
     )
 
     # Log successful login (actor = target = user)
@@ -67,10 +84,10 @@ def login(
 # Logout
 # -------------------------
 @auth_router.post("/logout")
-def logout(
+async def logout(
     request: Request,
-    db: Session = Depends(get_db),
-    user=Depends(UserService.authenticate_user), 
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_current_user),
 ):
     """Invalidate session and log activity."""
     refresh_token = request.headers.get("X-Refresh-Token")
@@ -81,9 +98,9 @@ def logout(
             detail="Refresh token missing from headers"
         )
 
-    SessionService.invalidate_session(db, refresh_token, user.id)
+    await SessionService.invalidate_session(db, refresh_token, user.id)
 
     # Log logout (actor = target = user)
     log_activity(db, user, "logout", request=request, current_user=user)
 
-    return {"message": "Logged out successfully"}
\ No newline at end of file
+    return {"message": "Logged out successfully"}
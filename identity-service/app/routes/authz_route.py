@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_read_db
+from app.schemas.authz_schema import AuthzCheckRequest, AuthzCheckResponse
+from app.services import authz_service
+from app.utils.principal import APIKeyPrincipal, Principal
+from app.utils.current_api_key import api_key_permission_required
+from app.utils.current_user import get_current_user
+from app.utils.permission import permission_required
+
+authz_router = APIRouter(prefix="/authz", tags=["Authz"])
+
+
+# -------------------------
+# Batch authorization checks
+# -------------------------
+@authz_router.post("/check", response_model=AuthzCheckResponse)
+@permission_required("authz:check")
+async def check_authorization(
+    checks_in: AuthzCheckRequest,
+    request: Request = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Answer up to AUTHZ_CHECK_MAX_BATCH permission / restriction checks in one round trip."""
+    return await authz_service.check_batch(db, checks_in.checks, actor=current_user, request=request)
+
+
+# -------------------------
+# Batch authorization checks for machine clients (X-API-Key)
+# -------------------------
+@authz_router.post("/check/api-key", response_model=AuthzCheckResponse)
+async def check_authorization_by_api_key(
+    checks_in: AuthzCheckRequest,
+    request: Request = None,
+    db: AsyncSession = Depends(get_read_db),
+    api_key: APIKeyPrincipal = Depends(api_key_permission_required("authz:check")),
+):
+    """Same checks as POST /authz/check, for services authenticating with an API key holding authz:check."""
+    return await authz_service.check_batch(db, checks_in.checks, request=request, api_key=api_key)
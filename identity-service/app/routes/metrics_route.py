@@ -0,0 +1,163 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import engine, get_db, replica_router
+from app.utils.principal import Principal
+from app.utils.activity_log_archive import activity_log_archive
+from app.utils.activity_log_partitions import activity_log_partitions
+from app.utils.activity_log_policy import activity_log_aggregator
+from app.utils.activity_log_writer import activity_log_writer
+from app.utils.activity_rollup import activity_rollup
+from app.utils.api_key_cache import api_key_cache
+from app.utils.api_key_usage import api_key_usage
+from app.utils.current_user import get_current_user
+from app.utils.password_hasher import password_hasher
+from app.utils.permission import permission_required
+from app.utils.permission_cache import permission_cache
+from app.utils.pool_metrics import pool_stats
+from app.utils.rate_limit import rate_limiter
+from app.utils.token_cache import token_cache
+
+metrics_router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+# -------------------------
+# Activity log writer
+# -------------------------
+@metrics_router.get("/activity-log", response_model=dict)
+@permission_required("metrics:read")
+async def activity_log_metrics(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return {**activity_log_writer.stats(), "policy": activity_log_aggregator.stats()}
+
+
+# -------------------------
+# Activity log partitions
+# -------------------------
+@metrics_router.get("/activity-log-partitions", response_model=dict)
+@permission_required("metrics:read")
+async def activity_log_partition_metrics(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return activity_log_partitions.stats()
+
+
+# -------------------------
+# Activity log cold archive
+# -------------------------
+@metrics_router.get("/activity-log-archive", response_model=dict)
+@permission_required("metrics:read")
+async def activity_log_archive_metrics(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return activity_log_archive.stats()
+
+
+# -------------------------
+# Activity rollups
+# -------------------------
+@metrics_router.get("/activity-rollup", response_model=dict)
+@permission_required("metrics:read")
+async def activity_rollup_metrics(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return activity_rollup.stats()
+
+
+# -------------------------
+# Verified-token cache
+# -------------------------
+@metrics_router.get("/token-cache", response_model=dict)
+@permission_required("metrics:read")
+async def token_cache_metrics(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return token_cache.stats()
+
+
+# -------------------------
+# Staff permission cache
+# -------------------------
+@metrics_router.get("/permission-cache", response_model=dict)
+@permission_required("metrics:read")
+async def permission_cache_metrics(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return permission_cache.stats()
+
+
+# -------------------------
+# Verified API-key cache
+# -------------------------
+@metrics_router.get("/api-key-cache", response_model=dict)
+@permission_required("metrics:read")
+async def api_key_cache_metrics(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return api_key_cache.stats()
+
+
+# -------------------------
+# API-key usage meter
+# -------------------------
+@metrics_router.get("/api-key-usage", response_model=dict)
+@permission_required("metrics:read")
+async def api_key_usage_metrics(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return api_key_usage.stats()
+
+
+# -------------------------
+# Rate limiting
+# -------------------------
+@metrics_router.get("/rate-limit", response_model=dict)
+@permission_required("metrics:read")
+async def rate_limit_metrics(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return rate_limiter.stats()
+
+
+# -------------------------
+# Password hashing pool
+# -------------------------
+@metrics_router.get("/password-hasher", response_model=dict)
+@permission_required("metrics:read")
+async def password_hasher_metrics(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return password_hasher.stats()
+
+
+# -------------------------
+# Database connection pool
+# -------------------------
+@metrics_router.get("/db-pool", response_model=dict)
+@permission_required("metrics:read")
+async def db_pool_metrics(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return {"primary": pool_stats(engine), "routing": replica_router.stats()}
@@ -0,0 +1,40 @@
+import binascii
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.config import settings
+from app.db import get_read_db
+from app.schemas.permission_schema import PermissionBitsResponse
+from app.utils.principal import Principal
+from app.utils.current_user import get_current_user
+from app.utils.permission_bits import SEPARATOR, WILDCARD, decode_mask_claim, names_of
+from app.utils.permission_cache import permission_cache
+
+permission_router = APIRouter(prefix="/permissions", tags=["Permissions"])
+
+
+# -------------------------
+# Bit -> permission name map for the "perm" token claim
+# -------------------------
+@permission_router.get("/bits", response_model=PermissionBitsResponse)
+async def get_permission_bits(
+    response: Response,
+    claim: Optional[str] = None,
+    request: Request = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Every permission bit, wildcards included: a token's claim grants `name` if it has
+    the bit of `name`, of "*" or of any enclosing "<namespace>:*". Bits are never
+    reused, so clients may cache the map (for as long as the server's permission cache).
+    """
+    names = await permission_cache.bit_names(db)
+    granted = None
+    if claim is not None:
+        try:
+            granted = names_of(decode_mask_claim(claim), names)
+        except (binascii.Error, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid permission claim")
+    response.headers["Cache-Control"] = f"private, max-age={int(settings.PERMISSION_CACHE_TTL_SECONDS)}"
+    return {"bits": names, "wildcard": WILDCARD, "separator": SEPARATOR, "granted": granted}
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.db import get_read_db
+from app.schemas.pagination_schema import Page
+from app.schemas.session_schema import ActiveSessionResponse
+from app.services.session_service import SessionService
+from app.utils.principal import Principal
+from app.utils.current_user import get_current_user
+from app.utils.permission import permission_required
+
+session_router = APIRouter(prefix="/sessions", tags=["Sessions"])
+
+
+# -------------------------
+# Active sessions by network
+# -------------------------
+@session_router.get("/active", response_model=Page[ActiveSessionResponse])
+@permission_required("session:list")
+async def list_active_sessions(
+    network: str,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    request: Request = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return await SessionService.list_active_sessions(
+        db, network, limit=limit, cursor=cursor, actor=current_user, request=request,
+    )
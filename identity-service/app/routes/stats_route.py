@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from datetime import datetime
+from app.db import get_read_db
+from app.services import activity_stats_service
+from app.utils.principal import Principal
+from app.utils.current_user import get_current_user
+from app.utils.permission import permission_required
+
+stats_router = APIRouter(prefix="/stats", tags=["Stats"])
+
+
+# -------------------------
+# Activity statistics (hourly rollups + newest raw rows)
+# -------------------------
+@stats_router.get("/activity", response_model=dict)
+@permission_required("stats:read")
+async def activity_stats(
+    since: datetime,
+    until: datetime,
+    activity_type: Optional[str] = None,
+    granularity: str = "hour",
+    top: int = 10,
+    request: Request = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return await activity_stats_service.get_activity_stats(
+        db, since, until, activity_type=activity_type, granularity=granularity, top=top,
+        actor=current_user, request=request,
+    )
@@ -2,10 +2,11 @@ from pydantic import BaseModel
 from uuid import UUID
 from datetime import datetime
 from typing import Optional
+from enum import Enum
 
 
 class ActivityLogBase(BaseModel):
-    user_id: UUID
+    user_id: Optional[UUID] = None
     activity_type: str
     description: Optional[str] = None
     ip_address: Optional[str] = None
@@ -22,3 +23,34 @@ class ActivityLogResponse(ActivityLogBase):
 
     class Config:
         orm_mode = True
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ActivityLogExportFilters(BaseModel):
+    user_id: Optional[UUID] = None
+    activity_type: Optional[str] = None
+    ip_address: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
+
+class ActivityLogExportCreate(ActivityLogExportFilters):
+    format: ExportFormat = ExportFormat.NDJSON
+
+
+class ActivityLogExportJobResponse(BaseModel):
+    id: str
+    format: ExportFormat
+    status: str
+    rows: int
+    url: Optional[str] = None
+    error: Optional[str] = None
+    date_created: datetime
+    date_finished: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
@@ -7,14 +7,12 @@ from app.schemas.permission_schema import PermissionResponse
 
 class APIKeyBase(BaseModel):
     user_id: UUID
-    key_hash: str
-    secret: str
     is_active: bool = True
     expires_at: Optional[datetime] = None
 
 
 class APIKeyCreate(APIKeyBase):
-    permissions: Optional[List[UUID]] = [] 
+    permissions: Optional[List[UUID]] = []
 
 
 class APIKeyUpdate(BaseModel):
@@ -25,9 +23,35 @@ class APIKeyUpdate(BaseModel):
 
 class APIKeyResponse(APIKeyBase):
     id: UUID
+    key_id: Optional[str] = None
+    last_used_at: Optional[datetime] = None
     date_created: datetime
     date_updated: datetime
     permissions: List[PermissionResponse] = []
 
     class Config:
         orm_mode = True
+
+
+class APIKeyCreatedResponse(APIKeyResponse):
+    # The full key, returned once at creation: only its hash is stored
+    key: str
+
+
+class APIKeyUsageSummary(BaseModel):
+    # Totals over the requested window; requests from the last flush interval are not included yet
+    api_key_id: UUID
+    key_id: Optional[str] = None
+    user_id: Optional[UUID] = None
+    last_used_at: Optional[datetime] = None
+    requests: int
+    errors: int
+
+
+class APIKeyUsageBucket(BaseModel):
+    bucket_start: datetime
+    requests: int
+    errors: int
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,37 @@
+from pydantic import BaseModel, conlist, model_validator
+from uuid import UUID
+from typing import List, Optional
+from app.config import settings
+
+
+class AuthzCheck(BaseModel):
+    """
+    May `subject_id` (a user id) hold `permission` and/or perform the staff restriction
+    `action` ('view', 'edit', 'delete', ...) on `target_id` (a user id)?
+    """
+    subject_id: UUID
+    permission: Optional[str] = None
+    action: Optional[str] = None
+    target_id: Optional[UUID] = None
+
+    @model_validator(mode="after")
+    def _check_kind(self):
+        if not self.permission and not self.action:
+            raise ValueError("permission or action is required")
+        if self.action and not self.target_id:
+            raise ValueError("target_id is required with action")
+        return self
+
+
+class AuthzCheckRequest(BaseModel):
+    checks: conlist(AuthzCheck, min_length=1, max_length=settings.AUTHZ_CHECK_MAX_BATCH)
+
+
+class AuthzDecision(BaseModel):
+    allowed: bool
+    reason: Optional[str] = None
+
+
+class AuthzCheckResponse(BaseModel):
+    # In the order of the request's checks
+    results: List[AuthzDecision]
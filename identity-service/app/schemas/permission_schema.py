@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from uuid import UUID
 from datetime import datetime
+from typing import Dict, List, Optional
 
 
 class PermissionBase(BaseModel):
@@ -18,3 +19,12 @@ class PermissionResponse(PermissionBase):
 
     class Config:
         orm_mode = True
+
+
+class PermissionBitsResponse(BaseModel):
+    # bit -> permission name, for decoding the "perm" access-token claim
+    bits: Dict[int, str]
+    wildcard: str
+    separator: str
+    # Names granted by the `claim` query parameter, when one was given
+    granted: Optional[List[str]] = None
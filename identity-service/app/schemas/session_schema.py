@@ -1,7 +1,13 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 from uuid import UUID
 from datetime import datetime
 from typing import Optional
+from app.utils.network import normalize_ip
+
+
+def _ip_text(value):
+    # Stored as INET: client hosts that are not IP addresses are dropped, INET values read back as text
+    return normalize_ip(str(value)) if value else None
 
 
 class SessionBase(BaseModel):
@@ -12,6 +18,8 @@ class SessionBase(BaseModel):
     is_valid: bool = True
     expires_at: datetime
 
+    _ip_address = validator("ip_address", pre=True, allow_reuse=True)(_ip_text)
+
 
 class SessionCreate(SessionBase):
     pass
@@ -29,3 +37,18 @@ class SessionResponse(SessionBase):
 
     class Config:
         orm_mode = True
+
+
+class ActiveSessionResponse(BaseModel):
+    """Session listing for investigations; never exposes the refresh token."""
+    id: UUID
+    user_id: UUID
+    user_agent: Optional[str] = None
+    ip_address: Optional[str] = None
+    expires_at: datetime
+    date_created: datetime
+
+    _ip_address = validator("ip_address", pre=True, allow_reuse=True)(_ip_text)
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,248 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+from fastapi import HTTPException, Request, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.db import ReadSessionLocal, replica_router
+from app.models.activity_dimension_model import IPAddress, UserAgent
+from app.models.activity_log_model import ActivityLog
+from app.schemas.activity_log_schema import ActivityLogExportFilters, ExportFormat
+from app.utils.activity_logger import log_activity
+from app.utils.network import parse_network, within
+from app.utils.principal import Principal
+from app.utils.replica_router import client_key
+
+logger = logging.getLogger(__name__)
+
+# Plain column rows, not ORM instances: nothing accumulates in the session identity map.
+# IP address and user agent are exported as values, resolved from their dimension tables.
+_EXPORT_SELECT = (
+    select(
+        *(column for column in ActivityLog.__table__.columns if column.key not in ("ip_address_id", "user_agent_id")),
+        func.host(IPAddress.value).label("ip_address"),
+        UserAgent.value.label("user_agent"),
+    )
+    .select_from(ActivityLog)
+    .outerjoin(IPAddress, IPAddress.id == ActivityLog.ip_address_id)
+    .outerjoin(UserAgent, UserAgent.id == ActivityLog.user_agent_id)
+)
+EXPORT_COLUMNS = list(_EXPORT_SELECT.selected_columns.keys())
+
+
+@dataclass
+class ExportJob:
+    id: str
+    format: ExportFormat
+    filters: ActivityLogExportFilters
+    status: str = "pending"  # pending -> running -> completed | failed
+    rows: int = 0
+    file_name: Optional[str] = None
+    error: Optional[str] = None
+    date_created: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    date_finished: Optional[datetime] = None
+
+    @property
+    def url(self) -> Optional[str]:
+        return f"/activity-logs/exports/{self.id}/download" if self.status == "completed" else None
+
+
+# Jobs started by this worker process; finished files stay in EXPORTS_DIR either way
+_jobs: Dict[str, ExportJob] = {}
+
+_JOB_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _export_file_name(job_id: str, fmt: ExportFormat) -> str:
+    return f"activity_logs_{job_id}.{fmt.value}.gz"
+
+
+# ---------------- QUERY & ENCODING ---------------- #
+def _export_query(filters: ActivityLogExportFilters):
+    stmt = _EXPORT_SELECT
+    if filters.user_id:
+        stmt = stmt.where(ActivityLog.user_id == filters.user_id)
+    if filters.activity_type:
+        stmt = stmt.where(ActivityLog.activity_type == filters.activity_type)
+    if filters.ip_address:
+        # A single address or a CIDR range, matched through the ip_addresses GiST index
+        stmt = stmt.where(within(IPAddress.value, parse_network(filters.ip_address)))
+    if filters.since:
+        stmt = stmt.where(ActivityLog.timestamp >= filters.since)
+    if filters.until:
+        stmt = stmt.where(ActivityLog.timestamp < filters.until)
+    return stmt.order_by(ActivityLog.timestamp, ActivityLog.id)
+
+
+def _value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _encode_chunk(rows: Sequence, fmt: ExportFormat, header: bool = False) -> bytes:
+    if fmt == ExportFormat.NDJSON:
+        return "".join(
+            json.dumps({key: _value(value) for key, value in zip(EXPORT_COLUMNS, row)}, separators=(",", ":")) + "\n"
+            for row in rows
+        ).encode()
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    writer.writerows([_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+async def _iter_chunks(db: AsyncSession, filters: ActivityLogExportFilters) -> AsyncIterator[List]:
+    """Rows in fixed-size chunks from a server-side cursor, never the whole result in memory."""
+    result = await db.stream(
+        _export_query(filters).execution_options(yield_per=settings.ACTIVITY_LOG_EXPORT_CHUNK_SIZE)
+    )
+    async for chunk in result.partitions():
+        yield chunk
+
+
+def _read_session(request: Optional[Request]) -> AsyncSession:
+    # Exports outlive the request's own session, so they open one of their own
+    return ReadSessionLocal(bind=replica_router.engine_for_read(client_key(request)))
+
+
+def _check_range(filters: ActivityLogExportFilters) -> None:
+    """Naive bounds are taken as UTC (in place), and `until` must come after `since`."""
+    if filters.since and not filters.since.tzinfo:
+        filters.since = filters.since.replace(tzinfo=timezone.utc)
+    if filters.until and not filters.until.tzinfo:
+        filters.until = filters.until.replace(tzinfo=timezone.utc)
+    if filters.since and filters.until and filters.until <= filters.since:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="until must be after since")
+
+
+# ---------------- FILE EXPORT (background job) ---------------- #
+def create_export_job(fmt: ExportFormat, filters: ActivityLogExportFilters, actor: Principal = None, request: Request = None) -> ExportJob:
+    _check_range(filters)
+    job = ExportJob(id=uuid.uuid4().hex, format=fmt, filters=filters)
+    _jobs[job.id] = job
+    log_activity(None, actor, "activity_log_export_requested", request=request,
+                 description=f"Export {job.id} ({fmt.value}) requested with {filters.dict(exclude_none=True)}")
+    return job
+
+
+def get_export_job(job_id: str) -> ExportJob:
+    job = _jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export job not found")
+    return job
+
+
+async def run_export_job(job: ExportJob, actor: Principal = None, request: Request = None) -> None:
+    """Write the export as gzip-compressed NDJSON/CSV, chunk by chunk, into EXPORTS_DIR."""
+    file_name = _export_file_name(job.id, job.format)
+    path = os.path.join(settings.EXPORTS_DIR, file_name)
+    partial_path = path + ".part"  # renamed only when complete, so a half-written file is never served
+    job.status = "running"
+    try:
+        with gzip.open(partial_path, "wb") as out:
+            first = True
+            async with _read_session(request) as db:
+                async for chunk in _iter_chunks(db, job.filters):
+                    data = _encode_chunk(chunk, job.format, header=first)
+                    # Compression and disk IO run off the event loop
+                    await asyncio.to_thread(out.write, data)
+                    job.rows += len(chunk)
+                    first = False
+            if first and job.format == ExportFormat.CSV:
+                out.write(_encode_chunk([], job.format, header=True))
+        os.replace(partial_path, path)
+
+        job.file_name = file_name
+        job.status = "completed"
+        log_activity(None, actor, "activity_log_export_success", request=request,
+                     description=f"Export {job.id} wrote {job.rows} rows to {file_name}")
+    except Exception as e:
+        job.status = "failed"
+        job.error = str(e)
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        logger.exception("Activity log export %s failed", job.id)
+        log_activity(None, actor, "activity_log_export_error", request=request, description=str(e))
+    finally:
+        job.date_finished = datetime.now(timezone.utc)
+
+
+def get_export_file(job_id: str, actor: Principal = None, request: Request = None) -> tuple:
+    """(path, file name) of a finished export. Looked up on disk, so any worker can serve it."""
+    if _JOB_ID_RE.match(job_id):
+        for fmt in ExportFormat:
+            file_name = _export_file_name(job_id, fmt)
+            path = os.path.join(settings.EXPORTS_DIR, file_name)
+            if os.path.isfile(path):
+                log_activity(None, actor, "activity_log_export_download", request=request,
+                             description=f"Export {job_id} downloaded")
+                return path, file_name
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export not found or expired")
+
+
+async def delete_expired_exports() -> int:
+    """Scheduler job: delete export files (and abandoned partial files) past the retention window."""
+    cutoff = time.time() - settings.ACTIVITY_LOG_EXPORT_RETENTION_HOURS * 3600
+
+    def _delete() -> int:
+        deleted = 0
+        with os.scandir(settings.EXPORTS_DIR) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.startswith("activity_logs_") and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    deleted += 1
+        return deleted
+
+    deleted = await asyncio.to_thread(_delete)
+    for job_id in [job_id for job_id, job in _jobs.items()
+                   if job.date_finished and job.date_finished.timestamp() < cutoff]:
+        del _jobs[job_id]
+    if deleted:
+        logger.info("Deleted %d expired activity log exports", deleted)
+    return deleted
+
+
+# ---------------- STREAMING EXPORT (HTTP response) ---------------- #
+def check_stream_range(filters: ActivityLogExportFilters) -> None:
+    """Streaming responses are meant for small ranges; bigger ones go through an export job."""
+    if not filters.since or not filters.until:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="since and until are required")
+    _check_range(filters)
+    if (filters.until - filters.since).days > settings.ACTIVITY_LOG_EXPORT_STREAM_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range too large to stream (max {settings.ACTIVITY_LOG_EXPORT_STREAM_MAX_DAYS} days), "
+                   "create an export job instead",
+        )
+
+
+async def stream_export(fmt: ExportFormat, filters: ActivityLogExportFilters, actor: Principal = None, request: Request = None) -> AsyncIterator[bytes]:
+    rows = 0
+    first = True
+    async with _read_session(request) as db:
+        async for chunk in _iter_chunks(db, filters):
+            yield _encode_chunk(chunk, fmt, header=first)
+            rows += len(chunk)
+            first = False
+    if first and fmt == ExportFormat.CSV:
+        yield _encode_chunk([], fmt, header=True)
+
+    log_activity(None, actor, "activity_log_export_stream", request=request,
+                 description=f"Streamed {rows} activity logs ({fmt.value}) with {filters.dict(exclude_none=True)}")
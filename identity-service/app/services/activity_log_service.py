@@ -0,0 +1,90 @@
+import asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Request
+from uuid import UUID
+from datetime import datetime, timezone
+from app.models.activity_dimension_model import IPAddress
+from app.models.activity_log_model import ActivityLog
+from app.utils.activity_log_archive import activity_log_archive
+from app.utils.activity_logger import log_activity
+from app.utils.network import parse_network, within
+from app.utils.pagination import build_page, clamp_limit, decode_cursor, encode_cursor, paginate
+from app.utils.principal import Principal
+
+
+async def list_activity_logs(
+    db: AsyncSession,
+    user_id: UUID = None,
+    activity_type: str = None,
+    since: datetime = None,
+    until: datetime = None,
+    network: str = None,
+    limit: int = 100,
+    cursor: str = None,
+    actor: Principal = None,
+    request: Request = None,
+) -> dict:
+    query = select(ActivityLog)
+    if user_id:
+        query = query.where(ActivityLog.user_id == user_id)
+    if activity_type:
+        query = query.where(ActivityLog.activity_type == activity_type)
+    if network:
+        # Matching addresses come from the GiST index on the small ip_addresses table, their
+        # rows from ix_activity_logs_ip_address_id_timestamp
+        query = query.where(ActivityLog.ip_address_id.in_(
+            select(IPAddress.id).where(within(IPAddress.value, parse_network(network)))
+        ))
+    # Bounds on the partition key, so only the matching partitions are scanned
+    if since:
+        query = query.where(ActivityLog.timestamp >= since)
+    if until:
+        query = query.where(ActivityLog.timestamp < until)
+
+    result = await db.execute(paginate(query, ActivityLog.timestamp, ActivityLog.id, limit, cursor=cursor))
+    page = build_page(result.scalars().all(), limit, sort_attr="timestamp")
+
+    log_activity(db, actor, "activity_log_list", request=request,
+                 description=f"Listed {len(page['items'])} activity logs "
+                             f"(user_id={user_id if user_id else 'all'}, network={network or 'all'})")
+    return page
+
+
+async def search_archived_activity_logs(
+    user_id: UUID = None,
+    activity_type: str = None,
+    since: datetime = None,
+    until: datetime = None,
+    limit: int = 100,
+    cursor: str = None,
+    actor: Principal = None,
+    request: Request = None,
+) -> dict:
+    """Activity logs moved to the cold archive, newest first, paged like list_activity_logs."""
+    limit = clamp_limit(limit)
+    # Archived timestamps are aware; naive bounds are taken as UTC
+    if since and not since.tzinfo:
+        since = since.replace(tzinfo=timezone.utc)
+    if until and not until.tzinfo:
+        until = until.replace(tzinfo=timezone.utc)
+    before = None
+    if cursor:
+        before_timestamp, before_id = decode_cursor(cursor)
+        if not before_timestamp.tzinfo:
+            before_timestamp = before_timestamp.replace(tzinfo=timezone.utc)
+        before = (before_timestamp, before_id)
+    rows = await asyncio.to_thread(
+        activity_log_archive.search, user_id=user_id, activity_type=activity_type, since=since, until=until,
+        limit=limit + 1, before=before,
+    )
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(datetime.fromisoformat(last["timestamp"]), UUID(last["id"]))
+
+    log_activity(None, actor, "activity_log_archive_search", request=request,
+                 description=f"Searched archived activity logs: {len(items)} found "
+                             f"(user_id={user_id if user_id else 'all'})")
+    return {"items": items, "next_cursor": next_cursor}
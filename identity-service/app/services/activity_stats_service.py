@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, Request, status
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.activity_logger import log_activity
+from app.utils.activity_rollup import STATE_NAME, floor_hour
+from app.utils.principal import Principal
+
+GRANULARITIES = ("hour", "day")
+MAX_TOP = 100
+
+# (rollup table, raw activity_logs, policy aggregates) sources for each statistic; the
+# aggregates hold no IP addresses, so they only contribute to series and users.
+SERIES_SOURCES = (
+    "SELECT date_trunc(:granularity, hour, 'UTC') AS bucket, activity_type, count AS n "
+    "FROM activity_rollup_hourly WHERE hour >= :r_start AND hour < :r_end {type_filter}",
+    "SELECT date_trunc(:granularity, timestamp, 'UTC') AS bucket, activity_type, 1 AS n "
+    "FROM activity_logs WHERE {raw_range} {type_filter}",
+    "SELECT date_trunc(:granularity, bucket_start, 'UTC') AS bucket, activity_type, count AS n "
+    "FROM activity_log_aggregates WHERE {agg_range} {type_filter}",
+)
+IP_SOURCES = (
+    "SELECT ip_address AS key, count AS n "
+    "FROM activity_rollup_hourly_ip WHERE hour >= :r_start AND hour < :r_end {type_filter}",
+    "SELECT host(ip.value) AS key, 1 AS n FROM activity_logs JOIN ip_addresses AS ip ON ip.id = ip_address_id "
+    "WHERE {raw_range} {type_filter}",
+    None,
+)
+USER_SOURCES = (
+    "SELECT user_id AS key, count AS n "
+    "FROM activity_rollup_hourly_user WHERE hour >= :r_start AND hour < :r_end {type_filter}",
+    "SELECT user_id AS key, 1 AS n FROM activity_logs WHERE {raw_range} {type_filter}",
+    "SELECT user_id AS key, count AS n FROM activity_log_aggregates WHERE {agg_range} AND user_id IS NOT NULL {type_filter}",
+)
+
+
+def _ceil_hour(moment: datetime) -> datetime:
+    floored = floor_hour(moment)
+    return floored if floored == moment else floored + timedelta(hours=1)
+
+
+def _plan(since: datetime, until: datetime, watermark: Optional[datetime]) -> Tuple[Optional[tuple], List[tuple]]:
+    """
+    Split [since, until) into the whole hours the rollups already cover and the raw
+    ranges around them: the partial hour at the start and everything after the
+    watermark (the newest, not yet rolled up, hours).
+    """
+    r_start = _ceil_hour(since)
+    r_end = min(floor_hour(until), watermark) if watermark else r_start
+    if r_end <= r_start:
+        return None, [(since, until)]
+    raw = []
+    if since < r_start:
+        raw.append((since, r_start))
+    if r_end < until:
+        raw.append((r_end, until))
+    return (r_start, r_end), raw
+
+
+def _union(sources: tuple, rollup_range, raw_ranges, type_filter: str) -> Tuple[str, dict]:
+    parts, params = [], {}
+    rollup_sql, raw_sql, agg_sql = sources
+    if rollup_range:
+        parts.append(rollup_sql.format(type_filter=type_filter))
+        params.update(r_start=rollup_range[0], r_end=rollup_range[1])
+    for i, (start, end) in enumerate(raw_ranges):
+        params.update({f"raw_start_{i}": start, f"raw_end_{i}": end})
+        parts.append(raw_sql.format(
+            raw_range=f"timestamp >= :raw_start_{i} AND timestamp < :raw_end_{i}", type_filter=type_filter,
+        ))
+        if agg_sql:
+            parts.append(agg_sql.format(
+                agg_range=f"bucket_start >= :raw_start_{i} AND bucket_start < :raw_end_{i}", type_filter=type_filter,
+            ))
+    return " UNION ALL ".join(parts), params
+
+
+async def get_activity_stats(
+    db: AsyncSession,
+    since: datetime,
+    until: datetime,
+    activity_type: str = None,
+    granularity: str = "hour",
+    top: int = 10,
+    actor: Principal = None,
+    request: Request = None,
+) -> dict:
+    """Counts per bucket and activity type plus top IPs/users, answered from the hourly rollups."""
+    if granularity not in GRANULARITIES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"granularity must be one of {GRANULARITIES}")
+    since = since if since.tzinfo else since.replace(tzinfo=timezone.utc)
+    until = until if until.tzinfo else until.replace(tzinfo=timezone.utc)
+    if until <= since:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="until must be after since")
+    top = max(1, min(top, MAX_TOP))
+
+    watermark = (await db.execute(
+        text("SELECT watermark FROM activity_rollup_state WHERE name = :name"), {"name": STATE_NAME}
+    )).scalar_one_or_none()
+    rollup_range, raw_ranges = _plan(since, until, watermark)
+
+    type_filter = "AND activity_type = :activity_type" if activity_type else ""
+    common = {"activity_type": activity_type} if activity_type else {}
+
+    sql, params = _union(SERIES_SOURCES, rollup_range, raw_ranges, type_filter)
+    series_rows = (await db.execute(
+        text(f"SELECT bucket, activity_type, sum(n) AS count FROM ({sql}) AS s GROUP BY 1, 2 ORDER BY 1, 2"),
+        {**params, **common, "granularity": granularity},
+    )).all()
+
+    tops = {}
+    for name, key, sources in (("top_ips", "ip_address", IP_SOURCES), ("top_users", "user_id", USER_SOURCES)):
+        sql, params = _union(sources, rollup_range, raw_ranges, type_filter)
+        rows = (await db.execute(
+            text(f"SELECT key, sum(n) AS count FROM ({sql}) AS s GROUP BY 1 ORDER BY 2 DESC LIMIT :top"),
+            {**params, **common, "top": top},
+        )).all()
+        tops[name] = [{key: row.key, "count": row.count} for row in rows]
+
+    totals = {}
+    for row in series_rows:
+        totals[row.activity_type] = totals.get(row.activity_type, 0) + row.count
+
+    log_activity(db, actor, "activity_stats_get", request=request,
+                 description=f"Activity stats {since.isoformat()}..{until.isoformat()} ({activity_type or 'all'})")
+
+    return {
+        "since": since,
+        "until": until,
+        "granularity": granularity,
+        "rolled_up_until": watermark,
+        "series": [
+            {"bucket": row.bucket, "activity_type": row.activity_type, "count": row.count} for row in series_rows
+        ],
+        "totals": totals,
+        **tops,
+    }
@@ -1,41 +1,60 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
+from typing import Tuple
 from uuid import UUID
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from app.models.api_key_model import APIKey
+from app.models.api_key_usage_model import APIKeyUsage
 from app.models.permission_model import Permission
 from app.schemas.api_key_schema import APIKeyCreate, APIKeyUpdate
 from app.utils.activity_logger import log_activity
+from app.utils.api_key_cache import api_key_cache
+from app.utils.api_keys import generate_api_key
+from app.utils.pagination import build_page, paginate
+from app.utils.permission_bits import mask_of
 
 
-def create_api_key(db: Session, api_key_in: APIKeyCreate, actor=None, request=None) -> APIKey:
+async def _permissions_by_id(db: AsyncSession, permission_ids: list[UUID]) -> list[Permission]:
+    result = await db.execute(select(Permission).where(Permission.id.in_(permission_ids)))
+    return list(result.scalars().all())
+
+
+async def create_api_key(db: AsyncSession, api_key_in: APIKeyCreate, actor=None, request=None) -> Tuple[APIKey, str]:
+    """Create a key; returns it with the full key string, which only exists in this response."""
     try:
+        key_id, key, key_hash = generate_api_key()
         api_key = APIKey(
             user_id=api_key_in.user_id,
-            key_hash=api_key_in.key_hash,
-            secret=api_key_in.secret,
+            key_id=key_id,
+            key_hash=key_hash,
             is_active=api_key_in.is_active,
             expires_at=api_key_in.expires_at,
+            permissions=[],
         )
 
         if api_key_in.permissions:
-            perms = db.query(Permission).filter(Permission.id.in_(api_key_in.permissions)).all()
-            api_key.permissions = perms
+            api_key.permissions = await _permissions_by_id(db, api_key_in.permissions)
+            api_key.permission_mask = mask_of(api_key.permissions)
 
         db.add(api_key)
-        db.commit()
-        db.refresh(api_key)
+        await db.commit()
+        await db.refresh(api_key, ["permissions"])
 
         log_activity(db, actor, "api_key_create_success", request=request,
-                     description=f"API key created for user_id={api_key_in.user_id}")
-        return api_key
+                     description=f"API key {key_id} created for user_id={api_key_in.user_id}")
+        return api_key, key
     except Exception as e:
         log_activity(db, actor, "api_key_create_error", request=request, description=str(e))
         raise
 
 
-def get_api_key(db: Session, api_key_id: UUID, actor=None, request=None) -> APIKey:
-    api_key = db.query(APIKey).filter(APIKey.id == api_key_id).first()
+async def get_api_key(db: AsyncSession, api_key_id: UUID, actor=None, request=None) -> APIKey:
+    result = await db.execute(
+        select(APIKey).options(selectinload(APIKey.permissions)).where(APIKey.id == api_key_id)
+    )
+    api_key = result.scalar_one_or_none()
     if not api_key:
         log_activity(db, actor, "api_key_get_not_found", request=request,
                      description=f"API key {api_key_id} not found")
@@ -46,32 +65,41 @@ def get_api_key(db: Session, api_key_id: UUID, actor=None, request=None) -> APIK
     return api_key
 
 
-def list_api_keys(db: Session, user_id: UUID = None, actor=None, request=None) -> list[APIKey]:
-    query = db.query(APIKey)
+async def list_api_keys(
+    db: AsyncSession,
+    user_id: UUID = None,
+    limit: int = 100,
+    cursor: str = None,
+    actor=None,
+    request=None,
+) -> dict:
+    query = select(APIKey).options(selectinload(APIKey.permissions))
     if user_id:
-        query = query.filter(APIKey.user_id == user_id)
-    results = query.all()
+        query = query.where(APIKey.user_id == user_id)
+    result = await db.execute(paginate(query, APIKey.date_created, APIKey.id, limit, cursor=cursor))
+    results = build_page(result.scalars().all(), limit)
 
     log_activity(db, actor, "api_key_list", request=request,
                  description=f"Listed API keys (user_id={user_id if user_id else 'all'})")
     return results
 
 
-def update_api_key(db: Session, api_key_id: UUID, api_key_in: APIKeyUpdate, actor=None, request=None) -> APIKey:
+async def update_api_key(db: AsyncSession, api_key_id: UUID, api_key_in: APIKeyUpdate, actor=None, request=None) -> APIKey:
     try:
-        api_key = get_api_key(db, api_key_id, actor=actor, request=request)
+        api_key = await get_api_key(db, api_key_id, actor=actor, request=request)
 
         if api_key_in.is_active is not None:
             api_key.is_active = api_key_in.is_active
         if api_key_in.expires_at is not None:
             api_key.expires_at = api_key_in.expires_at
         if api_key_in.permissions is not None:
-            perms = db.query(Permission).filter(Permission.id.in_(api_key_in.permissions)).all()
-            api_key.permissions = perms
+            api_key.permissions = await _permissions_by_id(db, api_key_in.permissions)
+            api_key.permission_mask = mask_of(api_key.permissions)
 
         api_key.date_updated = datetime.now(timezone.utc)
-        db.commit()
-        db.refresh(api_key)
+        await db.commit()
+        await db.refresh(api_key, ["permissions"])
+        api_key_cache.invalidate(api_key.key_id)
 
         log_activity(db, actor, "api_key_update_success", request=request,
                      description=f"API key {api_key_id} updated")
@@ -81,14 +109,98 @@ def update_api_key(db: Session, api_key_id: UUID, api_key_in: APIKeyUpdate, acto
         raise
 
 
-def delete_api_key(db: Session, api_key_id: UUID, actor=None, request=None) -> None:
+async def delete_api_key(db: AsyncSession, api_key_id: UUID, actor=None, request=None) -> None:
     try:
-        api_key = get_api_key(db, api_key_id, actor=actor, request=request)
-        db.delete(api_key)
-        db.commit()
+        api_key = await get_api_key(db, api_key_id, actor=actor, request=request)
+        await db.delete(api_key)
+        await db.commit()
+        api_key_cache.invalidate(api_key.key_id)
 
         log_activity(db, actor, "api_key_delete_success", request=request,
                      description=f"API key {api_key_id} deleted")
     except Exception as e:
         log_activity(db, actor, "api_key_delete_error", request=request, description=str(e))
         raise
+
+
+# Usage windows default to the last 30 days; one key's hourly usage is capped at 31 days of hours
+DEFAULT_USAGE_WINDOW = timedelta(days=30)
+MAX_USAGE_BUCKETS = 24 * 31
+
+
+async def list_api_key_usage(
+    db: AsyncSession,
+    user_id: UUID = None,
+    since: datetime = None,
+    until: datetime = None,
+    limit: int = 100,
+    cursor: str = None,
+    actor=None,
+    request=None,
+) -> dict:
+    """Per-key request and error totals over [since, until), newest keys first, with last_used_at."""
+    since = since or datetime.now(timezone.utc) - DEFAULT_USAGE_WINDOW
+    usage = select(
+        APIKeyUsage.api_key_id,
+        func.sum(APIKeyUsage.requests).label("requests"),
+        func.sum(APIKeyUsage.errors).label("errors"),
+    ).where(APIKeyUsage.bucket_start >= since)
+    if until:
+        usage = usage.where(APIKeyUsage.bucket_start < until)
+    usage = usage.group_by(APIKeyUsage.api_key_id).subquery()
+
+    query = (
+        select(
+            APIKey.id, APIKey.key_id, APIKey.user_id, APIKey.last_used_at, APIKey.date_created,
+            func.coalesce(usage.c.requests, 0).label("requests"),
+            func.coalesce(usage.c.errors, 0).label("errors"),
+        )
+        .outerjoin(usage, usage.c.api_key_id == APIKey.id)
+    )
+    if user_id:
+        query = query.where(APIKey.user_id == user_id)
+    result = await db.execute(paginate(query, APIKey.date_created, APIKey.id, limit, cursor=cursor))
+    page = build_page(result.all(), limit)
+    page["items"] = [
+        {
+            "api_key_id": row.id,
+            "key_id": row.key_id,
+            "user_id": row.user_id,
+            "last_used_at": row.last_used_at,
+            "requests": row.requests,
+            "errors": row.errors,
+        }
+        for row in page["items"]
+    ]
+
+    log_activity(db, actor, "api_key_usage_list", request=request,
+                 description=f"Listed API key usage (user_id={user_id if user_id else 'all'})")
+    return page
+
+
+async def get_api_key_usage(
+    db: AsyncSession,
+    api_key_id: UUID,
+    since: datetime = None,
+    until: datetime = None,
+    actor=None,
+    request=None,
+) -> list:
+    """Hourly usage of one key over [since, until), newest hour first (at most MAX_USAGE_BUCKETS hours)."""
+    exists = await db.execute(select(APIKey.id).where(APIKey.id == api_key_id))
+    if exists.scalar_one_or_none() is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="API Key not found")
+
+    query = (
+        select(APIKeyUsage)
+        .where(APIKeyUsage.api_key_id == api_key_id)
+        .where(APIKeyUsage.bucket_start >= (since or datetime.now(timezone.utc) - DEFAULT_USAGE_WINDOW))
+    )
+    if until:
+        query = query.where(APIKeyUsage.bucket_start < until)
+    result = await db.execute(query.order_by(APIKeyUsage.bucket_start.desc()).limit(MAX_USAGE_BUCKETS))
+    buckets = result.scalars().all()
+
+    log_activity(db, actor, "api_key_usage_get", request=request,
+                 description=f"API key {api_key_id} usage retrieved")
+    return buckets
@@ -0,0 +1,85 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, Request
+from typing import Dict, List
+from uuid import UUID
+from app.models.staff_model import Staff
+from app.models.user_model import User, UserStatus
+from app.schemas.authz_schema import AuthzCheck
+from app.services.restriction_service import RestrictionService
+from app.utils.activity_logger import log_activity
+from app.utils.permission_cache import permission_cache
+from app.utils.principal import APIKeyPrincipal, Principal, StaffPrincipal
+
+
+async def _load_subjects(db: AsyncSession, user_ids) -> Dict[UUID, tuple]:
+    """(status, staff principal or None, permission_mask) of each existing user, in one query."""
+    result = await db.execute(
+        select(User.id, User.status, Staff.id, Staff.role, Staff.department, Staff.permission_mask)
+        .outerjoin(Staff, Staff.user_id == User.id)
+        .where(User.id.in_(user_ids))
+    )
+    subjects = {}
+    for user_id, user_status, staff_id, role, department, mask in result:
+        staff = StaffPrincipal(id=staff_id, role=role, department=department) if staff_id else None
+        subjects[user_id] = (user_status, staff, mask or 0)
+    return subjects
+
+
+async def check_batch(
+    db: AsyncSession,
+    checks: List[AuthzCheck],
+    actor: Principal = None,
+    request: Request = None,
+    api_key: APIKeyPrincipal = None,
+) -> dict:
+    """
+    Answer many authorization checks at once, the way permission_required and
+    RestrictionService.enforce would: one query for every subject and target, permission
+    bits from the permission cache, and everything else evaluated in memory. The caller
+    is a staff member (`actor`) or a machine client (`api_key`).
+    """
+    user_ids = {check.subject_id for check in checks} | {check.target_id for check in checks if check.target_id}
+    subjects = await _load_subjects(db, user_ids)
+    required = await permission_cache.required_masks(db, {check.permission for check in checks if check.permission})
+
+    results = []
+    for check in checks:
+        subject = subjects.get(check.subject_id)
+        if subject is None:
+            results.append({"allowed": False, "reason": "Subject not found"})
+            continue
+        user_status, staff, mask = subject
+        if user_status != UserStatus.ACTIVE:
+            results.append({"allowed": False, "reason": f"User account is {user_status.value}"})
+            continue
+
+        if check.permission:
+            if staff is None:
+                results.append({"allowed": False, "reason": "User is not a staff member"})
+                continue
+            if not mask & required[check.permission]:
+                results.append({"allowed": False, "reason": f"Permission denied: {check.permission}"})
+                continue
+
+        if check.action:
+            target = subjects.get(check.target_id)
+            if target is None:
+                results.append({"allowed": False, "reason": "Target not found"})
+                continue
+            # Restrictions only apply between two staff members, as in log_activity
+            target_staff = target[1]
+            if staff is not None and target_staff is not None:
+                try:
+                    RestrictionService.enforce(staff, target_staff, check.action)
+                except HTTPException as exc:
+                    results.append({"allowed": False, "reason": exc.detail})
+                    continue
+
+        results.append({"allowed": True, "reason": None})
+
+    log_activity(db, actor, "authz_check", request=request,
+                 description=f"Evaluated {len(checks)} authorization checks "
+                             f"({sum(result['allowed'] for result in results)} allowed)"
+                             + (f" for API key {api_key.key_id}" if api_key else ""))
+    return {"results": results}
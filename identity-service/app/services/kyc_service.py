@@ -1,9 +1,12 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from app.models.user_model import User, UserStatus
 from app.models.kyc_model import KYCVerification
 from app.schemas.kyc_schema import KYCVerificationCreate
 from app.utils.activity_logger import log_activity
+from app.utils.principal import Principal
+from app.utils.token_cache import token_cache
 
 
 class KYCService:
@@ -11,16 +14,18 @@ class KYCService:
     # KYC Handling
     # -------------------------
     @staticmethod
-    def submit_kyc(db: Session, user: User, kyc_in: KYCVerificationCreate, actor: User = None, request=None) -> KYCVerification:
+    async def submit_kyc(db: AsyncSession, user: Principal, kyc_in: KYCVerificationCreate, actor: Principal = None, request=None) -> KYCVerification:
         """Submit new KYC attempt for user (keeps history)."""
         try:
             kyc = KYCVerification(user_id=user.id, **kyc_in.dict())
             db.add(kyc)
 
             # Update user status
-            user.status = UserStatus.PENDING_KYC
-            db.commit()
-            db.refresh(kyc)
+            db_user = await db.get(User, user.id)
+            db_user.status = UserStatus.PENDING_KYC
+            await db.commit()
+            await db.refresh(kyc)
+            token_cache.invalidate_user(user.id)
 
             log_activity(
                 db, actor or user, "kyc_submit_success", request=request,
@@ -36,18 +41,24 @@ class KYCService:
             raise
 
     @staticmethod
-    def get_latest_kyc(user: User, db: Session, actor: User = None, request=None) -> KYCVerification | None:
+    async def get_latest_kyc(user: Principal, db: AsyncSession, actor: Principal = None, request=None) -> KYCVerification | None:
         """Return most recent KYC record for a user."""
         try:
-            if not user.kyc_verifications:
+            # Served by ix_kyc_verifications_user_id_date_created, only the newest row is read
+            result = await db.execute(
+                select(KYCVerification)
+                .where(KYCVerification.user_id == user.id)
+                .order_by(KYCVerification.date_created.desc())
+                .limit(1)
+            )
+            latest = result.scalar_one_or_none()
+            if latest is None:
                 log_activity(
                     db, actor or user, "kyc_get_none", request=request,
                     description=f"No KYC records found for user {user.username}"
                 )
                 return None
 
-            latest = sorted(user.kyc_verifications, key=lambda k: k.date_created)[-1]
-
             log_activity(
                 db, actor or user, "kyc_get_latest", request=request,
                 description=f"Latest KYC retrieved for user {user.username}"
@@ -1,85 +1,145 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
 from fastapi import HTTPException, status
 from app.models.staff_model import Staff, StaffRole, Department
-from app.models.user_model import User
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
-class RestrictionService:
-    # ---------------- CORE RESTRICTION ---------------- #
-    @staticmethod
-    def enforce(actor: Staff, target: Staff, action: str):
-        """
-        Core restriction enforcement.
-        Decides what staff can do to another staff based on their roles.
-        Supported actions: 'view', 'edit', 'delete', 'create'
-        """
+SELF, OTHER = "self", "other"
 
-        # Superuser restrictions
-        if target.role == StaffRole.SUPERUSER:
-            RestrictionService._enforce_superuser_rules(actor, target, action)
+# Actions the staff services and log_activity pass to `enforce`; any other action string
+# is only matched by rules that apply to every action
+ACTIONS = ("view", "edit", "delete", "create", "view_logs")
 
-        # Admin restrictions
-        elif target.role == StaffRole.ADMIN:
-            RestrictionService._enforce_admin_rules(actor, target, action)
 
-        # Future roles (support, compliance, etc.) can be added here
-        # e.g., elif target.role == StaffRole.MANAGER: RestrictionService._enforce_manager_rules(...)
+@dataclass(frozen=True)
+class Rule:
+    """
+    One restriction: applies when the target has role `target` and the actor role, action
+    and relation (SELF: acting on their own record, OTHER: on someone else's) match; None
+    matches anything. `deny` is the (status code, detail) raised, or None to allow.
+    """
+    target: StaffRole
+    deny: Optional[Tuple[int, str]]
+    actor: Optional[StaffRole] = None
+    action: Optional[str] = None
+    relation: Optional[str] = None
 
-    # ---------------- SUPERUSER RULES ---------------- #
-    @staticmethod
-    def _enforce_superuser_rules(actor: Staff, target: Staff, action: str):
-        """
-        Superuser rules:
-        - Only the superuser can view/edit/delete their own record.
-        - No one can change superuser `role` or `department`.
-        """
-        if actor.id != target.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You cannot perform actions on another superuser."
-            )
-
-        if action in ["edit"]:
-            # Block editing restricted fields
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="The fields 'role' and 'department' for superuser cannot be edited."
-            )
-
-    # ---------------- ADMIN RULES ---------------- #
+    def matches(self, actor: StaffRole, target: StaffRole, action: Optional[str], relation: str) -> bool:
+        return (
+            self.target == target
+            and self.actor in (None, actor)
+            and self.action in (None, action)
+            and self.relation in (None, relation)
+        )
+
+
+# First matching rule wins; requests no rule matches are allowed.
+# Future roles (support, compliance, manager, ...) get their rules added here.
+POLICY = (
+    # Superuser: only the superuser can view/edit/delete their own record,
+    # and no one can change the superuser's `role` or `department`
+    Rule(StaffRole.SUPERUSER, relation=OTHER,
+         deny=(status.HTTP_403_FORBIDDEN, "You cannot perform actions on another superuser.")),
+    Rule(StaffRole.SUPERUSER, action="edit",
+         deny=(status.HTTP_403_FORBIDDEN, "The fields 'role' and 'department' for superuser cannot be edited.")),
+    # Admin: the superuser can view/edit/delete/create admins, other staff roles cannot manage them
+    Rule(StaffRole.ADMIN, actor=StaffRole.SUPERUSER, deny=None),
+    Rule(StaffRole.ADMIN, deny=(status.HTTP_403_FORBIDDEN, "Only superuser can manage admins.")),
+)
+
+_ROLES = tuple(StaffRole)
+_ROLE_INDEX = {role: index for index, role in enumerate(_ROLES)}
+# Slot len(ACTIONS) stands for every action not listed in ACTIONS
+_ACTION_INDEX = {action: index for index, action in enumerate(ACTIONS)}
+_OTHER_ACTION = len(ACTIONS)
+_ROW = len(_ROLES) * (_OTHER_ACTION + 1)
+
+
+@dataclass(frozen=True)
+class _ByRelation:
+    """Table cell whose decision depends on whether the actor acts on their own record."""
+    other: Optional[Tuple[int, str]]
+    own: Optional[Tuple[int, str]]
+
+
+def _compile(policy) -> tuple:
+    """
+    Flatten `policy` into a dense table indexed by (actor * roles + target) * actions + action.
+    Cells hold the decision directly, or a _ByRelation where SELF and OTHER differ, so the
+    actor and target ids are only compared for those.
+    """
+    table = []
+    for actor in _ROLES:
+        for target in _ROLES:
+            for action in ACTIONS + (None,):
+                other, own = (
+                    next((rule.deny for rule in policy if rule.matches(actor, target, action, relation)), None)
+                    for relation in (OTHER, SELF)
+                )
+                table.append(other if other == own else _ByRelation(other, own))
+    return tuple(table)
+
+
+def _compile_without_actor(policy) -> tuple:
+    """Decisions when there is no acting staff member, indexed by target * actions + action:
+    only rules for any actor apply, and the target is never the actor's own record."""
+    return tuple(
+        next((rule.deny for rule in policy if rule.matches(None, target, action, OTHER)), None)
+        for target in _ROLES
+        for action in ACTIONS + (None,)
+    )
+
+
+_DECISIONS = _compile(POLICY)
+_DECISIONS_WITHOUT_ACTOR = _compile_without_actor(POLICY)
+
+
+class RestrictionService:
+    # ---------------- CORE RESTRICTION ---------------- #
     @staticmethod
-    def _enforce_admin_rules(actor: Staff, target: Staff, action: str):
+    def enforce(actor: Staff, target: Staff, action: str):
         """
-        Admin rules:
-        - Superuser can view/edit/delete/create Admins.
-        - Other staff roles cannot manage Admins.
+        Core restriction enforcement.
+        Decides what staff can do to another staff based on their roles, by one lookup in
+        the decision table compiled from POLICY at import time.
+        Supported actions: 'view', 'edit', 'delete', 'create', 'view_logs'
         """
-        if actor.role == StaffRole.SUPERUSER:
-            return  # full rights on Admins
-
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only superuser can manage admins."
-        )
+        if actor is None:
+            deny = _DECISIONS_WITHOUT_ACTOR[_ROLE_INDEX[target.role] * (_OTHER_ACTION + 1)
+                                            + _ACTION_INDEX.get(action, _OTHER_ACTION)]
+            if deny is not None:
+                raise HTTPException(status_code=deny[0], detail=deny[1])
+            return
+        deny = _DECISIONS[
+            _ROLE_INDEX[actor.role] * _ROW
+            + _ROLE_INDEX[target.role] * (_OTHER_ACTION + 1)
+            + _ACTION_INDEX.get(action, _OTHER_ACTION)
+        ]
+        if deny.__class__ is _ByRelation:
+            deny = deny.own if actor.id == target.id else deny.other
+        if deny is not None:
+            raise HTTPException(status_code=deny[0], detail=deny[1])
 
     # ---------------- CREATION RESTRICTIONS ---------------- #
     @staticmethod
-    def ensure_single_superuser(db: Session, role: StaffRole, department: Department):
+    async def ensure_single_superuser(db: AsyncSession, role: StaffRole, department: Department):
         """
         Prevent creation of multiple superusers.
         Both role=superuser and department=superuser must remain unique.
         """
         if role == StaffRole.SUPERUSER:
-            existing = db.query(Staff).filter(Staff.role == StaffRole.SUPERUSER).first()
-            if existing:
+            existing = await db.execute(select(Staff.id).where(Staff.role == StaffRole.SUPERUSER).limit(1))
+            if existing.first():
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="A superuser already exists."
                 )
 
         if department == Department.SUPERUSER:
-            existing = db.query(Staff).filter(Staff.department == Department.SUPERUSER).first()
-            if existing:
+            existing = await db.execute(select(Staff.id).where(Staff.department == Department.SUPERUSER).limit(1))
+            if existing.first():
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="A superuser department already exists."
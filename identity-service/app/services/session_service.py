@@ -1,20 +1,23 @@
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from app.models.session_model import Session as UserSession
-from app.schemas.session_schema import SessionCreate, SessionUpdate, SessionResponse
+from app.schemas.session_schema import ActiveSessionResponse, SessionCreate, SessionUpdate, SessionResponse
 from app.utils.activity_logger import log_activity
+from app.utils.network import parse_network, within
+from app.utils.pagination import build_page, paginate
 
 
 class SessionService:
     @staticmethod
-    def create_session(db: Session, session_in: SessionCreate, actor=None, request=None) -> SessionResponse:
+    async def create_session(db: AsyncSession, session_in: SessionCreate, actor=None, request=None) -> SessionResponse:
         """Create and persist a new user session."""
         try:
             session = UserSession(**session_in.dict())
             db.add(session)
-            db.commit()
-            db.refresh(session)
+            await db.commit()
+            await db.refresh(session)
 
             log_activity(
                 db, actor, "session_create_success", request=request,
@@ -30,13 +33,20 @@ class SessionService:
             raise
 
     @staticmethod
-    def invalidate_session(db: Session, refresh_token: str, user_id: str, actor=None, request=None) -> None:
-        """Invalidate a session by refresh token for a specific user."""
-        session = (
-            db.query(UserSession)
-            .filter_by(user_id=user_id, refresh_token=refresh_token, is_valid=True)
-            .first()
+    async def _get_valid_session(db: AsyncSession, refresh_token: str, user_id: str) -> UserSession | None:
+        result = await db.execute(
+            select(UserSession).where(
+                UserSession.user_id == user_id,
+                UserSession.refresh_token == refresh_token,
+                UserSession.is_valid == True,
+            )
         )
+        return result.scalars().first()
+
+    @staticmethod
+    async def invalidate_session(db: AsyncSession, refresh_token: str, user_id: str, actor=None, request=None) -> None:
+        """Invalidate a session by refresh token for a specific user."""
+        session = await SessionService._get_valid_session(db, refresh_token, user_id)
         if not session:
             log_activity(
                 db, actor, "session_invalidate_failed", request=request,
@@ -48,7 +58,7 @@ class SessionService:
             )
 
         session.is_valid = False
-        db.commit()
+        await db.commit()
 
         log_activity(
             db, actor, "session_invalidate_success", request=request,
@@ -56,13 +66,9 @@ class SessionService:
         )
 
     @staticmethod
-    def validate_refresh_token(db: Session, refresh_token: str, user_id: str, actor=None, request=None) -> UserSession:
+    async def validate_refresh_token(db: AsyncSession, refresh_token: str, user_id: str, actor=None, request=None) -> UserSession:
         """Ensure refresh token exists, is valid, and not expired."""
-        session = (
-            db.query(UserSession)
-            .filter_by(user_id=user_id, refresh_token=refresh_token, is_valid=True)
-            .first()
-        )
+        session = await SessionService._get_valid_session(db, refresh_token, user_id)
         if not session:
             log_activity(
                 db, actor, "session_validate_failed", request=request,
@@ -73,7 +79,8 @@ class SessionService:
                 detail="Invalid or expired refresh token",
             )
 
-        if session.expires_at < datetime.now(timezone.utc):
+        # expires_at is stored without a time zone, in UTC
+        if session.expires_at < datetime.now(timezone.utc).replace(tzinfo=None):
             log_activity(
                 db, actor, "session_validate_failed", request=request,
                 description=f"Expired refresh token for user_id={user_id}"
@@ -90,3 +97,23 @@ class SessionService:
         )
 
         return session
+
+    @staticmethod
+    async def list_active_sessions(
+        db: AsyncSession, network: str, limit: int = 100, cursor: str = None, actor=None, request=None,
+    ) -> dict:
+        """Valid, unexpired sessions whose client IP lies in `network` (CIDR), via the GiST index."""
+        query = select(UserSession).where(
+            within(UserSession.ip_address, parse_network(network)),
+            UserSession.is_valid == True,
+            UserSession.expires_at > func.now(),
+        )
+        result = await db.execute(paginate(query, UserSession.date_created, UserSession.id, limit, cursor=cursor))
+        page = build_page(result.scalars().all(), limit)
+
+        log_activity(
+            db, actor, "session_list_by_network", request=request,
+            description=f"Listed {len(page['items'])} active sessions in {network}"
+        )
+        page["items"] = [ActiveSessionResponse.from_orm(session) for session in page["items"]]
+        return page
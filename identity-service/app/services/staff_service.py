@@ -1,34 +1,69 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status, Request
 from uuid import UUID
+from typing import List, Optional
+from app.models.permission_model import Permission
 from app.models.staff_model import Staff, StaffRole, Department
+from app.models.user_model import User
 from app.schemas.staff_schema import StaffCreate, StaffUpdate
 from app.services.restriction_service import RestrictionService
 from app.utils.activity_logger import log_activity
+from app.utils.pagination import build_page, paginate
+from app.utils.principal import Principal
+from app.utils.permission_bits import mask_of
+from app.utils.permission_cache import permission_cache
+from app.utils.token_cache import token_cache
 
 
-def create_staff(db: Session, staff_data: StaffCreate, actor: Staff = None, request: Request = None):
+# Staff responses embed permissions and log entries reference the staff's user,
+# so both are loaded up front instead of lazily (which an AsyncSession cannot do).
+_STAFF_LOAD_OPTIONS = (
+    selectinload(Staff.permissions),
+    selectinload(Staff.user).selectinload(User.staff_profile),
+)
+
+
+async def _permissions_by_name(db: AsyncSession, names: List[str]) -> List[Permission]:
+    if not names:
+        return []
+    result = await db.execute(select(Permission).where(Permission.name.in_(names)))
+    return list(result.scalars().all())
+
+
+async def get_permission_mask(db: AsyncSession, user_id: UUID) -> Optional[int]:
+    """permission_mask of the user's staff profile, or None if the user is not staff."""
+    result = await db.execute(select(Staff.permission_mask).where(Staff.user_id == user_id))
+    return result.scalar_one_or_none()
+
+
+async def create_staff(db: AsyncSession, staff_data: StaffCreate, actor: Principal = None, request: Request = None):
     try:
         # Ensure superuser uniqueness
-        RestrictionService.ensure_single_superuser(db, staff_data.role, staff_data.department)
+        await RestrictionService.ensure_single_superuser(db, staff_data.role, staff_data.department)
 
+        permissions = await _permissions_by_name(db, staff_data.permissions)
         new_staff = Staff(
             user_id=staff_data.user_id,
             department=staff_data.department,
             role=staff_data.role,
-            permissions=staff_data.permissions,
+            permissions=permissions,
+            permission_mask=mask_of(permissions),
         )
         db.add(new_staff)
-        db.commit()
-        db.refresh(new_staff)
+        await db.commit()
+        await db.refresh(new_staff, ["user", "permissions"])
+        # Cached principals of this user were built without a staff profile
+        token_cache.invalidate_user(staff_data.user_id)
 
         log_activity(
             db,
             target_user=new_staff.user,
             activity_type="create_staff_success",
             request=request,
-            current_user=actor.user if actor else None,
-            description=f"Staff {new_staff.id} created by {actor.user.username if actor else 'system'}"
+            current_user=actor,
+            description=f"Staff {new_staff.id} created by {actor.username if actor else 'system'}"
         )
 
         return new_staff
@@ -37,71 +72,86 @@ def create_staff(db: Session, staff_data: StaffCreate, actor: Staff = None, requ
     except Exception as e:
         log_activity(
             db,
-            target_user=actor.user if actor else None,
+            target_user=actor,
             activity_type="create_staff_error",
             request=request,
-            current_user=actor.user if actor else None,
+            current_user=actor,
             description=str(e)
         )
         raise
 
 
-def get_staff(db: Session, staff_id: UUID, actor: Staff = None, request: Request = None):
-    staff = db.query(Staff).filter(Staff.id == staff_id).first()
+async def get_staff(db: AsyncSession, staff_id: UUID, actor: Principal = None, request: Request = None):
+    result = await db.execute(select(Staff).options(*_STAFF_LOAD_OPTIONS).where(Staff.id == staff_id))
+    staff = result.scalar_one_or_none()
     if not staff:
         log_activity(
             db,
-            target_user=actor.user if actor else None,
+            target_user=actor,
             activity_type="get_staff_failed",
             request=request,
-            current_user=actor.user if actor else None,
+            current_user=actor,
             description=f"Staff {staff_id} not found"
         )
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Staff not found")
 
     if actor:
-        RestrictionService.enforce(actor, staff, action="view")
+        RestrictionService.enforce(actor.staff_profile, staff, action="view")
 
     log_activity(
         db,
         target_user=staff.user,
         activity_type="get_staff_success",
         request=request,
-        current_user=actor.user if actor else None,
-        description=f"Staff {staff.id} retrieved by {actor.user.username if actor else 'system'}"
+        current_user=actor,
+        description=f"Staff {staff.id} retrieved by {actor.username if actor else 'system'}"
     )
 
     return staff
 
 
-def list_staff(db: Session, skip: int = 0, limit: int = 50, actor: Staff = None, request: Request = None):
-    staff_list = db.query(Staff).offset(skip).limit(limit).all()
+async def list_staff(
+    db: AsyncSession,
+    limit: int = 50,
+    cursor: str = None,
+    skip: int = None,
+    actor: Principal = None,
+    request: Request = None,
+):
+    result = await db.execute(
+        paginate(
+            select(Staff).options(selectinload(Staff.permissions)),
+            Staff.date_created, Staff.id, limit, cursor=cursor, skip=skip,
+        )
+    )
+    page = build_page(result.scalars().all(), limit)
+    staff_list = page["items"]
 
     log_activity(
         db,
-        target_user=actor.user if actor else None,
+        target_user=actor,
         activity_type="list_staff",
         request=request,
-        current_user=actor.user if actor else None,
+        current_user=actor,
         description=f"Listed {len(staff_list)} staff records"
     )
 
-    return staff_list
+    return page
 
 
-def update_staff(db: Session, staff_id: UUID, staff_data: StaffUpdate, actor: Staff, request: Request = None):
+async def update_staff(db: AsyncSession, staff_id: UUID, staff_data: StaffUpdate, actor: Principal, request: Request = None):
     try:
-        staff = get_staff(db, staff_id, actor=actor, request=request)
+        staff = await get_staff(db, staff_id, actor=actor, request=request)
 
-        RestrictionService.enforce(actor, staff, action="edit")
+        RestrictionService.enforce(actor.staff_profile, staff, action="edit")
 
         if staff_data.role == StaffRole.SUPERUSER or staff_data.department == Department.SUPERUSER:
             log_activity(
                 db,
-                target_user=actor.user,
+                target_user=actor,
                 activity_type="update_staff_denied",
                 request=request,
-                current_user=actor.user,
+                current_user=actor,
                 description="Attempt to update staff to SUPERUSER"
             )
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot update staff to SUPERUSER")
@@ -111,18 +161,21 @@ def update_staff(db: Session, staff_id: UUID, staff_data: StaffUpdate, actor: St
         if staff_data.role is not None:
             staff.role = staff_data.role
         if staff_data.permissions is not None:
-            staff.permissions = staff_data.permissions
+            staff.permissions = await _permissions_by_name(db, staff_data.permissions)
+            staff.permission_mask = mask_of(staff.permissions)
 
-        db.commit()
-        db.refresh(staff)
+        await db.commit()
+        await db.refresh(staff, ["permissions"])
+        token_cache.invalidate_user(staff.user_id)
+        permission_cache.invalidate(staff.id)
 
         log_activity(
             db,
             target_user=staff.user,
             activity_type="update_staff_success",
             request=request,
-            current_user=actor.user,
-            description=f"Staff {staff.id} updated by {actor.user.username}"
+            current_user=actor,
+            description=f"Staff {staff.id} updated by {actor.username}"
         )
 
         return staff
@@ -131,31 +184,33 @@ def update_staff(db: Session, staff_id: UUID, staff_data: StaffUpdate, actor: St
     except Exception as e:
         log_activity(
             db,
-            target_user=actor.user,
+            target_user=actor,
             activity_type="update_staff_error",
             request=request,
-            current_user=actor.user,
+            current_user=actor,
             description=str(e)
         )
         raise
 
 
-def delete_staff(db: Session, staff_id: UUID, actor: Staff, request: Request = None):
+async def delete_staff(db: AsyncSession, staff_id: UUID, actor: Principal, request: Request = None):
     try:
-        staff = get_staff(db, staff_id, actor=actor, request=request)
+        staff = await get_staff(db, staff_id, actor=actor, request=request)
 
-        RestrictionService.enforce(actor, staff, action="delete")
+        RestrictionService.enforce(actor.staff_profile, staff, action="delete")
 
-        db.delete(staff)
-        db.commit()
+        await db.delete(staff)
+        await db.commit()
+        token_cache.invalidate_user(staff.user_id)
+        permission_cache.invalidate(staff.id)
 
         log_activity(
             db,
             target_user=staff.user,
             activity_type="delete_staff_success",
             request=request,
-            current_user=actor.user,
-            description=f"Staff {staff.id} deleted by {actor.user.username}"
+            current_user=actor,
+            description=f"Staff {staff.id} deleted by {actor.username}"
         )
 
         return {"message": "Staff deleted successfully"}
@@ -164,10 +219,10 @@ def delete_staff(db: Session, staff_id: UUID, actor: Staff, request: Request = N
     except Exception as e:
         log_activity(
             db,
-            target_user=actor.user,
+            target_user=actor,
             activity_type="delete_staff_error",
             request=request,
-            current_user=actor.user,
+            current_user=actor,
             description=str(e)
         )
         raise
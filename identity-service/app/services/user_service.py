@@ -1,19 +1,24 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, undefer
 from fastapi import HTTPException, status
+from uuid import UUID
 from app.models.user_model import User, UserStatus
 from app.schemas.user_schema import UserCreate, UserUpdate
-from app.utils.activity_logger import log_activity 
-from passlib.context import CryptContext
+from app.utils.activity_logger import log_activity
+from app.utils.principal import Principal
+from app.utils.token_cache import token_cache
+from app.utils.password_hasher import password_hasher
+from app.utils.pagination import build_page, paginate
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+async def hash_password(password: str) -> str:
+    # bcrypt runs on the hashing process pool, the event loop only awaits the result
+    return await password_hasher.hash(password)
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
 
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
 
 
 class UserService:
@@ -21,9 +26,10 @@ class UserService:
     # Authentication
     # -------------------------
     @staticmethod
-    def authenticate_user(db: Session, email: str, password: str, request=None) -> User:
-        user = db.query(User).filter(User.email == email).first()
-        if not user or not verify_password(password, user.hashed_password):
+    async def authenticate_user(db: AsyncSession, email: str, password: str, request=None) -> User:
+        result = await db.execute(select(User).options(undefer(User.hashed_password)).where(User.email == email))
+        user = result.scalar_one_or_none()
+        if not user or not await verify_password(password, user.hashed_password):
             log_activity(db, None, "login_failed", request=request, description=f"Failed login attempt for {email}")
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
@@ -34,23 +40,28 @@ class UserService:
         log_activity(db, user, "login_success", request=request, description=f"User {email} logged in")
         return user
 
+    @staticmethod
+    async def _exists(db: AsyncSession, *criteria) -> bool:
+        result = await db.execute(select(User.id).where(*criteria).limit(1))
+        return result.first() is not None
+
     # -------------------------
     # CRUD: Create
     # -------------------------
     @staticmethod
-    def create_user(db: Session, user_in: UserCreate, current_user: User = None, request=None) -> User:
+    async def create_user(db: AsyncSession, user_in: UserCreate, current_user: Principal = None, request=None) -> User:
         try:
             if getattr(user_in, "is_superuser", False):
                 log_activity(db, current_user, "create_user_denied", request=request,
                              description="Attempt to create superuser")
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot create another superuser")
 
-            if db.query(User).filter(User.username == user_in.username).first():
+            if await UserService._exists(db, User.username == user_in.username):
                 log_activity(db, current_user, "create_user_failed", request=request,
                              description=f"Username {user_in.username} already taken")
                 raise HTTPException(status_code=400, detail="Username already taken")
 
-            if db.query(User).filter(User.email == user_in.email).first():
+            if await UserService._exists(db, User.email == user_in.email):
                 log_activity(db, current_user, "create_user_failed", request=request,
                              description=f"Email {user_in.email} already registered")
                 raise HTTPException(status_code=400, detail="Email already registered")
@@ -59,11 +70,11 @@ class UserService:
                 username=user_in.username,
                 email=user_in.email,
                 phone_number=user_in.phone_number,
-                hashed_password=hash_password(user_in.password),
+                hashed_password=await hash_password(user_in.password),
             )
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
 
             log_activity(db, user, "create_user_success", request=request,
                          description=f"User {user.username} created by {current_user.username if current_user else 'system'}")
@@ -80,7 +91,7 @@ class UserService:
     # CRUD: Update
     # -------------------------
     @staticmethod
-    def update_user(db: Session, user: User, user_in: UserUpdate, current_user: User, request=None) -> User:
+    async def update_user(db: AsyncSession, user: User, user_in: UserUpdate, current_user: Principal, request=None) -> User:
         try:
             if user.is_superuser and user.id != current_user.id:
                 log_activity(db, current_user, "update_user_denied", request=request,
@@ -92,25 +103,25 @@ class UserService:
 
             # --- Uniqueness checks ---
             if user_in.username and user_in.username != user.username:
-                if db.query(User).filter(User.username == user_in.username).first():
+                if await UserService._exists(db, User.username == user_in.username):
                     log_activity(db, current_user, "update_user_failed", request=request,
                                  description=f"Username {user_in.username} already taken")
                     raise HTTPException(status_code=400, detail="Username already taken")
 
             if user_in.email and user_in.email != user.email:
-                if db.query(User).filter(User.email == user_in.email).first():
+                if await UserService._exists(db, User.email == user_in.email):
                     log_activity(db, current_user, "update_user_failed", request=request,
                                  description=f"Email {user_in.email} already registered")
                     raise HTTPException(status_code=400, detail="Email already registered")
 
             if user_in.phone_number and user_in.phone_number != user.phone_number:
-                if db.query(User).filter(User.phone_number == user_in.phone_number).first():
+                if await UserService._exists(db, User.phone_number == user_in.phone_number):
                     log_activity(db, current_user, "update_user_failed", request=request,
                                  description=f"Phone {user_in.phone_number} already registered")
                     raise HTTPException(status_code=400, detail="Phone number already registered")
 
             if user_in.password:
-                user.hashed_password = hash_password(user_in.password)
+                user.hashed_password = await hash_password(user_in.password)
 
             if user_in.is_verified is not None:
                 user.is_verified = user_in.is_verified
@@ -121,9 +132,9 @@ class UserService:
             if user_in.twofa_secret is not None:
                 user.twofa_secret = user_in.twofa_secret
 
-            db.commit()
-            db.refresh(user)
-            return user
+            await db.commit()
+            await db.refresh(user)
+            token_cache.invalidate_user(user.id)
 
             log_activity(db, user, "update_user_success", request=request,
                          description=f"User {user.username} updated by {current_user.username}")
@@ -132,7 +143,7 @@ class UserService:
         except HTTPException:
             raise
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             log_activity(db, current_user, "update_user_error", request=request, description=str(e))
             raise
 
@@ -141,9 +152,14 @@ class UserService:
     # CRUD: Read
     # -------------------------
     @staticmethod
-    def get_user_by_id(db: Session, user_id: int, current_user: User, request=None) -> User:
+    async def get_user_by_id(db: AsyncSession, user_id: UUID, current_user: Principal, request=None) -> User:
         try:
-            user = db.query(User).filter(User.id == user_id).first()
+            result = await db.execute(
+                select(User)
+                .options(selectinload(User.staff_profile))
+                .where(User.id == user_id)
+            )
+            user = result.scalar_one_or_none()
             if not user:
                 log_activity(db, current_user, "get_user_failed", request=request,
                              description=f"User {user_id} not found")
@@ -167,18 +183,28 @@ class UserService:
             raise HTTPException(status_code=500, detail="Error retrieving user")
 
     @staticmethod
-    def list_users(db: Session, current_user: User = None, skip: int = 0, limit: int = 100, request=None) -> list[User]:
+    async def list_users(
+        db: AsyncSession,
+        current_user: Principal = None,
+        limit: int = 100,
+        cursor: str = None,
+        skip: int = None,
+        request=None,
+    ) -> dict:
+        """Newest-first page of users; pass the returned `next_cursor` back to continue (`skip` is legacy)."""
         try:
-            users = (
-                db.query(User)
-                .filter(User.is_superuser == False) 
-                .offset(skip)
-                .limit(limit)
-                .all()
+            result = await db.execute(
+                paginate(
+                    select(User).where(User.is_superuser == False),
+                    User.date_created, User.id, limit, cursor=cursor, skip=skip,
+                )
             )
+            page = build_page(result.scalars().all(), limit)
             log_activity(db, current_user, "list_users_success", request=request,
-                         description=f"{len(users)} users retrieved by {current_user.username if current_user else 'system'}")
-            return users
+                         description=f"{len(page['items'])} users retrieved by {current_user.username if current_user else 'system'}")
+            return page
+        except HTTPException:
+            raise
         except Exception as e:
             log_activity(db, current_user, "list_users_error", request=request, description=str(e))
             raise HTTPException(status_code=500, detail="Error retrieving users")
@@ -188,7 +214,7 @@ class UserService:
     # CRUD: Delete
     # -------------------------
     @staticmethod
-    def delete_user(db: Session, user: User, current_user: User, request=None) -> None:
+    async def delete_user(db: AsyncSession, user: User, current_user: Principal, request=None) -> None:
         try:
             if user.is_superuser and user.id != current_user.id:
                 log_activity(db, current_user, "delete_user_denied", request=request,
@@ -196,8 +222,9 @@ class UserService:
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
                                     detail="Superuser cannot be deleted by others")
 
-            db.delete(user)
-            db.commit()
+            await db.delete(user)
+            await db.commit()
+            token_cache.invalidate_user(user.id)
 
             log_activity(db, user, "delete_user_success", request=request,
                          description=f"User {user.username} deleted by {current_user.username}")
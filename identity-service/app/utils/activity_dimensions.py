@@ -0,0 +1,88 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+from sqlalchemy import Table, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.models.activity_dimension_model import content_hash
+
+
+class DimensionCache:
+    """
+    Value -> id interning for one dimension table (user_agents, ip_addresses).
+
+    Resolved ids are kept in an LRU of `capacity` entries, so in steady state a batch of
+    activity logs is resolved without touching the database. Misses are resolved for the
+    whole batch at once, in a transaction of their own: one INSERT ... ON CONFLICT (hash)
+    DO NOTHING for values never seen before and one SELECT by hash for all of them. Ids
+    only enter the cache once that transaction has committed, so a failed batch can never
+    leave ids of rolled-back rows behind.
+    """
+
+    def __init__(self, table: Table, capacity: int):
+        self.table = table
+        self.capacity = capacity
+        self._ids: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # --- Counters ---
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, value: str) -> Optional[int]:
+        with self._lock:
+            dim_id = self._ids.get(value)
+            if dim_id is None:
+                return None
+            self._ids.move_to_end(value)
+            return dim_id
+
+    def put(self, value: str, dim_id: int) -> None:
+        with self._lock:
+            self._ids[value] = dim_id
+            self._ids.move_to_end(value)
+            while len(self._ids) > self.capacity:
+                self._ids.popitem(last=False)
+
+    async def resolve(self, engine: AsyncEngine, values: Iterable[Optional[str]]) -> Dict[str, int]:
+        """Ids for every distinct non-null value, creating dimension rows as needed."""
+        ids: Dict[str, int] = {}
+        missing = []
+        for value in set(v for v in values if v is not None):
+            dim_id = self.get(value)
+            if dim_id is None:
+                missing.append(value)
+            else:
+                ids[value] = dim_id
+        with self._lock:
+            self._hits += len(ids)
+            self._misses += len(missing)
+        if not missing:
+            return ids
+
+        hashes = {content_hash(value): value for value in missing}
+        async with engine.begin() as conn:
+            await conn.execute(
+                insert(self.table)
+                .values([{"hash": digest, "value": value} for digest, value in hashes.items()])
+                .on_conflict_do_nothing(index_elements=["hash"])
+            )
+            rows = (await conn.execute(
+                select(self.table.c.id, self.table.c.hash).where(self.table.c.hash.in_(list(hashes)))
+            )).all()
+        for dim_id, digest in rows:
+            value = hashes[digest]
+            self.put(value, dim_id)
+            ids[value] = dim_id
+        return ids
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "cached": len(self._ids),
+                "capacity": self.capacity,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 1.0,
+            }
@@ -0,0 +1,380 @@
+import asyncio
+import json
+import logging
+import os
+import uuid
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.config import settings
+from app.db import engine
+from app.utils.activity_log_partitions import (
+    PARENT_TABLE,
+    ActivityLogPartitionManager,
+    Partition,
+    activity_log_partitions,
+    parse_partition,
+)
+
+logger = logging.getLogger(__name__)
+
+DATA_SUFFIX = ".ndjson.z"
+INDEX_SUFFIX = ".index.json"
+FORMAT_VERSION = 1
+# pg_try_advisory_lock key, so only one worker process archives at a time
+ARCHIVE_LOCK_KEY = 0x61726368
+
+# Archived rows carry the IP address and user agent as values, not dimension ids
+COLUMNS = (
+    "id", "date_created", "date_updated", "user_id", "activity_type",
+    "description", "ip_address", "user_agent", "timestamp",
+)
+SELECT_SQL = (
+    "SELECT l.id, l.date_created, l.date_updated, l.user_id, l.activity_type, l.description, "
+    "host(ip.value) AS ip_address, ua.value AS user_agent, l.timestamp FROM {table} AS l "
+    "LEFT JOIN ip_addresses AS ip ON ip.id = l.ip_address_id "
+    "LEFT JOIN user_agents AS ua ON ua.id = l.user_agent_id "
+    "ORDER BY l.timestamp, l.id"
+)
+# Partitions detached before activity_logs moved IPs and user agents into dimension tables
+LEGACY_SELECT_SQL = f"SELECT {', '.join(COLUMNS)} FROM {{table}} ORDER BY timestamp, id"
+
+
+@dataclass(frozen=True)
+class Block:
+    """One compressed run of rows: its place in the data file and what it can contain."""
+    offset: int
+    length: int
+    rows: int
+    min_timestamp: datetime
+    max_timestamp: datetime
+    # Over the rows with a user; None when every row is anonymous (user_id NULL)
+    min_user_id: Optional[str]
+    max_user_id: Optional[str]
+    has_anonymous: bool = False
+
+    def to_json(self) -> list:
+        return [self.offset, self.length, self.rows, self.min_timestamp.isoformat(), self.max_timestamp.isoformat(),
+                self.min_user_id, self.max_user_id, self.has_anonymous]
+
+    @classmethod
+    def from_json(cls, data: list) -> "Block":
+        # Indexes written before anonymous rows existed have no has_anonymous entry
+        offset, length, rows, min_ts, max_ts, min_user, max_user, *rest = data
+        return cls(offset, length, rows, datetime.fromisoformat(min_ts), datetime.fromisoformat(max_ts),
+                   min_user, max_user, bool(rest and rest[0]))
+
+    def may_contain(self, user_id: Optional[str], since: Optional[datetime], until: Optional[datetime]) -> bool:
+        if since and self.max_timestamp < since:
+            return False
+        if until and self.min_timestamp >= until:
+            return False
+        if not user_id:
+            return True
+        return self.min_user_id is not None and self.min_user_id <= user_id <= self.max_user_id
+
+
+@dataclass(frozen=True)
+class ArchiveFile:
+    """Parsed index of one archived partition; the whole file's summary is a Block as well."""
+    name: str
+    data_path: str
+    rows: int
+    summary: Block
+    blocks: Tuple[Block, ...]
+
+
+def _value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _encode_block(rows: List[dict]) -> bytes:
+    return zlib.compress("".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows).encode())
+
+
+class ActivityLogArchive:
+    """
+    Cold storage for activity_logs partitions past `after_days`.
+
+    The job detaches expired partitions, streams each one (ordered by timestamp, id) into
+    an append-only file of zlib-compressed NDJSON blocks of `block_rows` rows, then drops
+    the table. Next to every data file an index records, per block, its byte offset and
+    length plus the min/max timestamp and user_id it holds; that sparse index and the
+    per-file summary let `search` skip whole files and read only the blocks that can match.
+    A partition is only dropped once its data and index files are complete and fsynced and
+    the archived row count matches the table; the index is renamed into place last, so an
+    interrupted run leaves the detached table and no index, and is simply redone.
+
+    ARCHIVE_DIR must be shared between the app's hosts for searches to see every archive.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        partitions: ActivityLogPartitionManager,
+        directory: str,
+        after_days: int,
+        block_rows: int,
+    ):
+        self.engine = engine
+        self.partitions = partitions
+        self.directory = directory
+        self.after_days = after_days
+        self.block_rows = block_rows
+        self._indexes: Dict[str, Tuple[float, ArchiveFile]] = {}
+
+        # --- Counters ---
+        self._runs = 0
+        self._archived = 0
+        self._rows_archived = 0
+        self._bytes_written = 0
+        self._searches = 0
+        self._files_scanned = 0
+        self._blocks_read = 0
+        self._blocks_skipped = 0
+        self._last_run: Optional[datetime] = None
+        self._last_error: Optional[str] = None
+
+    def _paths(self, name: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, name)
+        return base + DATA_SUFFIX, base + INDEX_SUFFIX
+
+    # ---------------- ARCHIVING ---------------- #
+    async def run(self, now: Optional[datetime] = None) -> List[str]:
+        """Scheduler job: detach partitions past the cutoff, archive and drop every detached one."""
+        if self.after_days <= 0:
+            return []
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=self.after_days)
+        archived = []
+        try:
+            async with self.engine.connect() as lock_conn:
+                locked = (await lock_conn.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": ARCHIVE_LOCK_KEY}
+                )).scalar_one()
+                await lock_conn.commit()
+                if not locked:
+                    return []
+                try:
+                    async with self.engine.begin() as conn:
+                        for partition in await self.partitions.list_partitions(conn):
+                            if partition.end <= cutoff:
+                                await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {partition.name}"))
+                    for partition in await self._detached():
+                        await self.archive_table(partition)
+                        archived.append(partition.name)
+                finally:
+                    await lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ARCHIVE_LOCK_KEY})
+                    await lock_conn.commit()
+            self._last_error = None
+        except Exception as e:
+            self._last_error = str(e)
+            raise
+        finally:
+            self._runs += 1
+            self._last_run = datetime.now(timezone.utc)
+        return archived
+
+    async def _detached(self) -> List[Partition]:
+        """activity_logs_p* tables that are not (or no longer) partitions of activity_logs."""
+        async with self.engine.connect() as conn:
+            names = (await conn.execute(text(
+                "SELECT relname FROM pg_class WHERE relkind = 'r' AND NOT relispartition "
+                "AND relname LIKE :prefix"
+            ), {"prefix": f"{PARENT_TABLE}\\_p%"})).scalars().all()
+        partitions = [parse_partition(name) for name in names]
+        return sorted((p for p in partitions if p), key=lambda p: p.start)
+
+    async def archive_table(self, partition: Partition) -> int:
+        """Write one detached partition to the archive, then drop it. Returns the rows archived."""
+        data_path, index_path = self._paths(partition.name)
+        if os.path.exists(index_path):
+            # Archived by an earlier run that stopped before the drop
+            async with self.engine.begin() as conn:
+                await conn.execute(text(f"DROP TABLE {partition.name}"))
+            return 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        blocks: List[Block] = []
+        async with self.engine.connect() as conn:
+            has_dimension_ids = (await conn.execute(text(
+                "SELECT EXISTS (SELECT 1 FROM information_schema.columns "
+                "WHERE table_name = :table AND column_name = 'ip_address_id')"
+            ), {"table": partition.name})).scalar_one()
+            sql = (SELECT_SQL if has_dimension_ids else LEGACY_SELECT_SQL).format(table=partition.name)
+            expected = (await conn.execute(text(f"SELECT count(*) FROM {partition.name}"))).scalar_one()
+
+            with open(data_path + ".part", "wb") as out:
+                result = await conn.stream(text(sql).execution_options(yield_per=self.block_rows))
+                async for chunk in result.partitions(self.block_rows):
+                    rows = [{key: _value(value) for key, value in row._mapping.items()} for row in chunk]
+                    # Compression and disk IO run off the event loop
+                    data = await asyncio.to_thread(_encode_block, rows)
+                    user_ids = [row["user_id"] for row in rows if row["user_id"] is not None]
+                    blocks.append(Block(
+                        offset=out.tell(), length=len(data), rows=len(rows),
+                        min_timestamp=chunk[0].timestamp, max_timestamp=chunk[-1].timestamp,
+                        min_user_id=min(user_ids, default=None), max_user_id=max(user_ids, default=None),
+                        has_anonymous=len(user_ids) < len(rows),
+                    ))
+                    await asyncio.to_thread(out.write, data)
+                out.flush()
+                os.fsync(out.fileno())
+
+        rows = sum(block.rows for block in blocks)
+        if rows != expected:
+            os.remove(data_path + ".part")
+            raise RuntimeError(f"Archived {rows} of {expected} rows from {partition.name}, keeping the table")
+
+        index = {
+            "version": FORMAT_VERSION,
+            "table": partition.name,
+            "start": partition.start.isoformat(),
+            "end": partition.end.isoformat(),
+            "columns": COLUMNS,
+            "rows": rows,
+            "summary": self._summary(blocks).to_json() if blocks else None,
+            "blocks": [block.to_json() for block in blocks],
+        }
+        with open(index_path + ".part", "w") as f:
+            json.dump(index, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(data_path + ".part", data_path)
+        os.replace(index_path + ".part", index_path)
+
+        async with self.engine.begin() as conn:
+            await conn.execute(text(f"DROP TABLE {partition.name}"))
+
+        size = os.path.getsize(data_path)
+        self._archived += 1
+        self._rows_archived += rows
+        self._bytes_written += size
+        logger.info("Archived activity log partition %s: %d rows, %d bytes", partition.name, rows, size)
+        return rows
+
+    @staticmethod
+    def _summary(blocks: List[Block]) -> Block:
+        return Block(
+            offset=0, length=sum(block.length for block in blocks), rows=sum(block.rows for block in blocks),
+            min_timestamp=blocks[0].min_timestamp, max_timestamp=blocks[-1].max_timestamp,
+            min_user_id=min((block.min_user_id for block in blocks if block.min_user_id is not None), default=None),
+            max_user_id=max((block.max_user_id for block in blocks if block.max_user_id is not None), default=None),
+            has_anonymous=any(block.has_anonymous for block in blocks),
+        )
+
+    # ---------------- SEARCH ---------------- #
+    def _load_index(self, index_path: str) -> Optional[ArchiveFile]:
+        mtime = os.path.getmtime(index_path)
+        cached = self._indexes.get(index_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(index_path) as f:
+            data = json.load(f)
+        if not data["summary"]:
+            return None
+        archive = ArchiveFile(
+            name=data["table"],
+            data_path=index_path[:-len(INDEX_SUFFIX)] + DATA_SUFFIX,
+            rows=data["rows"],
+            summary=Block.from_json(data["summary"]),
+            blocks=tuple(Block.from_json(block) for block in data["blocks"]),
+        )
+        self._indexes[index_path] = (mtime, archive)
+        return archive
+
+    def files(self) -> List[ArchiveFile]:
+        """Every complete (indexed) archive, newest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(INDEX_SUFFIX)]
+        archives = [archive for archive in map(self._load_index, paths) if archive]
+        return sorted(archives, key=lambda archive: archive.summary.min_timestamp, reverse=True)
+
+    def search(
+        self,
+        user_id: Optional[uuid.UUID] = None,
+        activity_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+        before: Optional[Tuple[datetime, uuid.UUID]] = None,
+    ) -> List[dict]:
+        """
+        Archived rows matching the filters, newest first, at most `limit`; `before` is the
+        (timestamp, id) keyset position to continue from. Blocking file IO: run it in a thread.
+        """
+        user = str(user_id) if user_id else None
+        if before and (until is None or before[0] < until):
+            until = before[0] + timedelta(microseconds=1)  # the cursor row's timestamp is still in range
+        matches: List[dict] = []
+        files_scanned = blocks_read = blocks_skipped = 0
+
+        for archive in self.files():
+            if not archive.summary.may_contain(user, since, until):
+                continue
+            files_scanned += 1
+            with open(archive.data_path, "rb") as f:
+                for block in reversed(archive.blocks):
+                    if not block.may_contain(user, since, until):
+                        blocks_skipped += 1
+                        continue
+                    blocks_read += 1
+                    f.seek(block.offset)
+                    lines = zlib.decompress(f.read(block.length)).decode().splitlines()
+                    for line in reversed(lines):
+                        row = json.loads(line)
+                        if user and row["user_id"] != user:
+                            continue
+                        if activity_type and row["activity_type"] != activity_type:
+                            continue
+                        timestamp = datetime.fromisoformat(row["timestamp"])
+                        if (since and timestamp < since) or (until and timestamp >= until):
+                            continue
+                        if before and (timestamp, uuid.UUID(row["id"])) >= before:
+                            continue
+                        matches.append(row)
+                        if len(matches) >= limit:
+                            break
+                    if len(matches) >= limit:
+                        break
+            if len(matches) >= limit:
+                break
+
+        self._searches += 1
+        self._files_scanned += files_scanned
+        self._blocks_read += blocks_read
+        self._blocks_skipped += blocks_skipped
+        return matches
+
+    # ---------------- METRICS ---------------- #
+    def stats(self) -> Dict[str, object]:
+        return {
+            "directory": self.directory,
+            "after_days": self.after_days,
+            "runs": self._runs,
+            "partitions_archived": self._archived,
+            "rows_archived": self._rows_archived,
+            "bytes_written": self._bytes_written,
+            "searches": self._searches,
+            "files_scanned": self._files_scanned,
+            "blocks_read": self._blocks_read,
+            "blocks_skipped": self._blocks_skipped,
+            "last_run": self._last_run.isoformat() if self._last_run else None,
+            "last_error": self._last_error,
+        }
+
+
+activity_log_archive = ActivityLogArchive(
+    engine=engine,
+    partitions=activity_log_partitions,
+    directory=settings.ACTIVITY_LOG_ARCHIVE_DIR,
+    after_days=settings.ACTIVITY_LOG_ARCHIVE_AFTER_DAYS,
+    block_rows=settings.ACTIVITY_LOG_ARCHIVE_BLOCK_ROWS,
+)
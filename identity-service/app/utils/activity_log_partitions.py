@@ -0,0 +1,220 @@
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.config import settings
+from app.db import engine
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "activity_logs"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+INTERVALS = ("day", "month")
+RETENTION_MODES = ("detach", "drop")
+_MOVED_TABLE = "activity_logs_moved"
+
+_NAME_RE = re.compile(rf"^{PARENT_TABLE}_p(\d{{8}}|\d{{6}})$")
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    start: datetime
+    end: datetime
+
+
+# ---------------- NAMING & BOUNDS ---------------- #
+def partition_start(interval: str, moment: datetime) -> datetime:
+    """Lower bound (UTC) of the partition that holds `moment`."""
+    moment = moment.astimezone(timezone.utc)
+    if interval == "day":
+        return datetime(moment.year, moment.month, moment.day, tzinfo=timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def partition_end(interval: str, start: datetime) -> datetime:
+    if interval == "day":
+        return start + timedelta(days=1)
+    return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def partition_for(interval: str, moment: datetime) -> Partition:
+    start = partition_start(interval, moment)
+    fmt = "%Y%m%d" if interval == "day" else "%Y%m"
+    return Partition(name=f"{PARENT_TABLE}_p{start.strftime(fmt)}", start=start, end=partition_end(interval, start))
+
+
+def parse_partition(name: str) -> Optional[Partition]:
+    """Bounds of a partition created by this module, from its name (None for anything else)."""
+    match = _NAME_RE.match(name)
+    if not match:
+        return None
+    stamp = match.group(1)
+    if len(stamp) == 8:
+        return partition_for("day", datetime.strptime(stamp, "%Y%m%d").replace(tzinfo=timezone.utc))
+    return partition_for("month", datetime.strptime(stamp, "%Y%m").replace(tzinfo=timezone.utc))
+
+
+def partitions_between(interval: str, first: datetime, last: datetime) -> List[Partition]:
+    """Every partition from the one holding `first` up to and including the one holding `last`."""
+    partitions = []
+    current = partition_for(interval, first)
+    while current.start <= last:
+        partitions.append(current)
+        current = partition_for(interval, current.end)
+    return partitions
+
+
+def create_partition_sql(partition: Partition) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition.name} PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{partition.start.isoformat()}') TO ('{partition.end.isoformat()}')"
+    )
+
+
+# ---------------- MAINTENANCE ---------------- #
+class ActivityLogPartitionManager:
+    """
+    Keeps the range-partitioned activity_logs table ready for writes and within retention.
+
+    Each run creates the partitions for the current period and `ahead` periods after it,
+    so the writer never falls through to the default partition. Rows that did land there
+    (the job was down when their period began) would make CREATE TABLE ... PARTITION OF
+    fail for good, so they are moved out first and re-inserted once the partition
+    exists, in the same transaction. Partitions that end
+    before the retention cutoff are detached (left as standalone tables, e.g. for
+    archiving) or dropped, instead of deleting rows from one large table.
+    """
+
+    def __init__(self, engine: AsyncEngine, interval: str, ahead: int, retention_days: int, retention_mode: str):
+        if interval not in INTERVALS:
+            raise ValueError(f"Partition interval must be one of {INTERVALS}, got {interval!r}")
+        if retention_mode not in RETENTION_MODES:
+            raise ValueError(f"Retention mode must be one of {RETENTION_MODES}, got {retention_mode!r}")
+        self.engine = engine
+        self.interval = interval
+        self.ahead = ahead
+        self.retention_days = retention_days
+        self.retention_mode = retention_mode
+
+        # --- Counters ---
+        self._runs = 0
+        self._created = 0
+        self._retired = 0
+        self._rows_moved = 0
+        self._last_run: Optional[datetime] = None
+        self._last_error: Optional[str] = None
+
+    async def list_partitions(self, conn) -> List[Partition]:
+        result = await conn.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "WHERE parent.relname = :parent"
+        ), {"parent": PARENT_TABLE})
+        partitions = [parse_partition(name) for name in result.scalars()]
+        return sorted((p for p in partitions if p), key=lambda p: p.start)
+
+    async def ensure_partitions(self, now: Optional[datetime] = None) -> List[str]:
+        now = now or datetime.now(timezone.utc)
+        current = partition_for(self.interval, now)
+        wanted = [current]
+        for _ in range(self.ahead):
+            wanted.append(partition_for(self.interval, wanted[-1].end))
+
+        created = []
+        async with self.engine.begin() as conn:
+            existing = await self.list_partitions(conn)
+            for partition in wanted:
+                # Ranges already covered (e.g. by monthly partitions after switching to daily) are skipped
+                if any(p.start < partition.end and partition.start < p.end for p in existing):
+                    continue
+                moved = await self._take_from_default(conn, partition)
+                await conn.execute(text(create_partition_sql(partition)))
+                if moved:
+                    await conn.execute(text(f"INSERT INTO {PARENT_TABLE} SELECT * FROM {_MOVED_TABLE}"))
+                    await conn.execute(text(f"DROP TABLE {_MOVED_TABLE}"))
+                    logger.warning("Moved %d activity log rows from %s into %s", moved, DEFAULT_PARTITION, partition.name)
+                    self._rows_moved += moved
+                existing.append(partition)
+                created.append(partition.name)
+
+        self._created += len(created)
+        for name in created:
+            logger.info("Created activity log partition %s", name)
+        return created
+
+    @staticmethod
+    async def _take_from_default(conn, partition: Partition) -> int:
+        """Delete the default partition's rows in `partition`'s range into a temp table; returns how many."""
+        result = await conn.execute(text(
+            f"SELECT count(*) FROM {DEFAULT_PARTITION} WHERE timestamp >= :start AND timestamp < :end"
+        ), {"start": partition.start, "end": partition.end})
+        count = result.scalar_one()
+        if count:
+            await conn.execute(text(f"CREATE TEMP TABLE {_MOVED_TABLE} (LIKE {PARENT_TABLE}) ON COMMIT DROP"))
+            await conn.execute(text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE timestamp >= :start AND timestamp < :end "
+                f"RETURNING *) INSERT INTO {_MOVED_TABLE} SELECT * FROM moved"
+            ), {"start": partition.start, "end": partition.end})
+        return count
+
+    async def apply_retention(self, now: Optional[datetime] = None) -> List[str]:
+        if self.retention_days <= 0:
+            return []
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=self.retention_days)
+
+        retired = []
+        async with self.engine.begin() as conn:
+            for partition in await self.list_partitions(conn):
+                if partition.end > cutoff:
+                    continue
+                if self.retention_mode == "drop":
+                    await conn.execute(text(f"DROP TABLE {partition.name}"))
+                else:
+                    await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {partition.name}"))
+                retired.append(partition.name)
+
+        self._retired += len(retired)
+        for name in retired:
+            logger.info("Retention: %s activity log partition %s", self.retention_mode, name)
+        return retired
+
+    async def maintain(self) -> None:
+        """Scheduler job: create upcoming partitions, then retire expired ones."""
+        try:
+            await self.ensure_partitions()
+            await self.apply_retention()
+            self._last_error = None
+        except Exception as e:
+            self._last_error = str(e)
+            raise
+        finally:
+            self._runs += 1
+            self._last_run = datetime.now(timezone.utc)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "interval": self.interval,
+            "ahead": self.ahead,
+            "retention_days": self.retention_days,
+            "retention_mode": self.retention_mode,
+            "runs": self._runs,
+            "partitions_created": self._created,
+            "partitions_retired": self._retired,
+            "rows_moved_from_default": self._rows_moved,
+            "last_run": self._last_run.isoformat() if self._last_run else None,
+            "last_error": self._last_error,
+        }
+
+
+activity_log_partitions = ActivityLogPartitionManager(
+    engine=engine,
+    interval=settings.ACTIVITY_LOG_PARTITION_INTERVAL,
+    ahead=settings.ACTIVITY_LOG_PARTITIONS_AHEAD,
+    retention_days=settings.ACTIVITY_LOG_RETENTION_DAYS,
+    retention_mode=settings.ACTIVITY_LOG_RETENTION_MODE,
+)
@@ -0,0 +1,199 @@
+import fnmatch
+import random
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.config import settings
+from app.db import engine
+from app.models.activity_log_aggregate_model import ActivityLogAggregate
+from app.models.user_model import User
+
+PERSIST = "persist"
+SAMPLE = "sample"
+AGGREGATE = "aggregate"
+
+# Security-relevant events are always written in full, whatever the configured policy says
+ALWAYS_PERSIST = ("login_failed", "login_blocked", "*_denied", "*_error")
+
+
+class ActivityLogPolicy:
+    """
+    Decides, per activity_type, whether an event becomes a full activity_logs row.
+
+    Rules come from a comma-separated "pattern=policy" spec (fnmatch patterns, first match
+    wins), where policy is `persist`, `aggregate` or `sample:<percent>`, e.g.
+    "get_user_success=aggregate,*_success=sample:10". Unmatched types use `default`.
+    Decisions are cached per activity_type.
+    """
+
+    def __init__(self, spec: str, default: str = PERSIST):
+        self.rules: List[Tuple[str, str, float]] = [
+            (pattern.strip(), *self._parse(policy.strip()))
+            for pattern, policy in (item.split("=", 1) for item in spec.split(",") if item.strip())
+        ]
+        self.default = self._parse(default)
+        self._decisions: Dict[str, Tuple[str, float]] = {}
+
+    @staticmethod
+    def _parse(policy: str) -> Tuple[str, float]:
+        if policy in (PERSIST, AGGREGATE):
+            return policy, 1.0
+        if policy.startswith(SAMPLE + ":"):
+            rate = float(policy.split(":", 1)[1]) / 100
+            if not 0 <= rate <= 1:
+                raise ValueError(f"Sample rate must be between 0 and 100 percent, got {policy!r}")
+            return SAMPLE, rate
+        raise ValueError(f"Unknown activity log policy {policy!r}")
+
+    def decide(self, activity_type: Optional[str]) -> Tuple[str, float]:
+        activity_type = activity_type or ""
+        decision = self._decisions.get(activity_type)
+        if decision is None:
+            decision = self._resolve(activity_type)
+            self._decisions[activity_type] = decision
+        return decision
+
+    def _resolve(self, activity_type: str) -> Tuple[str, float]:
+        if any(fnmatch.fnmatchcase(activity_type, pattern) for pattern in ALWAYS_PERSIST):
+            return PERSIST, 1.0
+        for pattern, action, rate in self.rules:
+            if fnmatch.fnmatchcase(activity_type, pattern):
+                return action, rate
+        return self.default
+
+    def should_persist(self, activity_type: Optional[str]) -> bool:
+        """True if the event must be written as a full row; False means count it instead."""
+        action, rate = self.decide(activity_type)
+        if action == PERSIST:
+            return True
+        if action == SAMPLE:
+            return random.random() < rate
+        return False
+
+
+class ActivityLogAggregator:
+    """
+    In-memory counters for events that are not persisted as rows.
+
+    Counts are keyed by (activity_type, user_id, bucket start) and flushed periodically
+    as rollup rows into activity_log_aggregates, adding to any existing count for the
+    same key. Sampled-out events are counted too, so row count + aggregate count is the
+    exact number of events.
+    """
+
+    def __init__(self, engine: AsyncEngine, bucket_seconds: int):
+        self.engine = engine
+        self.bucket_seconds = bucket_seconds
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+        # --- Counters ---
+        self._persisted = 0
+        self._aggregated = 0
+        self._flushes = 0
+        self._rows_flushed = 0
+        self._failed_flushes = 0
+
+    def _bucket(self, moment: datetime) -> datetime:
+        epoch = int(moment.timestamp())
+        return datetime.fromtimestamp(epoch - epoch % self.bucket_seconds, tz=timezone.utc)
+
+    def record_persisted(self) -> None:
+        with self._lock:
+            self._persisted += 1
+
+    def add(self, activity_type: str, user_id: Optional[UUID], moment: Optional[datetime] = None) -> None:
+        key = (activity_type, user_id, self._bucket(moment or datetime.now(timezone.utc)))
+        with self._lock:
+            self._counts[key] += 1
+            self._aggregated += 1
+
+    async def flush(self) -> int:
+        """Write and reset the pending counters (scheduler job, also run at shutdown)."""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        if not counts:
+            return 0
+
+        try:
+            written = await self._write_counts(counts)
+        except Exception:
+            # Put the counts back so the next flush retries them
+            with self._lock:
+                self._counts.update(counts)
+                self._failed_flushes += 1
+            raise
+
+        with self._lock:
+            self._flushes += 1
+            self._rows_flushed += written
+        return written
+
+    async def _write_counts(self, counts: Counter) -> int:
+        table = ActivityLogAggregate.__table__
+        now = datetime.now(timezone.utc)
+        async with self.engine.begin() as conn:
+            # Users deleted since their events were counted take the counts with them (as
+            # ON DELETE CASCADE does for stored ones); KEY SHARE holds the rest until commit
+            user_ids = {user_id for (_, user_id, _) in counts if user_id is not None}
+            existing = set()
+            if user_ids:
+                result = await conn.execute(
+                    select(User.id).where(User.id.in_(user_ids)).with_for_update(key_share=True)
+                )
+                existing = set(result.scalars().all())
+            rows = [
+                {
+                    "id": uuid4(),
+                    "activity_type": activity_type,
+                    "user_id": user_id,
+                    "bucket_start": bucket_start,
+                    "bucket_seconds": self.bucket_seconds,
+                    "count": count,
+                    "date_created": now,
+                    "date_updated": now,
+                }
+                for (activity_type, user_id, bucket_start), count in counts.items()
+                if user_id is None or user_id in existing
+            ]
+            if not rows:
+                return 0
+            stmt = insert(table).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_activity_log_aggregates_key",
+                set_={
+                    "count": table.c.count + stmt.excluded.count,
+                    "date_updated": stmt.excluded.date_updated,
+                },
+            )
+            await conn.execute(stmt)
+        return len(rows)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            total = self._persisted + self._aggregated
+            return {
+                "persisted": self._persisted,
+                "aggregated": self._aggregated,
+                "persisted_ratio": self._persisted / total if total else 1.0,
+                "pending_keys": len(self._counts),
+                "flushes": self._flushes,
+                "rows_flushed": self._rows_flushed,
+                "failed_flushes": self._failed_flushes,
+            }
+
+
+activity_log_policy = ActivityLogPolicy(
+    spec=settings.ACTIVITY_LOG_POLICY,
+    default=settings.ACTIVITY_LOG_DEFAULT_POLICY,
+)
+
+activity_log_aggregator = ActivityLogAggregator(
+    engine=engine,
+    bucket_seconds=settings.ACTIVITY_LOG_AGGREGATE_BUCKET_SECONDS,
+)
@@ -0,0 +1,325 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.config import settings
+from app.models.activity_dimension_model import IPAddress, UserAgent
+from app.models.activity_log_model import ActivityLog
+from app.utils.activity_dimensions import DimensionCache
+from app.utils.network import normalize_ip
+from app.utils.spill_log import SpillLog
+
+logger = logging.getLogger(__name__)
+
+_UUID_FIELDS = ("id", "user_id")
+_DATETIME_FIELDS = ("timestamp", "date_created", "date_updated")
+_MAX_RETRY_DELAY_SECONDS = 30.0
+
+
+def _encode_row(row: Dict[str, Any]) -> bytes:
+    return json.dumps(row, default=str, separators=(",", ":")).encode()
+
+
+def _decode_row(payload: bytes) -> Dict[str, Any]:
+    row = json.loads(payload)
+    for key in _UUID_FIELDS:
+        if row.get(key) is not None:
+            row[key] = UUID(row[key])
+    for key in _DATETIME_FIELDS:
+        if row.get(key) is not None:
+            row[key] = datetime.fromisoformat(row[key])
+    return row
+
+
+class ActivityLogWriter:
+    """
+    Disk-backed activity-log pipeline.
+
+    `submit` appends the row to a local SpillLog and returns immediately, so request
+    latency does not depend on the database being fast or even up. A background thread
+    replays the log into activity_logs: every `flush_interval` seconds (or straight away
+    while full batches are waiting) it reads up to `batch_size` records past the
+    checkpoint, writes them with one multi-row INSERT ... ON CONFLICT DO NOTHING and only
+    then advances the checkpoint. Delivery is at-least-once; a batch replayed twice after
+    a crash is deduplicated by the (id, timestamp) primary key. While the database is
+    unreachable the checkpoint stays put and the replay is retried with backoff.
+
+    Spilled rows carry the raw `ip_address` and `user_agent` strings; they are swapped
+    for ids in the ip_addresses / user_agents dimension tables at replay time, through
+    LRU caches that make the lookup a dict hit for all but never-seen values.
+
+    Logs left behind by dead worker processes (same spill root, lock free) are adopted
+    and replayed at start.
+
+    A row the database rejects on its own (constraint or data error) is not dropped: if
+    its user was deleted in the meantime it is stored without one, otherwise it is
+    appended to `rejected.jsonl` in the spill root for an operator to look at.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        spill_root: str,
+        segment_bytes: int,
+        fsync_interval: float,
+        max_bytes: int,
+        batch_size: int,
+        flush_interval: float,
+        dimension_cache_size: int,
+    ):
+        self.database_url = database_url
+        self.spill_root = spill_root
+        self.segment_bytes = segment_bytes
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.rejected_path = os.path.join(spill_root, "rejected.jsonl")
+
+        self.spill: Optional[SpillLog] = None
+        self._orphans: List[SpillLog] = []
+        self.user_agents = DimensionCache(UserAgent.__table__, dimension_cache_size)
+        self.ip_addresses = DimensionCache(IPAddress.__table__, dimension_cache_size)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+        # --- Counters ---
+        self._enqueued = 0
+        self._dropped = 0
+        self._written = 0
+        self._duplicates = 0
+        self._failed = 0
+        self._anonymized = 0
+        self._batches = 0
+        self._retries = 0
+        self._last_batch_size = 0
+        self._max_batch_size = 0
+        self._last_flush_seconds = 0.0
+        self._max_flush_seconds = 0.0
+        self._total_flush_seconds = 0.0
+        self._lag_seconds = 0.0
+        self._last_error: Optional[str] = None
+
+    # ---------------- LIFECYCLE ---------------- #
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        spill_options = {
+            "segment_bytes": self.segment_bytes,
+            "fsync_interval": self.fsync_interval,
+            "max_bytes": self.max_bytes,
+        }
+        # Own log first: after a container restart (same hostname, PID 1) the previous
+        # process's directory is ours again and is reopened writable, not adopted
+        self.spill = SpillLog(
+            os.path.join(self.spill_root, f"{socket.gethostname()}-{os.getpid()}"), **spill_options
+        )
+        self.spill.start()
+        self._orphans = SpillLog.adopt_orphans(self.spill_root, exclude=self.spill.directory, **spill_options)
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Replay what is already logged (while the database accepts it), then stop."""
+        if not self._thread:
+            return
+        self._stopping.set()
+        self._thread.join(timeout)
+        self._thread = None
+        # Anything not replayed stays on disk and is adopted by the next process
+        for log in [*self._orphans, self.spill]:
+            log.close()
+        self._orphans = []
+
+    # ---------------- PRODUCER SIDE ---------------- #
+    def submit(self, row: Dict[str, Any]) -> bool:
+        """Append one activity_logs row to the spill log. Returns False if it had to be dropped."""
+        if self.spill is None or not self.spill.append(_encode_row(row)):
+            with self._lock:
+                self._dropped += 1
+            logger.warning("Activity log spill unavailable or over budget, dropping %s event", row.get("activity_type"))
+            return False
+
+        with self._lock:
+            self._enqueued += 1
+        return True
+
+    # ---------------- REPLAY SIDE ---------------- #
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        engine = create_async_engine(self.database_url, pool_size=1, max_overflow=0)
+        delay = self.flush_interval
+        try:
+            while True:
+                stopping = self._stopping.is_set()
+                try:
+                    full = loop.run_until_complete(self._replay_round(engine))
+                    delay = self.flush_interval
+                    self._last_error = None
+                except Exception as e:
+                    # Database unavailable: keep the checkpoint, retry with backoff
+                    with self._lock:
+                        self._retries += 1
+                    self._last_error = str(e)
+                    logger.warning("Activity log replay failed, retrying in %.1fs: %s", delay, e)
+                    if stopping:
+                        break
+                    self._stopping.wait(delay)
+                    delay = min(delay * 2, _MAX_RETRY_DELAY_SECONDS)
+                    continue
+                if stopping and not full:
+                    break
+                if not full:
+                    self._stopping.wait(self.flush_interval)
+        finally:
+            loop.run_until_complete(engine.dispose())
+            loop.close()
+
+    async def _replay_round(self, engine) -> bool:
+        """Replay one batch from each log. Returns True if a full batch was waiting somewhere."""
+        self.spill.flush()
+        full = False
+        for log in list(self._orphans):
+            records = await self._replay(engine, log)
+            if records == 0:
+                self._orphans.remove(log)
+                log.remove()
+            full = full or records >= self.batch_size
+        records = await self._replay(engine, self.spill)
+        return full or records >= self.batch_size
+
+    async def _replay(self, engine, log: SpillLog) -> int:
+        records, position = log.read_batch(self.batch_size)
+        if not records:
+            if log is self.spill:
+                self._lag_seconds = 0.0
+            return 0
+
+        rows = [_decode_row(record) for record in records]
+        started = time.perf_counter()
+        await self._intern(engine, rows)
+        inserted, failed = await self._write_rows(engine, rows)
+        elapsed = time.perf_counter() - started
+        log.commit(position)
+
+        if log is self.spill:
+            last = rows[-1].get("timestamp")
+            self._lag_seconds = (datetime.now(timezone.utc) - last).total_seconds() if last else 0.0
+        with self._lock:
+            self._batches += 1
+            self._written += inserted
+            self._duplicates += len(rows) - inserted - failed
+            self._failed += failed
+            self._last_batch_size = len(rows)
+            self._max_batch_size = max(self._max_batch_size, len(rows))
+            self._last_flush_seconds = elapsed
+            self._max_flush_seconds = max(self._max_flush_seconds, elapsed)
+            self._total_flush_seconds += elapsed
+        return len(records)
+
+    async def _intern(self, engine, rows: List[Dict[str, Any]]) -> None:
+        """Replace the ip_address / user_agent strings of each row by dimension ids."""
+        agents = await self.user_agents.resolve(engine, [row.get("user_agent") for row in rows])
+        for row in rows:
+            # ip_addresses.value is INET; anything else (e.g. "testclient") is not stored
+            row["ip_address"] = normalize_ip(row.get("ip_address"))
+        ips = await self.ip_addresses.resolve(engine, [row["ip_address"] for row in rows])
+        for row in rows:
+            row["user_agent_id"] = agents.get(row.pop("user_agent", None))
+            row["ip_address_id"] = ips.get(row.pop("ip_address", None))
+
+    async def _write_rows(self, engine, rows: List[Dict[str, Any]]) -> tuple:
+        """Insert rows, skipping ids already stored. Returns (inserted, failed); raises if the DB is down."""
+        try:
+            return await self._insert(engine, rows), 0
+        except (IntegrityError, DataError) as exc:
+            if len(rows) == 1:
+                return await self._write_rejected(engine, rows[0], exc)
+
+        # One bad row must not take the whole batch down with it
+        inserted = failed = 0
+        for row in rows:
+            row_inserted, row_failed = await self._write_rows(engine, [row])
+            inserted += row_inserted
+            failed += row_failed
+        return inserted, failed
+
+    @staticmethod
+    async def _insert(engine, rows: List[Dict[str, Any]]) -> int:
+        stmt = insert(ActivityLog.__table__).values(rows).on_conflict_do_nothing(index_elements=["id", "timestamp"])
+        async with engine.begin() as conn:
+            result = await conn.execute(stmt)
+        return result.rowcount
+
+    async def _write_rejected(self, engine, row: Dict[str, Any], error: Exception) -> tuple:
+        """A single row the database refused: keep it without its user, or set it aside on disk."""
+        if row.get("user_id") is not None:
+            # Most likely the user was deleted after the event; the event itself still counts
+            try:
+                inserted = await self._insert(engine, [{**row, "user_id": None}])
+            except (IntegrityError, DataError) as exc:
+                error = exc
+            else:
+                with self._lock:
+                    self._anonymized += 1
+                logger.warning("Stored activity log %s without its deleted user %s", row.get("id"), row["user_id"])
+                return inserted, 0
+
+        logger.error(
+            "Activity log %s (%s) rejected by the database, kept in %s: %s",
+            row.get("id"), row.get("activity_type"), self.rejected_path, error,
+        )
+        with open(self.rejected_path, "ab") as rejected:
+            rejected.write(_encode_row(row) + b"\n")
+        return 0, 1
+
+    # ---------------- METRICS ---------------- #
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                "enqueued": self._enqueued,
+                "dropped": self._dropped,
+                "written": self._written,
+                "duplicates": self._duplicates,
+                "failed": self._failed,
+                "anonymized": self._anonymized,
+                "rejected_path": self.rejected_path,
+                "batches": self._batches,
+                "retries": self._retries,
+                "last_error": self._last_error,
+                "lag_seconds": self._lag_seconds,
+                "orphaned_logs": len(self._orphans),
+                "last_batch_size": self._last_batch_size,
+                "max_batch_size": self._max_batch_size,
+                "avg_batch_size": (self._written + self._duplicates + self._failed) / self._batches if self._batches else 0.0,
+                "last_flush_seconds": self._last_flush_seconds,
+                "max_flush_seconds": self._max_flush_seconds,
+                "avg_flush_seconds": self._total_flush_seconds / self._batches if self._batches else 0.0,
+            }
+        stats["spill"] = self.spill.stats() if self.spill else None
+        stats["dimensions"] = {"user_agents": self.user_agents.stats(), "ip_addresses": self.ip_addresses.stats()}
+        return stats
+
+
+activity_log_writer = ActivityLogWriter(
+    database_url=settings.DATABASE_URL,
+    spill_root=settings.ACTIVITY_LOG_SPILL_DIR,
+    segment_bytes=settings.ACTIVITY_LOG_SPILL_SEGMENT_BYTES,
+    fsync_interval=settings.ACTIVITY_LOG_SPILL_FSYNC_INTERVAL_SECONDS,
+    max_bytes=settings.ACTIVITY_LOG_SPILL_MAX_BYTES,
+    batch_size=settings.ACTIVITY_LOG_BATCH_SIZE,
+    flush_interval=settings.ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS,
+    dimension_cache_size=settings.ACTIVITY_LOG_DIMENSION_CACHE_SIZE,
+)
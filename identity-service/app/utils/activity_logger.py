@@ -1,9 +1,25 @@
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
 from fastapi import Request
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
+from app.models.activity_dimension_model import IPAddress, UserAgent
 from app.models.activity_log_model import ActivityLog
 from app.models.user_model import User
 from app.services.restriction_service import RestrictionService
-from sqlalchemy.exc import SQLAlchemyError
+from app.utils.activity_log_policy import activity_log_aggregator, activity_log_policy
+from app.utils.activity_log_writer import activity_log_writer
+from app.utils.network import normalize_ip
+
+
+def _loaded_staff_profile(user):
+    """Staff profile of a Principal or ORM user, never lazy-loading it (not possible on an AsyncSession)."""
+    if user is None:
+        return None
+    if isinstance(user, User) and "staff_profile" in inspect(user).unloaded:
+        return None
+    return user.staff_profile
 
 
 def log_activity(
@@ -13,41 +29,54 @@ def log_activity(
     request: Request = None,
     current_user: User = None,
     **kwargs,
-) -> ActivityLog:
+) -> Optional[ActivityLog]:
     """
     Logs a user activity into the ActivityLog table.
     Restrictions (e.g., superuser logs) are enforced centrally via RestrictionService.
+    The row is appended to the ActivityLogWriter's spill log and persisted in a later batch,
+    so the returned ActivityLog is transient and not attached to `db`.
+    Activity types the logging policy aggregates (or samples out) are only counted,
+    and None is returned for them.
     """
 
-    # Enforce restrictions (only if both users provided)
-    if current_user and target_user:
-        RestrictionService.enforce(
-            current_user.staff_profile,
-            target_user.staff_profile,
-            action="view_logs",
-        )
+    # Enforce restrictions (only between two staff members)
+    actor_staff = _loaded_staff_profile(current_user)
+    target_staff = _loaded_staff_profile(target_user)
+    if actor_staff and target_staff:
+        RestrictionService.enforce(actor_staff, target_staff, action="view_logs")
+
+    # Most call sites pass the acting user positionally as `target_user`
+    subject = current_user or target_user
+
+    # Routine, high-volume events are counted instead of written row by row
+    if not activity_log_policy.should_persist(activity_type):
+        activity_log_aggregator.add(activity_type, subject.id if subject else None)
+        return None
+    activity_log_aggregator.record_persisted()
 
     # Extract request metadata (if available)
     ip_address = None
     user_agent = None
     if request:
-        ip_address = request.client.host if request.client else None
+        ip_address = normalize_ip(request.client.host) if request.client else None
         user_agent = request.headers.get("user-agent")
 
-    # Create log entry
+    # Create log entry (defaults are filled here, there is no flush to apply them)
+    now = datetime.now(timezone.utc)
     log = ActivityLog(
-        user_id=current_user.id if current_user else None,
+        id=uuid.uuid4(),
+        user_id=subject.id if subject else None,
         activity_type=activity_type,
-        ip_address=ip_address,
-        user_agent=user_agent,
+        ip=IPAddress(value=ip_address) if ip_address else None,
+        agent=UserAgent(value=user_agent) if user_agent else None,
+        timestamp=now,
+        date_created=now,
+        date_updated=now,
         **kwargs,
     )
 
-    try:
-        db.add(log)
-        db.commit()
-        db.refresh(log)
-        return log
-    except SQLAlchemyError as e:
-        db.rollback()
-        raise e
+    # The writer interns ip_address / user_agent into dimension ids when it replays the row
+    row = {column.key: getattr(log, column.key) for column in ActivityLog.__table__.columns}
+    row.update(ip_address=ip_address, user_agent=user_agent)
+    activity_log_writer.submit(row)
+    return log
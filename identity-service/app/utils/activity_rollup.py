@@ -0,0 +1,139 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.config import settings
+from app.db import engine
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME = "hourly"
+
+# Each statement recomputes whole hours in [start, end) and replaces the stored counts,
+# so re-running a window (the lookback for late rows) is idempotent. Events the logging
+# policy only counted come from activity_log_aggregates (no IP for those).
+ROLLUP_SQL = (
+    """
+    INSERT INTO activity_rollup_hourly (hour, activity_type, count)
+    SELECT hour, activity_type, sum(n) FROM (
+        SELECT date_trunc('hour', timestamp, 'UTC') AS hour, activity_type, count(*) AS n
+        FROM activity_logs WHERE timestamp >= :start AND timestamp < :end
+        GROUP BY 1, 2
+        UNION ALL
+        SELECT date_trunc('hour', bucket_start, 'UTC'), activity_type, sum(count)
+        FROM activity_log_aggregates WHERE bucket_start >= :start AND bucket_start < :end
+        GROUP BY 1, 2
+    ) AS s
+    GROUP BY hour, activity_type
+    ON CONFLICT (hour, activity_type) DO UPDATE SET count = EXCLUDED.count
+    """,
+    """
+    INSERT INTO activity_rollup_hourly_ip (hour, activity_type, ip_address, count)
+    SELECT date_trunc('hour', l.timestamp, 'UTC'), l.activity_type, host(ip.value), count(*)
+    FROM activity_logs AS l JOIN ip_addresses AS ip ON ip.id = l.ip_address_id
+    WHERE l.timestamp >= :start AND l.timestamp < :end
+    GROUP BY 1, 2, 3
+    ON CONFLICT (hour, activity_type, ip_address) DO UPDATE SET count = EXCLUDED.count
+    """,
+    """
+    INSERT INTO activity_rollup_hourly_user (hour, activity_type, user_id, count)
+    SELECT hour, activity_type, user_id, sum(n) FROM (
+        SELECT date_trunc('hour', timestamp, 'UTC') AS hour, activity_type, user_id, count(*) AS n
+        FROM activity_logs WHERE timestamp >= :start AND timestamp < :end
+        GROUP BY 1, 2, 3
+        UNION ALL
+        SELECT date_trunc('hour', bucket_start, 'UTC'), activity_type, user_id, sum(count)
+        FROM activity_log_aggregates
+        WHERE bucket_start >= :start AND bucket_start < :end AND user_id IS NOT NULL
+        GROUP BY 1, 2, 3
+    ) AS s
+    GROUP BY hour, activity_type, user_id
+    ON CONFLICT (hour, activity_type, user_id) DO UPDATE SET count = EXCLUDED.count
+    """,
+)
+
+
+def floor_hour(moment: datetime) -> datetime:
+    return moment.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+class ActivityRollup:
+    """
+    Incrementally maintains the hourly activity rollups from a watermark.
+
+    Every run rolls up the complete hours between the watermark and `lag` seconds ago
+    (at most `max_hours` per run, so a backfill is spread over several runs), re-doing the
+    last `lookback_hours` before the watermark to pick up rows that were written late
+    (log writer buffering, aggregate flushes). The watermark moves forward in the same
+    transaction as the rollup rows.
+    """
+
+    def __init__(self, engine: AsyncEngine, lag_seconds: int, lookback_hours: int, max_hours: int):
+        self.engine = engine
+        self.lag = timedelta(seconds=lag_seconds)
+        self.lookback = timedelta(hours=lookback_hours)
+        self.max_span = timedelta(hours=max_hours)
+
+        # --- Counters ---
+        self._runs = 0
+        self._hours_rolled = 0
+        self._watermark: Optional[datetime] = None
+        self._last_run_seconds = 0.0
+
+    async def _load_watermark(self, conn) -> Optional[datetime]:
+        watermark = (await conn.execute(
+            text("SELECT watermark FROM activity_rollup_state WHERE name = :name FOR UPDATE"),
+            {"name": STATE_NAME},
+        )).scalar_one_or_none()
+        if watermark is not None:
+            return watermark
+        # First run: start from the oldest stored activity
+        oldest = (await conn.execute(text("SELECT min(timestamp) FROM activity_logs"))).scalar_one_or_none()
+        return floor_hour(oldest) if oldest else None
+
+    async def run(self, now: Optional[datetime] = None) -> int:
+        """Scheduler job. Returns the number of new hours rolled up."""
+        started = datetime.now(timezone.utc)
+        cutoff = floor_hour((now or started) - self.lag)
+
+        async with self.engine.begin() as conn:
+            watermark = await self._load_watermark(conn) or cutoff
+            end = min(cutoff, watermark + self.max_span)
+            start = watermark - self.lookback
+            if end > start:
+                for sql in ROLLUP_SQL:
+                    await conn.execute(text(sql), {"start": start, "end": end})
+            new_watermark = max(watermark, end)
+            await conn.execute(
+                text(
+                    "INSERT INTO activity_rollup_state (name, watermark) VALUES (:name, :watermark) "
+                    "ON CONFLICT (name) DO UPDATE SET watermark = EXCLUDED.watermark"
+                ),
+                {"name": STATE_NAME, "watermark": new_watermark},
+            )
+
+        hours = int((new_watermark - watermark).total_seconds() // 3600)
+        self._runs += 1
+        self._hours_rolled += hours
+        self._watermark = new_watermark
+        self._last_run_seconds = (datetime.now(timezone.utc) - started).total_seconds()
+        if hours:
+            logger.info("Rolled up %d hour(s) of activity, watermark now %s", hours, new_watermark.isoformat())
+        return hours
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "runs": self._runs,
+            "hours_rolled": self._hours_rolled,
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+            "last_run_seconds": self._last_run_seconds,
+        }
+
+
+activity_rollup = ActivityRollup(
+    engine=engine,
+    lag_seconds=settings.ACTIVITY_ROLLUP_LAG_SECONDS,
+    lookback_hours=settings.ACTIVITY_ROLLUP_LOOKBACK_HOURS,
+    max_hours=settings.ACTIVITY_ROLLUP_MAX_HOURS_PER_RUN,
+)
@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.config import settings
+from app.utils.principal import APIKeyPrincipal
+
+
+class APIKeyCache:
+    """
+    Bounded LRU of API keys loaded for authentication, keyed by their public key id.
+
+    Entries live `ttl` seconds and are dropped right away by `invalidate` when
+    api_key_service updates or deletes the key in this process; other workers see the
+    change within `ttl`. The presented key is still checked against the cached hash on
+    every request, so caching never lets a wrong secret through.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, APIKeyPrincipal]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def get(self, key_id: str) -> Optional[APIKeyPrincipal]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key_id)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires_at, api_key = entry
+            if expires_at <= now:
+                del self._entries[key_id]
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key_id)
+            self._hits += 1
+            return api_key
+
+    def put(self, api_key: APIKeyPrincipal) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if api_key.key_id in self._entries:
+                self._entries.move_to_end(api_key.key_id)
+            self._entries[api_key.key_id] = (time.monotonic() + self.ttl, api_key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key_id: Optional[str]) -> None:
+        with self._lock:
+            if key_id is not None and self._entries.pop(key_id, None) is not None:
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+
+api_key_cache = APIKeyCache(
+    max_entries=settings.API_KEY_CACHE_MAX_ENTRIES,
+    ttl=settings.API_KEY_CACHE_TTL_SECONDS,
+)
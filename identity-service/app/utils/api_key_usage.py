@@ -0,0 +1,191 @@
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+from uuid import UUID, uuid4
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.config import settings
+from app.db import engine
+from app.models.api_key_model import APIKey
+from app.models.api_key_usage_model import APIKeyUsage
+
+BUCKET_SECONDS = 3600
+
+
+class APIKeyUsageMeter:
+    """
+    In-memory request and error counters per API key and hour, so requests authenticated
+    by API key cause no writes of their own.
+
+    `flush` (scheduler job, also run at shutdown) upserts the counts into api_key_usage,
+    adding to any existing row for the same key and hour, and advances
+    api_keys.last_used_at. Each transaction covers at most `batch_rows` rows; counts of a
+    batch that fails are put back, with everything not yet written, for the next flush.
+    """
+
+    def __init__(self, engine: AsyncEngine, batch_rows: int):
+        self.engine = engine
+        self.batch_rows = batch_rows
+        self._counts: Dict[Tuple[UUID, datetime], List[int]] = {}
+        self._last_used: Dict[UUID, datetime] = {}
+        self._lock = threading.Lock()
+
+        # --- Counters ---
+        self._recorded = 0
+        self._flushes = 0
+        self._rows_flushed = 0
+        self._failed_flushes = 0
+
+    @staticmethod
+    def _bucket(moment: datetime) -> datetime:
+        epoch = int(moment.timestamp())
+        return datetime.fromtimestamp(epoch - epoch % BUCKET_SECONDS, tz=timezone.utc)
+
+    def record(self, api_key_id: UUID, error: bool, moment: datetime = None) -> None:
+        moment = moment or datetime.now(timezone.utc)
+        key = (api_key_id, self._bucket(moment))
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0, 0]
+            counts[0] += 1
+            counts[1] += error
+            last_used = self._last_used.get(api_key_id)
+            if last_used is None or moment > last_used:
+                self._last_used[api_key_id] = moment
+            self._recorded += 1
+
+    def _restore(self, counts, last_used) -> None:
+        with self._lock:
+            for key, (requests, errors) in counts:
+                pending = self._counts.setdefault(key, [0, 0])
+                pending[0] += requests
+                pending[1] += errors
+            for api_key_id, moment in last_used:
+                pending = self._last_used.get(api_key_id)
+                if pending is None or moment > pending:
+                    self._last_used[api_key_id] = moment
+            self._failed_flushes += 1
+
+    async def flush(self) -> int:
+        """Write and reset the pending counters. Returns the number of usage rows written."""
+        with self._lock:
+            counts, self._counts = list(self._counts.items()), {}
+            last_used, self._last_used = list(self._last_used.items()), {}
+
+        written = 0
+        try:
+            while counts:
+                batch = counts[:self.batch_rows]
+                await self._write_usage(batch)
+                written += len(batch)
+                counts = counts[self.batch_rows:]
+            while last_used:
+                await self._write_last_used(last_used[:self.batch_rows])
+                last_used = last_used[self.batch_rows:]
+        except Exception:
+            self._restore(counts, last_used)
+            raise
+
+        with self._lock:
+            self._flushes += 1
+            self._rows_flushed += written
+        return written
+
+    async def _write_usage(self, counts) -> None:
+        table = APIKeyUsage.__table__
+        now = datetime.now(timezone.utc)
+        async with self.engine.begin() as conn:
+            # Keys deleted since the requests were counted take their usage with them
+            result = await conn.execute(
+                select(APIKey.id).where(APIKey.id.in_({api_key_id for (api_key_id, _), _ in counts}))
+            )
+            existing = set(result.scalars().all())
+            rows = [
+                {
+                    "id": uuid4(),
+                    "api_key_id": api_key_id,
+                    "bucket_start": bucket_start,
+                    "requests": requests,
+                    "errors": errors,
+                    "date_created": now,
+                    "date_updated": now,
+                }
+                for (api_key_id, bucket_start), (requests, errors) in counts
+                if api_key_id in existing
+            ]
+            if not rows:
+                return
+            stmt = insert(table).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_api_key_usage_key",
+                set_={
+                    "requests": table.c.requests + stmt.excluded.requests,
+                    "errors": table.c.errors + stmt.excluded.errors,
+                    "date_updated": stmt.excluded.date_updated,
+                },
+            )
+            await conn.execute(stmt)
+
+    async def _write_last_used(self, last_used) -> None:
+        table = APIKey.__table__
+        # Only ever moves forward, so flushes from several workers can interleave
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(last_used_at=func.greatest(
+                func.coalesce(table.c.last_used_at, bindparam("b_used_at")), bindparam("b_used_at")
+            ))
+        )
+        async with self.engine.begin() as conn:
+            await conn.execute(stmt, [{"b_id": api_key_id, "b_used_at": moment} for api_key_id, moment in last_used])
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending_rows": len(self._counts),
+                "pending_keys": len(self._last_used),
+                "recorded": self._recorded,
+                "flushes": self._flushes,
+                "rows_flushed": self._rows_flushed,
+                "failed_flushes": self._failed_flushes,
+            }
+
+
+class APIKeyUsageMiddleware:
+    """
+    Counts each request authenticated by get_current_api_key once its response status is
+    known (4xx/5xx count as errors). Plain ASGI, so it adds no per-request tasks.
+    """
+
+    def __init__(self, app, meter: APIKeyUsageMeter = None):
+        self.app = app
+        self.meter = meter or api_key_usage
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Set on request.state by get_current_api_key once the key is verified
+            api_key_id = scope.get("state", {}).get("api_key_id")
+            if api_key_id is not None:
+                self.meter.record(api_key_id, error=status_code >= 400)
+
+
+api_key_usage = APIKeyUsageMeter(
+    engine=engine,
+    batch_rows=settings.API_KEY_USAGE_FLUSH_BATCH_ROWS,
+)
@@ -0,0 +1,36 @@
+import hashlib
+import hmac
+import secrets
+from typing import Optional, Tuple
+
+# Presented keys look like "krypta_<key_id>.<secret>": the key id is public and indexed,
+# so a key is found with one point read; only the SHA-256 of the whole key is stored
+API_KEY_PREFIX = "krypta_"
+KEY_ID_BYTES = 6  # 12 hex characters
+SECRET_BYTES = 32
+
+
+def hash_api_key(key: str) -> str:
+    # The secret is 256 random bits, so a fast hash is enough (no salt or stretching needed)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def generate_api_key() -> Tuple[str, str, str]:
+    """New (key_id, key, key_hash). The key itself is shown to the caller once and never stored."""
+    key_id = secrets.token_hex(KEY_ID_BYTES)
+    key = f"{API_KEY_PREFIX}{key_id}.{secrets.token_urlsafe(SECRET_BYTES)}"
+    return key_id, key, hash_api_key(key)
+
+
+def parse_key_id(key: str) -> Optional[str]:
+    """Key id of a presented key, or None if it is not in the API key format."""
+    if not key.startswith(API_KEY_PREFIX):
+        return None
+    key_id, dot, secret = key[len(API_KEY_PREFIX):].partition(".")
+    if len(key_id) != KEY_ID_BYTES * 2 or not dot or not secret:
+        return None
+    return key_id
+
+
+def verify_api_key(key: str, key_hash: str) -> bool:
+    return hmac.compare_digest(hash_api_key(key), key_hash)
@@ -0,0 +1,100 @@
+from fastapi import Depends, HTTPException, Request, Security, status
+from fastapi.security import APIKeyHeader
+from datetime import datetime, timezone
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_db, get_read_db
+from app.models.api_key_model import APIKey
+from app.models.user_model import User, UserStatus
+from app.utils.api_key_cache import api_key_cache
+from app.utils.api_keys import parse_key_id, verify_api_key
+from app.utils.permission_cache import permission_cache
+from app.utils.principal import APIKeyPrincipal
+
+# Machine clients send their key in this header
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
+
+
+async def get_current_api_key(
+    request: Request,
+    key: str = Security(api_key_header),
+    db: AsyncSession = Depends(get_db),
+) -> APIKeyPrincipal:
+    """
+    Authenticate a request by API key.
+    Keys are found by their public key id (API key cache, else one indexed point read)
+    and the presented key is compared to the stored hash in constant time. Misses are
+    read from the primary: a lagging replica could return a revoked key as active, and
+    that stale copy would then be cached.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid API key",
+        headers={"WWW-Authenticate": "ApiKey"},
+    )
+    key_id = parse_key_id(key) if key else None
+    if key_id is None:
+        raise credentials_exception
+
+    api_key = api_key_cache.get(key_id)
+    if api_key is None:
+        api_key = await _load_api_key(key_id, db)
+        if api_key is None:
+            raise credentials_exception
+        api_key_cache.put(api_key)
+
+    if not verify_api_key(key, api_key.key_hash):
+        raise credentials_exception
+    # Metered by APIKeyUsageMiddleware, rejected requests included
+    request.state.api_key_id = api_key.id
+
+    if not api_key.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="API key is inactive")
+    # expires_at is stored without a time zone, in UTC
+    if api_key.expires_at and api_key.expires_at <= datetime.now(timezone.utc).replace(tzinfo=None):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="API key has expired")
+    if api_key.user_status is not None and api_key.user_status != UserStatus.ACTIVE:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"User account is {api_key.user_status.value}",
+        )
+
+    return api_key
+
+
+async def _load_api_key(key_id: str, db: AsyncSession):
+    result = await db.execute(
+        select(
+            APIKey.id, APIKey.key_id, APIKey.key_hash, APIKey.user_id, User.status,
+            APIKey.is_active, APIKey.expires_at, APIKey.permission_mask,
+        )
+        .outerjoin(User, User.id == APIKey.user_id)
+        .where(APIKey.key_id == key_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    api_key_id, key_id, key_hash, user_id, user_status, is_active, expires_at, permission_mask = row
+    return APIKeyPrincipal(
+        id=api_key_id, key_id=key_id, key_hash=key_hash, user_id=user_id, user_status=user_status,
+        is_active=bool(is_active), expires_at=expires_at, permission_mask=permission_mask,
+    )
+
+
+def api_key_permission_required(permission_name: str):
+    """
+    Dependency for machine-to-machine routes: the authenticated API key, which must hold
+    `permission_name` (directly or through a wildcard grant).
+    """
+    async def dependency(
+        api_key: APIKeyPrincipal = Depends(get_current_api_key),
+        db: AsyncSession = Depends(get_read_db),
+    ) -> APIKeyPrincipal:
+        if not api_key.permission_mask & await permission_cache.required_mask(db, permission_name):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Permission denied: {permission_name}",
+            )
+        return api_key
+
+    return dependency
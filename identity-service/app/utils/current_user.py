@@ -1,12 +1,16 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError, ExpiredSignatureError
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 from uuid import UUID
 from app.models.user_model import User, UserStatus
-from app.db import get_db
-import os
+from app.models.staff_model import Staff
+from app.db import get_read_db
 from app.config import settings
+from app.utils.principal import Principal
+from app.utils.token_cache import token_cache
 
 JWT_SECRET_KEY = settings.JWT_SECRET_KEY
 JWT_ALGORITHM = settings.JWT_ALGORITHM
@@ -14,14 +18,30 @@ JWT_ALGORITHM = settings.JWT_ALGORITHM
 # OAuth2 scheme for extracting Bearer token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
+    db: AsyncSession = Depends(get_read_db),
+) -> Principal:
     """
-    Extract and return the current authenticated user based on JWT token.
+    Extract and return the current authenticated principal based on JWT token.
+    Verified tokens are served from the token cache without decoding or touching the DB.
     """
 
+    principal = token_cache.get(token)
+    if principal is None:
+        principal = await _load_principal(token, db)
+
+    # Check account status
+    if principal.status != UserStatus.ACTIVE:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"User account is {principal.status.value}",
+        )
+
+    return principal
+
+
+async def _load_principal(token: str, db: AsyncSession) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -48,19 +68,19 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    # Fetch user from DB
-    user = db.query(User).filter(User.id == user_uuid).first()
+    # Fetch user from DB (staff profile and permissions only)
+    result = await db.execute(
+        select(User)
+        .options(joinedload(User.staff_profile).selectinload(Staff.permissions))
+        .where(User.id == user_uuid)
+    )
+    user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
 
-    # Check account status
-    if user.status != UserStatus.ACTIVE:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"User account is {user.status.value}",
-        )
-
-    return user
+    principal = Principal.from_user(user)
+    token_cache.put(token, principal, payload.get("exp"))
+    return principal
@@ -0,0 +1,30 @@
+import ipaddress
+from typing import Optional, Union
+from fastapi import HTTPException, status
+from sqlalchemy import cast
+from sqlalchemy.dialects.postgresql import CIDR
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def normalize_ip(value: Optional[str]) -> Optional[str]:
+    """Canonical text form of an IP address, or None if `value` is not one (e.g. "testclient")."""
+    if not value:
+        return None
+    try:
+        return str(ipaddress.ip_address(value))
+    except ValueError:
+        return None
+
+
+def parse_network(value: str) -> Network:
+    """A CIDR range ("10.20.0.0/16"); a bare address is its own /32 (or /128) network."""
+    try:
+        return ipaddress.ip_network(value, strict=False)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid IP network {value!r}")
+
+
+def within(column, network: Network):
+    """`column <<= network` for an INET column, answered from its GiST (inet_ops) index."""
+    return column.op("<<=", is_comparison=True)(cast(str(network), CIDR))
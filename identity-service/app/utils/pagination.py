@@ -0,0 +1,63 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+from uuid import UUID
+from fastapi import HTTPException, status
+from sqlalchemy import Select, tuple_
+
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(sort_value: datetime, row_id: UUID) -> str:
+    raw = json.dumps([sort_value.isoformat(), str(row_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        return datetime.fromisoformat(sort_value), UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def clamp_limit(limit: int) -> int:
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def paginate(
+    stmt: Select,
+    sort_column,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: Optional[int] = None,
+) -> Select:
+    """
+    Newest-first keyset pagination on (sort_column, id_column).
+
+    With a cursor the page starts strictly after the cursor row, so the database seeks
+    straight into the matching composite index no matter how deep the page is (the plain
+    upper bound on sort_column lets the planner prune partitions as well). `skip` is
+    the legacy OFFSET path and is only used when no cursor is given. One extra row is
+    fetched so `build_page` can tell whether a next page exists.
+    """
+    stmt = stmt.order_by(sort_column.desc(), id_column.desc()).limit(clamp_limit(limit) + 1)
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        stmt = stmt.where(sort_column <= sort_value, tuple_(sort_column, id_column) < tuple_(sort_value, row_id))
+    elif skip:
+        stmt = stmt.offset(skip)
+    return stmt
+
+
+def build_page(rows: Sequence[Any], limit: int, sort_attr: str = "date_created") -> dict:
+    limit = clamp_limit(limit)
+    items: List[Any] = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, sort_attr), last.id)
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,156 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from app.config import settings
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# ---------------- WORKER FUNCTIONS (run in the pool processes) ---------------- #
+def _hash_job(password: str, submitted_at: float) -> Tuple[str, float, float]:
+    started = time.time()
+    hashed = pwd_context.hash(password)
+    return hashed, started - submitted_at, time.time() - started
+
+
+def _verify_job(password: str, hashed_password: str, submitted_at: float) -> Tuple[bool, float, float]:
+    started = time.time()
+    ok = pwd_context.verify(password, hashed_password)
+    return ok, started - submitted_at, time.time() - started
+
+
+def _noop() -> None:
+    return None
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a process pool so hashing uses every core and never blocks the event loop.
+
+    At most `workers` hashes run at once; up to `max_pending` more may wait in the pool
+    queue. Anything beyond that is rejected immediately with a 503 rather than piling up
+    behind seconds of bcrypt work.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # --- Counters ---
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_hash = 0.0
+        self._max_hash = 0.0
+
+    # ---------------- LIFECYCLE ---------------- #
+    def start(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                return
+            # spawn: never fork a process that already runs the writer/event-loop threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        # Bring every worker up now instead of on the first login
+        for future in [self._executor.submit(_noop) for _ in range(self.workers)]:
+            future.result()
+
+    def stop(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    # ---------------- PUBLIC API ---------------- #
+    async def hash(self, password: str) -> str:
+        return await self._await(self._submit(_hash_job, password))
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._await(self._submit(_verify_job, password, hashed_password))
+
+    def hash_sync(self, password: str) -> str:
+        """Blocking variant for scripts and code that is not running on the event loop."""
+        return self._result(self._submit(_hash_job, password).result())
+
+    def verify_sync(self, password: str, hashed_password: str) -> bool:
+        return self._result(self._submit(_verify_job, password, hashed_password).result())
+
+    # ---------------- INTERNALS ---------------- #
+    def _submit(self, fn, *args) -> Future:
+        if self._executor is None:
+            self.start()
+
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_pending:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many password operations in progress, retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._in_flight += 1
+            self._submitted += 1
+
+        try:
+            future = self._executor.submit(fn, *args, time.time())
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                return
+            _, wait, took = future.result()
+            self._completed += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            self._total_hash += took
+            self._max_hash = max(self._max_hash, took)
+
+    async def _await(self, future: Future):
+        return self._result(await asyncio.wrap_future(future))
+
+    @staticmethod
+    def _result(outcome: tuple):
+        return outcome[0]
+
+    # ---------------- METRICS ---------------- #
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._in_flight,
+                "queued": max(self._in_flight - self.workers, 0),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_queue_wait_seconds": self._total_wait / self._completed if self._completed else 0.0,
+                "max_queue_wait_seconds": self._max_wait,
+                "avg_hash_seconds": self._total_hash / self._completed if self._completed else 0.0,
+                "max_hash_seconds": self._max_hash,
+            }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -1,28 +1,29 @@
 from functools import wraps
-from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.models.user_model import User
-from app.models.staff_model import Staff
-from app.utils.current_user import get_current_user
-from app.db import get_db
+from fastapi import HTTPException, status
+from app.utils.permission_cache import permission_cache
+
 
 def permission_required(permission_name: str):
+    """
+    Guard an async route on a staff permission.
+    The route itself must declare `current_user` and `db` dependencies; FastAPI resolves
+    them from the wrapped signature and they are read here from the call kwargs.
+    The caller's permission mask and the permission's bit come from the permission cache,
+    so once it is warm the check is a single AND with no query.
+    """
     def decorator(func):
         @wraps(func)
-        async def wrapper(
-            *args,
-            current_user: User = Depends(get_current_user),
-            db: Session = Depends(get_db),
-            **kwargs
-        ):
+        async def wrapper(*args, **kwargs):
+            current_user = kwargs.get("current_user")
+            db = kwargs.get("db")
             if not current_user:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Unauthorized"
                 )
 
-            # fetch staff record linked to the user
-            staff = db.query(Staff).filter(Staff.user_id == current_user.id).first()
+            # staff profile linked to the user (part of the principal)
+            staff = current_user.staff_profile
             if not staff:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
@@ -30,8 +31,7 @@ def permission_required(permission_name: str):
                 )
 
             # check staff permissions
-            has_permission = any(p.name == permission_name for p in staff.permissions)
-            if not has_permission:
+            if not await permission_cache.allows(db, staff.id, permission_name):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail=f"Permission denied: {permission_name}"
@@ -0,0 +1,70 @@
+import base64
+from typing import Dict, Iterable, List, Tuple
+from app.models.permission_model import Permission
+
+
+def mask_of(permissions: Iterable[Permission]) -> int:
+    """permission_mask for a set of permissions: bit `p.bit` set for each of them."""
+    mask = 0
+    for permission in permissions:
+        mask |= permission.mask
+    return mask
+
+
+def encode_mask_claim(mask: int) -> str:
+    """Compact token claim: the mask's big-endian bytes, base64url without padding."""
+    raw = mask.to_bytes(max(1, (mask.bit_length() + 7) // 8), "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_mask_claim(claim: str) -> int:
+    return int.from_bytes(base64.urlsafe_b64decode(claim + "=" * (-len(claim) % 4)), "big")
+
+
+def names_of(mask: int, names: Dict[int, str]) -> List[str]:
+    """Names of the permissions (bit -> name map) granted by `mask`, in bit order."""
+    return [names[bit] for bit in sorted(names) if mask >> bit & 1]
+
+
+WILDCARD = "*"
+SEPARATOR = ":"
+
+
+class _Node:
+    __slots__ = ("exact", "wildcard", "children")
+
+    def __init__(self):
+        self.exact = 0  # bit of the permission named by the path to this node
+        self.wildcard = 0  # bit of "<path>:*", which covers every name below this node
+        self.children: Dict[str, "_Node"] = {}
+
+
+class PermissionMatcher:
+    """
+    Trie over the colon-separated segments of permission names, compiled from every
+    permission's bit. `mask_for(name)` walks one node per segment and returns the mask of
+    all grants that satisfy `name`: its own bit plus those of `*` and each enclosing
+    wildcard (`staff:*` for `staff:read`), so a check is `permission_mask & mask_for(name)`.
+    """
+
+    def __init__(self, bits: Iterable[Tuple[str, int]]):
+        self._root = _Node()
+        for name, bit in bits:
+            *path, last = name.split(SEPARATOR)
+            node = self._root
+            for segment in path:
+                node = node.children.setdefault(segment, _Node())
+            if last == WILDCARD:
+                node.wildcard |= 1 << bit
+            else:
+                node.children.setdefault(last, _Node()).exact |= 1 << bit
+
+    def mask_for(self, name: str) -> int:
+        node = self._root
+        mask = 0
+        for segment in name.split(SEPARATOR):
+            mask |= node.wildcard
+            node = node.children.get(segment)
+            if node is None:
+                return mask
+        return mask | node.exact
@@ -0,0 +1,160 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.config import settings
+from app.db import engine
+from app.models.permission_model import Permission
+from app.models.staff_model import Staff
+from app.utils.permission_bits import PermissionMatcher
+
+logger = logging.getLogger(__name__)
+
+
+class PermissionCache:
+    """
+    Staff permission masks per staff id plus, per required permission name, the mask of
+    every grant that satisfies it (the permission itself and its wildcards, from a
+    PermissionMatcher), so a check is one dict lookup each and a single AND.
+
+    A staff miss costs one query (the staff's permission_mask); the matcher is compiled
+    from all permission bits in one query when first needed. Staff entries live `ttl`
+    seconds and are dropped right away by `invalidate` when a staff member is updated or
+    deleted in this process. `warm` reloads staff masks and recompiles the matcher; it runs at startup and then periodically (well within `ttl`), so
+    protected endpoints make no permission queries once the app is up and other workers
+    see permission changes at the next refresh.
+    """
+
+    def __init__(self, engine: AsyncEngine, max_entries: int, ttl: float):
+        self.engine = engine
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: Dict[UUID, Tuple[float, int]] = {}
+        self._matcher: Optional[PermissionMatcher] = None
+        self._names: Dict[int, str] = {}
+        self._required: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        # --- Counters ---
+        self._hits = 0
+        self._misses = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._warmed: Optional[int] = None
+
+    def get(self, staff_id: UUID) -> Optional[int]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(staff_id)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, mask = entry
+            if expires_at <= now:
+                del self._entries[staff_id]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._hits += 1
+            return mask
+
+    def put(self, staff_id: UUID, mask: int) -> None:
+        with self._lock:
+            if staff_id not in self._entries and len(self._entries) >= self.max_entries:
+                # Full: make room by dropping expired entries, or skip caching this one
+                now = time.monotonic()
+                for key in [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                    del self._entries[key]
+                if len(self._entries) >= self.max_entries:
+                    return
+            self._entries[staff_id] = (time.monotonic() + self.ttl, mask)
+
+    async def resolve(self, db, staff_id: UUID) -> int:
+        """Cached permission_mask of a staff member (0 if gone), loaded through `db` on a miss."""
+        mask = self.get(staff_id)
+        if mask is None:
+            result = await db.execute(select(Staff.permission_mask).where(Staff.id == staff_id))
+            mask = result.scalar_one_or_none() or 0
+            self.put(staff_id, mask)
+        return mask
+
+    async def _load_matcher(self, db) -> PermissionMatcher:
+        if self._matcher is None:
+            bits = (await db.execute(select(Permission.name, Permission.bit))).all()
+            self._names = {bit: name for name, bit in bits}
+            self._matcher = PermissionMatcher(bits)
+        return self._matcher
+
+    async def bit_names(self, db) -> Dict[int, str]:
+        """Permission name of every bit, wildcards ("*", "staff:*") included."""
+        await self._load_matcher(db)
+        return self._names
+
+    async def required_mask(self, db, name: str) -> int:
+        """Mask of the grants satisfying permission `name` (0 if nothing can)."""
+        mask = self._required.get(name)
+        if mask is None:
+            mask = (await self._load_matcher(db)).mask_for(name)
+            self._required[name] = mask
+        return mask
+
+    async def required_masks(self, db, names: Iterable[str]) -> Dict[str, int]:
+        """
+        Like `required_mask` for many names. Results for names outside the cache are not
+        stored, as they may come from callers of /authz/check.
+        """
+        matcher = await self._load_matcher(db)
+        return {name: self._required.get(name) or matcher.mask_for(name) for name in set(names)}
+
+    async def allows(self, db, staff_id: UUID, name: str) -> bool:
+        return bool(await self.resolve(db, staff_id) & await self.required_mask(db, name))
+
+    def invalidate(self, staff_id: UUID) -> None:
+        with self._lock:
+            if self._entries.pop(staff_id, None) is not None:
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    async def warm(self) -> int:
+        """Recompile the matcher and load every staff mask (startup, then periodic). Returns the staff count."""
+        async with self.engine.connect() as conn:
+            bits = (await conn.execute(select(Permission.name, Permission.bit))).all()
+            masks = (await conn.execute(select(Staff.id, Staff.permission_mask))).all()
+        matcher = PermissionMatcher(bits)
+        self._required = {name: matcher.mask_for(name) for name, _ in bits}
+        self._names = {bit: name for name, bit in bits}
+        self._matcher = matcher
+        for staff_id, mask in masks:
+            self.put(staff_id, mask)
+        self._warmed = len(masks)
+        logger.info("Permission cache warmed with %d staff and %d permissions", len(masks), len(bits))
+        return len(masks)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "permissions": len(self._required),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "warmed_staff": self._warmed,
+            }
+
+
+permission_cache = PermissionCache(
+    engine=engine,
+    max_entries=settings.PERMISSION_CACHE_MAX_ENTRIES,
+    ttl=settings.PERMISSION_CACHE_TTL_SECONDS,
+)
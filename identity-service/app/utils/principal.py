@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import FrozenSet, Optional
+from uuid import UUID
+from app.models.staff_model import Department, StaffRole
+from app.models.user_model import User, UserStatus
+
+
+@dataclass(frozen=True)
+class StaffPrincipal:
+    """Staff fields needed for authorization decisions (duck-types Staff for RestrictionService)."""
+    id: UUID
+    role: StaffRole
+    department: Department
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Compact, immutable identity of the authenticated caller.
+    Built once per access token and shared between requests via the token cache,
+    so it must never hold ORM instances or anything bound to a DB session.
+    """
+    id: UUID
+    username: str
+    status: UserStatus
+    is_superuser: bool
+    staff_profile: Optional[StaffPrincipal]
+    permissions: FrozenSet[str]
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        staff = user.staff_profile
+        return cls(
+            id=user.id,
+            username=user.username,
+            status=user.status,
+            is_superuser=user.is_superuser,
+            staff_profile=StaffPrincipal(id=staff.id, role=staff.role, department=staff.department) if staff else None,
+            permissions=frozenset(p.name for p in staff.permissions) if staff else frozenset(),
+        )
+
+
+@dataclass(frozen=True)
+class APIKeyPrincipal:
+    """
+    Verified API key of a machine client. Cached per key id between requests, so like
+    Principal it must never hold ORM instances.
+    """
+    id: UUID
+    key_id: str
+    key_hash: str
+    user_id: Optional[UUID]
+    user_status: Optional[UserStatus]
+    is_active: bool
+    expires_at: Optional[datetime]
+    permission_mask: int
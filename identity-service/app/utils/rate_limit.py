@@ -0,0 +1,299 @@
+import abc
+import json
+import logging
+import math
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from jose import jwt, JWTError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from app.config import settings
+from app.utils.api_key_cache import api_key_cache
+from app.utils.api_keys import parse_key_id, verify_api_key
+from app.utils.token_cache import token_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """`requests` per `period` seconds for paths under `prefix`, as a token bucket of that size."""
+    prefix: str
+    requests: int
+    period: float
+
+    @property
+    def rate(self) -> float:
+        return self.requests / self.period
+
+
+def parse_rate_limits(spec: str) -> List[RateLimit]:
+    """
+    Rules from a comma-separated "path-prefix=requests/seconds" spec, e.g.
+    "/auth/login=10/60,/=300/60". The longest matching prefix wins.
+    """
+    limits = []
+    for rule in filter(None, (part.strip() for part in spec.split(","))):
+        prefix, _, limit = rule.partition("=")
+        requests, _, period = limit.partition("/")
+        limits.append(RateLimit(prefix=prefix.strip(), requests=int(requests), period=float(period)))
+    return sorted(limits, key=lambda limit: len(limit.prefix), reverse=True)
+
+
+class RateLimitBackend(abc.ABC):
+    """Where token buckets live. `take` spends one token and returns 0, or the seconds until one is available."""
+
+    @abc.abstractmethod
+    async def take(self, key: str, limit: RateLimit) -> float:
+        ...
+
+    def stats(self) -> dict:
+        return {}
+
+    async def dispose(self) -> None:
+        pass
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Token buckets in this process, split over `shards` dicts with their own locks so
+    concurrent requests rarely contend. Each bucket is [tokens, last update, period], and
+    a shard keeps its buckets least recently used first. A shard never holds more than
+    its share of `max_keys`: to make room for a new key, buckets idle for a whole period
+    (refilled completely, so indistinguishable from new ones) are dropped from the front,
+    and if none is idle the least recently used bucket is evicted. Both are O(1) per key.
+    """
+
+    def __init__(self, shards: int, max_keys: int):
+        self._shards: List[OrderedDict] = [OrderedDict() for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._max_keys_per_shard = max(1, max_keys // shards)
+
+        # --- Counters ---
+        self._pruned = 0
+        self._evicted = 0
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        index = zlib.crc32(key.encode()) % len(self._shards)
+        buckets = self._shards[index]
+        now = time.monotonic()
+        with self._locks[index]:
+            bucket = buckets.get(key)
+            if bucket is None:
+                if len(buckets) >= self._max_keys_per_shard:
+                    self._make_room(buckets, now)
+                bucket = buckets[key] = [float(limit.requests), now, limit.period]
+            else:
+                buckets.move_to_end(key)
+            tokens = min(limit.requests, bucket[0] + (now - bucket[1]) * limit.rate)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return 0.0
+            bucket[0] = tokens
+            return (1 - tokens) / limit.rate
+
+    def _make_room(self, buckets: OrderedDict, now: float) -> None:
+        # Least recently used first, so the idle buckets are at the front
+        while buckets:
+            _, updated, period = next(iter(buckets.values()))
+            if now - updated < period:
+                break
+            buckets.popitem(last=False)
+            self._pruned += 1
+        if len(buckets) >= self._max_keys_per_shard:
+            buckets.popitem(last=False)
+            self._evicted += 1
+
+    def stats(self) -> dict:
+        return {
+            "keys": sum(len(buckets) for buckets in self._shards),
+            "shards": len(self._shards),
+            "pruned": self._pruned,
+            "evicted": self._evicted,
+        }
+
+
+# One statement per request: refill by the elapsed time, then spend a token if there is one.
+# All SET expressions see the old row, so `allowed` and `tokens` agree. now() (the take's own
+# transaction) is the database's clock, shared by every worker.
+_REFILLED = (
+    "LEAST(CAST(:capacity AS float8), b.tokens"
+    " + EXTRACT(EPOCH FROM now() - b.updated_at)::float8 * CAST(:rate AS float8))"
+)
+TAKE_SQL = text(f"""
+    INSERT INTO rate_limit_buckets AS b (key, tokens, allowed, updated_at)
+    VALUES (:key, CAST(:capacity AS float8) - 1, true, now())
+    ON CONFLICT (key) DO UPDATE SET
+        tokens = {_REFILLED} - CASE WHEN {_REFILLED} >= 1 THEN 1 ELSE 0 END,
+        allowed = {_REFILLED} >= 1,
+        updated_at = now()
+    RETURNING tokens, allowed
+""")
+
+
+class PostgresRateLimitBackend(RateLimitBackend):
+    """
+    Token buckets shared by every worker, in the UNLOGGED rate_limit_buckets table (one
+    upsert per request). Uses its own small pool, so limiting never waits on the pool the
+    request handlers use. `prune` drops buckets idle for longer than `idle_seconds`.
+    """
+
+    def __init__(self, url: str, pool_size: int, idle_seconds: float):
+        self.engine: AsyncEngine = create_async_engine(url, pool_size=pool_size, max_overflow=0)
+        self.idle_seconds = idle_seconds
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        async with self.engine.begin() as conn:
+            tokens, allowed = (
+                await conn.execute(TAKE_SQL, {"key": key, "capacity": limit.requests, "rate": limit.rate})
+            ).one()
+        return 0.0 if allowed else (1 - tokens) / limit.rate
+
+    async def prune(self) -> int:
+        async with self.engine.begin() as conn:
+            result = await conn.execute(
+                text("DELETE FROM rate_limit_buckets WHERE updated_at < now() - make_interval(secs => :idle)"),
+                {"idle": self.idle_seconds},
+            )
+        return result.rowcount
+
+    async def dispose(self) -> None:
+        await self.engine.dispose()
+
+
+class RateLimiter:
+    """
+    Token-bucket limits per route group (longest path prefix) and caller.
+
+    The caller is identified without database work or password hashing: a bearer token in
+    the token cache or with a valid signature counts as its user, an API key already in
+    the API key cache (and matching its hash) as that key, anything else as the client
+    IP, so made-up credentials cannot buy fresh buckets. If the backend fails, the
+    in-process buckets stand in until it recovers.
+    """
+
+    def __init__(self, limits: List[RateLimit], backend: RateLimitBackend, fallback: RateLimitBackend):
+        self.limits = limits
+        self.backend = backend
+        self.fallback = fallback
+        self._lock = threading.Lock()
+
+        # --- Counters ---
+        self._allowed = 0
+        self._rejected = 0
+        self._backend_errors = 0
+
+    def limit_for(self, path: str) -> Optional[RateLimit]:
+        return next((limit for limit in self.limits if path.startswith(limit.prefix)), None)
+
+    @staticmethod
+    def identify(scope) -> str:
+        headers = dict(scope.get("headers") or ())
+        authorization = headers.get(b"authorization", b"").decode("latin-1")
+        if authorization[:7].lower() == "bearer ":
+            token = authorization[7:]
+            principal = token_cache.get(token)
+            if principal is not None:
+                return f"user:{principal.id}"
+            try:
+                subject = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]).get("sub")
+            except JWTError:
+                subject = None
+            if subject:
+                return f"user:{subject}"
+
+        key = headers.get(b"x-api-key", b"").decode("latin-1")
+        key_id = parse_key_id(key) if key else None
+        if key_id is not None:
+            api_key = api_key_cache.get(key_id)
+            if api_key is not None and verify_api_key(key, api_key.key_hash):
+                return f"apikey:{key_id}"
+
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def check(self, scope) -> Tuple[Optional[RateLimit], float]:
+        """(matching limit, seconds to wait); 0 seconds means the request may proceed."""
+        limit = self.limit_for(scope["path"])
+        if limit is None:
+            return None, 0.0
+        key = f"{limit.prefix}|{self.identify(scope)}"
+        try:
+            retry_after = await self.backend.take(key, limit)
+        except Exception:
+            logger.warning("Rate limit backend failed; using in-process buckets", exc_info=True)
+            with self._lock:
+                self._backend_errors += 1
+            retry_after = await self.fallback.take(key, limit)
+        with self._lock:
+            if retry_after:
+                self._rejected += 1
+            else:
+                self._allowed += 1
+        return limit, retry_after
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": type(self.backend).__name__,
+                "limits": {limit.prefix: f"{limit.requests}/{limit.period:g}s" for limit in self.limits},
+                "allowed": self._allowed,
+                "rejected": self._rejected,
+                "backend_errors": self._backend_errors,
+                **self.backend.stats(),
+            }
+
+
+class RateLimitMiddleware:
+    """Rejects over-limit requests with 429 and Retry-After before any route or dependency runs."""
+
+    def __init__(self, app, limiter: RateLimiter = None):
+        self.app = app
+        self.limiter = limiter or rate_limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit, retry_after = await self.limiter.check(scope)
+        if not retry_after:
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Too many requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(math.ceil(retry_after)).encode()),
+                (b"x-ratelimit-limit", f"{limit.requests};w={limit.period:g}".encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def _backend_from_settings() -> RateLimitBackend:
+    if settings.RATE_LIMIT_BACKEND == "postgres":
+        return PostgresRateLimitBackend(
+            settings.DATABASE_URL,
+            pool_size=settings.RATE_LIMIT_DB_POOL_SIZE,
+            idle_seconds=max((limit.period for limit in parse_rate_limits(settings.RATE_LIMITS)), default=60.0),
+        )
+    if settings.RATE_LIMIT_BACKEND != "memory":
+        raise ValueError(f"Unknown rate limit backend {settings.RATE_LIMIT_BACKEND!r}")
+    return MemoryRateLimitBackend(shards=settings.RATE_LIMIT_SHARDS, max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+
+rate_limiter = RateLimiter(
+    limits=parse_rate_limits(settings.RATE_LIMITS),
+    backend=_backend_from_settings(),
+    fallback=MemoryRateLimitBackend(shards=settings.RATE_LIMIT_SHARDS, max_keys=settings.RATE_LIMIT_MAX_KEYS),
+)
@@ -0,0 +1,139 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.utils.pool_metrics import pool_stats
+
+logger = logging.getLogger(__name__)
+
+
+def client_key(request: Optional[Request]) -> Optional[str]:
+    """Identify the client for read-your-writes: bearer token digest, else client IP."""
+    if request is None:
+        return None
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return hashlib.sha256(authorization.encode()).hexdigest()
+    return request.client.host if request.client else None
+
+
+@dataclass
+class Replica:
+    engine: AsyncEngine
+    healthy: bool = True
+    last_error: Optional[str] = None
+
+
+class ReplicaRouter:
+    """
+    Picks the engine for read-only units of work.
+
+    Reads go round-robin over the healthy replicas. A client that committed a write in the
+    last `sticky_window` seconds is routed to the primary instead, so it always sees its
+    own writes regardless of replica lag. With no (healthy) replicas everything stays on
+    the primary.
+    """
+
+    def __init__(self, primary: AsyncEngine, replicas: List[Replica], sticky_window: float, max_tracked_clients: int = 100_000):
+        self.primary = primary
+        self.replicas = replicas
+        self.sticky_window = sticky_window
+        self.max_tracked_clients = max_tracked_clients
+        self._next = 0
+        self._last_write: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._primary_reads = 0
+        self._replica_reads = 0
+        self._sticky_reads = 0
+
+    # ---------------- WRITE TRACKING ---------------- #
+    def mark_write(self, key: Optional[str]) -> None:
+        if key is None or not self.replicas:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._last_write.pop(key, None)
+            self._last_write[key] = now
+            # Entries are in write order, so expired ones are all at the front
+            while self._last_write:
+                _, written_at = next(iter(self._last_write.items()))
+                if now - written_at <= self.sticky_window and len(self._last_write) <= self.max_tracked_clients:
+                    break
+                self._last_write.popitem(last=False)
+
+    def _recently_wrote(self, key: Optional[str]) -> bool:
+        if key is None:
+            return False
+        written_at = self._last_write.get(key)
+        return written_at is not None and time.monotonic() - written_at <= self.sticky_window
+
+    # ---------------- READ ROUTING ---------------- #
+    def engine_for_read(self, key: Optional[str]) -> AsyncEngine:
+        with self._lock:
+            if self._recently_wrote(key):
+                self._sticky_reads += 1
+                self._primary_reads += 1
+                return self.primary
+
+            for _ in range(len(self.replicas)):
+                replica = self.replicas[self._next % len(self.replicas)]
+                self._next += 1
+                if replica.healthy:
+                    self._replica_reads += 1
+                    return replica.engine
+
+            self._primary_reads += 1
+            return self.primary
+
+    # ---------------- HEALTH ---------------- #
+    async def check_health(self, timeout: float = 2.0) -> None:
+        await asyncio.gather(*(self._check(replica, timeout) for replica in self.replicas))
+
+    @staticmethod
+    async def _ping(engine: AsyncEngine) -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    @staticmethod
+    async def _check(replica: Replica, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(ReplicaRouter._ping(replica.engine), timeout)
+        except Exception as e:
+            if replica.healthy:
+                logger.warning("Read replica %s marked unhealthy: %s", replica.engine.url, e)
+            replica.healthy = False
+            replica.last_error = str(e)
+            return
+        replica.healthy = True
+        replica.last_error = None
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    # ---------------- METRICS ---------------- #
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "primary_reads": self._primary_reads,
+                "replica_reads": self._replica_reads,
+                "sticky_reads": self._sticky_reads,
+                "tracked_clients": len(self._last_write),
+                "replicas": [
+                    {
+                        "url": replica.engine.url.render_as_string(hide_password=True),
+                        "healthy": replica.healthy,
+                        "last_error": replica.last_error,
+                        "pool": pool_stats(replica.engine),
+                    }
+                    for replica in self.replicas
+                ],
+            }
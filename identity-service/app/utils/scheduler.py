@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Runs an async job every `interval` seconds on the app's event loop until stopped."""
+
+    def __init__(self, name: str, interval: float, job: Callable[[], Awaitable[None]]):
+        self.name = name
+        self.interval = interval
+        self.job = job
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.job()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Periodic task %s failed", self.name)
+            await asyncio.sleep(self.interval)
+
+
+class Scheduler:
+    """Registry of the in-process periodic jobs, started and stopped with the app."""
+
+    def __init__(self):
+        self._tasks: Dict[str, PeriodicTask] = {}
+
+    def register(self, name: str, interval: float, job: Callable[[], Awaitable[None]]) -> None:
+        self._tasks[name] = PeriodicTask(name, interval, job)
+
+    def start(self) -> None:
+        for task in self._tasks.values():
+            task.start()
+
+    async def stop(self) -> None:
+        for task in reversed(list(self._tasks.values())):
+            await task.stop()
+
+
+scheduler = Scheduler()
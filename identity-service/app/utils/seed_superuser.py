@@ -1,16 +1,19 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user_model import User, UserStatus
-from app.models.staff_model import Staff
+from app.models.staff_model import Staff, StaffRole, Department
 from app.models.permission_model import Permission
 from app.services.user_service import hash_password
+from app.utils.permission_bits import WILDCARD, mask_of
 import uuid
 
-def seed_superuser(db: Session):
+async def seed_superuser(db: AsyncSession):
     SUPERUSER_EMAIL = "superuser@system.local"
     SUPERUSER_USERNAME = "superuser"
 
     # check if superuser already exists
-    existing_user = db.query(User).filter(User.is_superuser == True).first()
+    result = await db.execute(select(User).where(User.is_superuser == True))
+    existing_user = result.scalars().first()
     if existing_user:
         print("[*] Superuser already exists.")
         return existing_user
@@ -21,28 +24,31 @@ def seed_superuser(db: Session):
         username=SUPERUSER_USERNAME,
         email=SUPERUSER_EMAIL,
         phone_number="0000000000",
-        hashed_password=hash_password("SuperSecurePassword123!"),
+        hashed_password=await hash_password("SuperSecurePassword123!"),
         is_verified=True,
         status=UserStatus.ACTIVE,
         is_superuser=True
     )
     db.add(superuser)
-    db.flush() 
+    await db.flush()
 
-    # create staff profile
+    # create staff profile with the "*" grant, which covers every permission
+    everything = (await db.execute(select(Permission).where(Permission.name == WILDCARD))).scalars().first()
+    if everything is None:
+        everything = Permission(name=WILDCARD)
+        db.add(everything)
+        await db.flush()
+        await db.refresh(everything)
     staff = Staff(
         user_id=superuser.id,
-        department="IT",
-        role="superuser"
+        department=Department.SUPERUSER,
+        role=StaffRole.SUPERUSER,
+        permissions=[everything],
+        permission_mask=mask_of([everything]),
     )
     db.add(staff)
-    db.flush()
 
-    # assign all permissions
-    permissions = db.query(Permission).all()
-    staff.permissions.extend(permissions)
-
-    db.commit()
+    await db.commit()
     print("[*] Superuser seeded successfully.")
 
     return superuser
@@ -0,0 +1,286 @@
+import fcntl
+import json
+import logging
+import os
+import shutil
+import struct
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Record framing: payload length and CRC32, both big-endian uint32, then the payload
+_HEADER = struct.Struct(">II")
+_SEGMENT_SUFFIX = ".seg"
+_CHECKPOINT = "checkpoint"
+_LOCK = "lock"
+
+Position = Tuple[int, int]  # (segment sequence, byte offset)
+
+
+class SpillLog:
+    """
+    Local append-only log of length-prefixed records, split into numbered segment files.
+
+    `append` only writes into the open segment's buffer, so it costs microseconds and
+    never waits for the database or the disk. A background thread flushes and fsyncs the
+    segment every `fsync_interval` seconds (a crash loses at most that window). Segments
+    rotate at `segment_bytes`; a reader consumes records from the checkpoint with
+    `read_batch`, and `commit` persists the new checkpoint and deletes the segments it
+    has moved past. When the log would exceed `max_bytes` on disk, appends are dropped
+    and counted instead of filling the disk.
+
+    Each process owns one directory, guarded by an exclusive flock; directories whose
+    lock is free belong to dead processes and can be taken over with `adopt_orphans`.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int,
+        fsync_interval: float,
+        max_bytes: int,
+        writable: bool = True,
+    ):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.writable = writable
+
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = open(os.path.join(directory, _LOCK), "a+")
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._lock_file.close()
+            raise
+
+        self._lock = threading.Lock()
+        self._checkpoint: Position = self._load_checkpoint()
+        self._sizes: Dict[int, int] = {
+            seq: os.path.getsize(self._segment_path(seq)) for seq in self._list_segments()
+        }
+        self._active = None
+        self._active_seq = 0
+        self._dirty = False
+        self._closed = False
+        self._stop = threading.Event()
+        self._fsync_thread: Optional[threading.Thread] = None
+
+        # --- Counters ---
+        self._appended = 0
+        self._dropped = 0
+        self._corrupt = 0
+        self._fsyncs = 0
+        self._last_fsync_seconds = 0.0
+        self._max_fsync_seconds = 0.0
+
+        if writable:
+            self._open_segment(max([self._checkpoint[0], *self._sizes]) + 1)
+
+    # ---------------- FILES ---------------- #
+    def _segment_path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"{seq:012d}{_SEGMENT_SUFFIX}")
+
+    def _list_segments(self) -> List[int]:
+        return sorted(
+            int(name[:-len(_SEGMENT_SUFFIX)])
+            for name in os.listdir(self.directory)
+            if name.endswith(_SEGMENT_SUFFIX)
+        )
+
+    def _load_checkpoint(self) -> Position:
+        try:
+            with open(os.path.join(self.directory, _CHECKPOINT)) as f:
+                data = json.load(f)
+            return int(data["segment"]), int(data["offset"])
+        except FileNotFoundError:
+            return 0, 0
+
+    def _write_checkpoint(self, position: Position) -> None:
+        path = os.path.join(self.directory, _CHECKPOINT)
+        with open(path + ".tmp", "w") as f:
+            json.dump({"segment": position[0], "offset": position[1]}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+
+    def _open_segment(self, seq: int) -> None:
+        self._active = open(self._segment_path(seq), "ab")
+        self._active_seq = seq
+        self._sizes[seq] = self._active.tell()
+
+    def _rotate(self) -> None:
+        self._active.flush()
+        os.fsync(self._active.fileno())
+        self._active.close()
+        self._dirty = False
+        self._open_segment(self._active_seq + 1)
+
+    # ---------------- LIFECYCLE ---------------- #
+    def start(self) -> None:
+        if self.writable and (self._fsync_thread is None or not self._fsync_thread.is_alive()):
+            self._fsync_thread = threading.Thread(target=self._fsync_loop, name="spill-log-fsync", daemon=True)
+            self._fsync_thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._fsync_thread:
+            self._fsync_thread.join()
+            self._fsync_thread = None
+        with self._lock:
+            if self._active:
+                self._active.flush()
+                os.fsync(self._active.fileno())
+                self._active.close()
+                self._active = None
+            self._closed = True
+        fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+        self._lock_file.close()
+
+    def remove(self) -> None:
+        """Delete the directory of a fully replayed log (adopted orphans)."""
+        self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    @classmethod
+    def adopt_orphans(cls, root: str, exclude: Optional[str] = None, **kwargs) -> List["SpillLog"]:
+        """Read-only logs for every directory under `root` (but `exclude`) whose owning process is gone."""
+        orphans = []
+        if not os.path.isdir(root):
+            return orphans
+        for name in sorted(os.listdir(root)):
+            path = os.path.join(root, name)
+            if not os.path.isdir(path) or (exclude and os.path.samefile(path, exclude)):
+                continue
+            try:
+                orphans.append(cls(path, writable=False, **kwargs))
+            except BlockingIOError:
+                continue  # owned by a live process
+        return orphans
+
+    # ---------------- WRITER SIDE ---------------- #
+    def append(self, payload: bytes) -> bool:
+        """Append one record. Returns False if it was dropped (disk budget or closed log)."""
+        record = _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            if self._closed or sum(self._sizes.values()) + len(record) > self.max_bytes:
+                self._dropped += 1
+                return False
+            self._active.write(record)
+            self._sizes[self._active_seq] += len(record)
+            self._dirty = True
+            self._appended += 1
+            if self._sizes[self._active_seq] >= self.segment_bytes:
+                self._rotate()
+        return True
+
+    def flush(self) -> None:
+        """Hand buffered records to the OS so readers can see them (no fsync)."""
+        with self._lock:
+            if self._active and self._dirty:
+                self._active.flush()
+
+    def sync(self) -> None:
+        with self._lock:
+            if not self._active or not self._dirty:
+                return
+            self._active.flush()
+            self._dirty = False
+            # fsync a duplicate descriptor outside the lock, so appends never wait for the disk
+            fd = os.dup(self._active.fileno())
+        started = time.perf_counter()
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._fsyncs += 1
+            self._last_fsync_seconds = elapsed
+            self._max_fsync_seconds = max(self._max_fsync_seconds, elapsed)
+
+    def _fsync_loop(self) -> None:
+        while not self._stop.wait(self.fsync_interval):
+            try:
+                self.sync()
+            except OSError:
+                logger.exception("Spill log fsync failed")
+
+    # ---------------- READER SIDE ---------------- #
+    def read_batch(self, max_records: int) -> Tuple[List[bytes], Position]:
+        """Up to `max_records` records after the checkpoint, and the position after the last one."""
+        with self._lock:
+            segments = sorted(seq for seq in self._sizes if seq >= self._checkpoint[0])
+        seq, offset = self._checkpoint
+        records: List[bytes] = []
+        position = self._checkpoint
+
+        for i, current in enumerate(segments):
+            if current != seq:
+                offset = 0
+            is_last = i == len(segments) - 1
+            with open(self._segment_path(current), "rb") as f:
+                f.seek(offset)
+                while len(records) < max_records:
+                    header = f.read(_HEADER.size)
+                    if len(header) < _HEADER.size:
+                        break
+                    length, crc = _HEADER.unpack(header)
+                    payload = f.read(length)
+                    if len(payload) < length:
+                        break  # not fully written yet (or torn by a crash)
+                    if zlib.crc32(payload) != crc:
+                        if not is_last:
+                            self._corrupt += 1
+                            logger.warning("Corrupt record in %s at %d, skipping the rest of the segment",
+                                           self._segment_path(current), offset)
+                        break
+                    records.append(payload)
+                    offset = f.tell()
+            position = (current, offset)
+            if len(records) >= max_records or is_last:
+                break
+            # A sealed segment is done: continue with the next one from its start
+            position = (segments[i + 1], 0)
+        return records, position
+
+    def commit(self, position: Position) -> None:
+        """Persist the checkpoint and delete the segments entirely before it."""
+        self._write_checkpoint(position)
+        with self._lock:
+            self._checkpoint = position
+            finished = [seq for seq in self._sizes if seq < position[0] and seq != self._active_seq]
+            for seq in finished:
+                del self._sizes[seq]
+        for seq in finished:
+            try:
+                os.remove(self._segment_path(seq))
+            except FileNotFoundError:
+                pass
+
+    # ---------------- METRICS ---------------- #
+    def lag_bytes(self) -> int:
+        with self._lock:
+            seq, offset = self._checkpoint
+            return sum(size for s, size in self._sizes.items() if s >= seq) - min(offset, self._sizes.get(seq, 0))
+
+    def stats(self) -> Dict[str, object]:
+        lag = self.lag_bytes()
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "segments": len(self._sizes),
+                "disk_bytes": sum(self._sizes.values()),
+                "disk_budget_bytes": self.max_bytes,
+                "lag_bytes": lag,
+                "appended": self._appended,
+                "dropped": self._dropped,
+                "corrupt_records": self._corrupt,
+                "fsyncs": self._fsyncs,
+                "last_fsync_seconds": self._last_fsync_seconds,
+                "max_fsync_seconds": self._max_fsync_seconds,
+            }
@@ -0,0 +1,119 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+from uuid import UUID
+from app.config import settings
+from app.utils.principal import Principal
+
+
+class TokenCache:
+    """
+    Bounded LRU of verified access tokens.
+
+    Entries are keyed by the SHA-256 digest of the raw token (the token itself is never
+    stored) and live until the earlier of the token `exp` claim and `ttl` seconds after
+    insertion. A secondary index by user id lets services drop every cached token of a
+    user whose status, role or permissions just changed.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, Principal]]" = OrderedDict()
+        self._by_user: Dict[UUID, Set[bytes]] = {}
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Principal]:
+        key = self._digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires_at, principal = entry
+            if expires_at <= now:
+                self._remove(key, principal.id)
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return principal
+
+    def put(self, token: str, principal: Principal, token_exp: Optional[float]) -> None:
+        if self.max_entries <= 0:
+            return
+        key = self._digest(token)
+        # Tokens without an exp claim are cached for the TTL alone
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(token_exp, expires_at)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._entries[key] = (expires_at, principal)
+            self._by_user.setdefault(principal.id, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                old_key, (_, old_principal) = self._entries.popitem(last=False)
+                self._unindex(old_key, old_principal.id)
+                self._evictions += 1
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        with self._lock:
+            keys = self._by_user.pop(user_id, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            self._invalidations += len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def _remove(self, key: bytes, user_id: UUID) -> None:
+        self._entries.pop(key, None)
+        self._unindex(key, user_id)
+
+    def _unindex(self, key: bytes, user_id: UUID) -> None:
+        keys = self._by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[user_id]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+
+token_cache = TokenCache(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,68 @@
+"""
+Requests/sec of a running identity service at increasing client concurrency.
+
+Start the service (e.g. `uvicorn app:app --workers 1`), then from identity-service/:
+
+    pip install httpx
+    python -m benchmarks.bench_concurrency --url http://localhost:8000 \
+        --path /users/ --token "$ACCESS_TOKEN" --concurrency 1 10 100 --duration 10
+
+A single worker is the interesting case: with the async data path, throughput should
+keep rising with concurrency until the database, not the event loop, is the bottleneck.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+
+
+async def _run(url: str, headers: dict, concurrency: int, duration: float) -> dict:
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(headers=headers, limits=limits, timeout=30.0) as client:
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/users/")
+    parser.add_argument("--token", default=None)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    print(f"{'clients':>7} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for concurrency in args.concurrency:
+        r = asyncio.run(_run(args.url + args.path, headers, concurrency, args.duration))
+        print(f"{concurrency:>7} {r['requests']:>9} {r['errors']:>7} {r['rps']:>9.1f} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
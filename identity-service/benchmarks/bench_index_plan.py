@@ -0,0 +1,209 @@
+"""
+Query plans and insert throughput for the index plan, before and after a migration.
+
+Point DATABASE_URL at a scratch database, then from identity-service/:
+
+    alembic upgrade 0001
+    python -m benchmarks.bench_index_plan --seed --label before --out before.json
+    alembic upgrade 0002
+    python -m benchmarks.bench_index_plan --label after --out after.json
+
+Seeding uses generate_series server-side, so it works on either schema version. Each run
+records EXPLAIN (ANALYZE, BUFFERS) for the hot lookups and the rate of batched
+activity-log and session inserts, where every extra index is paid on each row.
+"""
+import argparse
+import asyncio
+import json
+import time
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.config import settings
+
+SEED_SQL = (
+    """
+    INSERT INTO users (id, date_created, date_updated, username, email, phone_number,
+                       hashed_password, is_verified, is_superuser, status)
+    SELECT gen_random_uuid(), now() - g * interval '1 minute', now(), 'bench_' || g,
+           'bench_' || g || '@example.com', '+1' || lpad(g::text, 10, '0'), 'x',
+           g % 2 = 0, false, 'ACTIVE'
+    FROM generate_series(1, :users) AS g
+    """,
+    """
+    INSERT INTO sessions (id, date_created, date_updated, user_id, refresh_token, user_agent,
+                          ip_address, is_valid, expires_at)
+    SELECT gen_random_uuid(), now(), now(), u.id, md5(u.id::text || g), 'bench',
+           '10.0.' || (g % 255) || '.' || (g % 253), g % 4 <> 0, now() + interval '7 days'
+    FROM (SELECT id FROM users WHERE username LIKE 'bench_%') AS u,
+         generate_series(1, :sessions_per_user) AS g
+    """,
+    """
+    INSERT INTO api_keys (id, date_created, date_updated, user_id, key_hash, secret, is_active)
+    SELECT gen_random_uuid(), now(), now(), u.id, md5('key' || u.id::text || g), md5(g::text),
+           g % 3 <> 0
+    FROM (SELECT id FROM users WHERE username LIKE 'bench_%') AS u,
+         generate_series(1, :keys_per_user) AS g
+    """,
+    """
+    INSERT INTO activity_logs (id, date_created, date_updated, user_id, activity_type,
+                               description, ip_address, user_agent, timestamp)
+    SELECT gen_random_uuid(), now(), now(), u.id,
+           (ARRAY['login_success', 'login_failed', 'get_user_success', 'list_users_success'])[1 + g % 4],
+           'bench', '10.0.0.' || (g % 255), 'bench', now() - g * interval '1 second'
+    FROM (SELECT id FROM users WHERE username LIKE 'bench_%') AS u,
+         generate_series(1, :logs_per_user) AS g
+    """,
+)
+
+# The query shapes the services actually run (see session, api key, activity log and user services)
+QUERIES = {
+    "session_lookup": (
+        "SELECT * FROM sessions WHERE refresh_token = :refresh_token AND user_id = :user_id "
+        "AND is_valid = true LIMIT 1"
+    ),
+    "active_api_key_by_hash": "SELECT * FROM api_keys WHERE key_hash = :key_hash AND is_active = true",
+    "api_keys_for_user_page": (
+        "SELECT * FROM api_keys WHERE user_id = :user_id ORDER BY date_created DESC, id DESC LIMIT 101"
+    ),
+    "activity_for_user_page": (
+        "SELECT * FROM activity_logs WHERE user_id = :user_id ORDER BY timestamp DESC, id DESC LIMIT 101"
+    ),
+    "activity_for_user_range": (
+        "SELECT * FROM activity_logs WHERE user_id = :user_id "
+        "AND timestamp >= now() - interval '1 hour' ORDER BY timestamp DESC"
+    ),
+    "activity_by_type_page": (
+        "SELECT * FROM activity_logs WHERE activity_type = 'login_failed' "
+        "ORDER BY timestamp DESC, id DESC LIMIT 101"
+    ),
+    "users_page": (
+        "SELECT * FROM users WHERE is_superuser = false ORDER BY date_created DESC, id DESC LIMIT 101"
+    ),
+}
+
+INSERT_LOGS_SQL = """
+    INSERT INTO activity_logs (id, date_created, date_updated, user_id, activity_type,
+                               description, ip_address, user_agent, timestamp)
+    SELECT gen_random_uuid(), now(), now(), :user_id, 'bench_insert', 'bench',
+           '10.1.0.' || (g % 255), 'bench', now()
+    FROM generate_series(1, :batch) AS g
+"""
+
+INSERT_SESSIONS_SQL = """
+    INSERT INTO sessions (id, date_created, date_updated, user_id, refresh_token, user_agent,
+                          ip_address, is_valid, expires_at)
+    SELECT gen_random_uuid(), now(), now(), :user_id, md5(random()::text || g), 'bench',
+           '10.1.0.' || (g % 255), true, now() + interval '7 days'
+    FROM generate_series(1, :batch) AS g
+"""
+
+
+async def _seed(conn, args) -> None:
+    params = {
+        "users": args.users,
+        "sessions_per_user": args.sessions_per_user,
+        "keys_per_user": args.keys_per_user,
+        "logs_per_user": args.logs_per_user,
+    }
+    for sql in SEED_SQL:
+        started = time.perf_counter()
+        await conn.execute(text(sql), params)
+        print(f"seeded {sql.split()[2]:<14} in {time.perf_counter() - started:6.1f}s")
+    for table in ("users", "sessions", "api_keys", "activity_logs"):
+        await conn.execute(text(f"ANALYZE {table}"))
+
+
+async def _sample_params(conn) -> dict:
+    row = (await conn.execute(text(
+        "SELECT s.user_id, s.refresh_token, k.key_hash FROM sessions s "
+        "JOIN api_keys k ON k.user_id = s.user_id AND k.is_active "
+        "WHERE s.is_valid ORDER BY s.user_id LIMIT 1 OFFSET (SELECT count(*) / 2 FROM users)"
+    ))).one()
+    return {"user_id": row.user_id, "refresh_token": row.refresh_token, "key_hash": row.key_hash}
+
+
+async def _explain(conn, sql: str, params: dict) -> dict:
+    bound = {key: value for key, value in params.items() if f":{key}" in sql}
+    result = await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), bound)
+    plan = result.scalar_one()[0]
+    return {
+        "execution_ms": plan["Execution Time"],
+        "planning_ms": plan["Planning Time"],
+        "plan": plan["Plan"],
+    }
+
+
+def _node_types(plan: dict) -> list[str]:
+    label = plan["Node Type"]
+    if "Index Name" in plan:
+        label += f" ({plan['Index Name']})"
+    return [label] + [node for child in plan.get("Plans", []) for node in _node_types(child)]
+
+
+async def _insert_rate(conn, sql: str, user_id, batch: int, batches: int) -> float:
+    started = time.perf_counter()
+    for _ in range(batches):
+        await conn.execute(text(sql), {"user_id": user_id, "batch": batch})
+    elapsed = time.perf_counter() - started
+    return batch * batches / elapsed
+
+
+async def _run(args) -> dict:
+    engine = create_async_engine(args.url)
+    report = {"label": args.label, "plans": {}, "inserts_per_second": {}}
+    try:
+        async with engine.begin() as conn:
+            if args.seed:
+                await _seed(conn, args)
+
+        async with engine.connect() as conn:
+            params = await _sample_params(conn)
+            for name, sql in QUERIES.items():
+                runs = [await _explain(conn, sql, params) for _ in range(args.repeat)]
+                best = min(runs, key=lambda run: run["execution_ms"])
+                best["nodes"] = _node_types(best["plan"])
+                report["plans"][name] = best
+
+            # Measured inside a transaction that is rolled back, so repeated runs see the same data
+            trans = await conn.begin()
+            for name, sql in (("activity_logs", INSERT_LOGS_SQL), ("sessions", INSERT_SESSIONS_SQL)):
+                report["inserts_per_second"][name] = await _insert_rate(
+                    conn, sql, params["user_id"], args.batch, args.batches
+                )
+            await trans.rollback()
+    finally:
+        await engine.dispose()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=settings.DATABASE_URL)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--seed", action="store_true", help="insert benchmark data first")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--sessions-per-user", type=int, default=5)
+    parser.add_argument("--keys-per-user", type=int, default=2)
+    parser.add_argument("--logs-per-user", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3, help="EXPLAIN ANALYZE runs per query, best kept")
+    parser.add_argument("--batch", type=int, default=500, help="rows per insert, as the log writer batches")
+    parser.add_argument("--batches", type=int, default=40)
+    parser.add_argument("--out", default=None, help="write the full report (with plans) as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(_run(args))
+
+    print(f"\n[{report['label']}]")
+    print(f"{'query':<26} {'exec ms':>9}  plan")
+    for name, result in report["plans"].items():
+        print(f"{name:<26} {result['execution_ms']:>9.3f}  {' > '.join(result['nodes'])}")
+    for table, rate in report["inserts_per_second"].items():
+        print(f"insert {table:<19} {rate:>9.0f} rows/s")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
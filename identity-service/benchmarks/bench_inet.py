@@ -0,0 +1,150 @@
+"""
+Subnet searches over activity logs and sessions, with IPs stored as strings vs INET.
+
+Point DATABASE_URL at a scratch database, then from identity-service/:
+
+    alembic upgrade 0007
+    python -m benchmarks.bench_inet --seed --label strings --out strings.json
+    alembic upgrade 0008
+    python -m benchmarks.bench_inet --label inet --out inet.json
+
+The defaults seed a realistic investigation target: 5M activity logs over 30 days and
+500k sessions, drawn from 50k distinct client addresses spread over 64 /16 networks.
+The queries cast with `::inet`, which is a no-op on INET columns (so the GiST indexes
+apply) and a per-row conversion on the string columns (so the "before" plans show
+what a subnet search cost there: a full scan).
+"""
+import argparse
+import asyncio
+import json
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.config import settings
+from benchmarks.bench_index_plan import _explain, _node_types
+
+
+def _address(n: str) -> str:
+    """SQL for the n-th client address: 10.<n % 64>.<n / 64 % 256>.<n / 16384 % 256 + 1>."""
+    return f"'10.' || ({n} % 64) || '.' || ({n} / 64 % 256) || '.' || ({n} / 16384 % 256 + 1)"
+
+
+SEED_SQL = (
+    """
+    INSERT INTO users (id, date_created, date_updated, username, email, phone_number,
+                       hashed_password, is_verified, is_superuser, status)
+    SELECT gen_random_uuid(), now(), now(), 'bench_inet_' || g, 'bench_inet_' || g || '@example.com',
+           '+2' || lpad(g::text, 10, '0'), 'x', true, false, 'ACTIVE'
+    FROM generate_series(1, :users) AS g
+    """,
+    f"""
+    INSERT INTO ip_addresses (hash, value)
+    SELECT sha256(convert_to(a, 'UTF8')), a FROM (SELECT {_address('g')} AS a FROM generate_series(0, :addresses - 1) AS g) AS s
+    ON CONFLICT (hash) DO NOTHING
+    """,
+    """
+    INSERT INTO activity_logs (id, date_created, date_updated, user_id, activity_type, description,
+                               ip_address_id, timestamp)
+    SELECT gen_random_uuid(), now(), now(), u.id,
+           (ARRAY['login', 'login_failed', 'get_user_success', 'session_create_success'])[1 + g % 4],
+           'bench', ips.id, now() - (g * 7 % 2592000) * interval '1 second'
+    FROM generate_series(1, :logs) AS g
+    JOIN (SELECT id, row_number() OVER (ORDER BY id) - 1 AS n FROM users WHERE username LIKE 'bench_inet_%') AS u
+        ON u.n = g % :users
+    JOIN (SELECT id, row_number() OVER (ORDER BY id) - 1 AS n FROM ip_addresses) AS ips
+        ON ips.n = g * 31 % :addresses
+    """,
+    f"""
+    INSERT INTO sessions (id, date_created, date_updated, user_id, refresh_token, user_agent,
+                          ip_address, is_valid, expires_at)
+    SELECT gen_random_uuid(), now() - (g % 604800) * interval '1 second', now(), u.id,
+           md5('bench_inet' || g), 'bench', {_address('(g * 31 % :addresses)')},
+           g % 4 <> 0, now() + (g % 14 - 7) * interval '1 day'
+    FROM generate_series(1, :sessions) AS g
+    JOIN (SELECT id, row_number() OVER (ORDER BY id) - 1 AS n FROM users WHERE username LIKE 'bench_inet_%') AS u
+        ON u.n = g % :users
+    """,
+)
+
+# The shapes activity_log_service.list_activity_logs(network=...) and
+# SessionService.list_active_sessions run, for a /16 (1/64 of the traffic) and a /24
+QUERIES = {
+    "activity_by_16_last_week": (
+        "SELECT * FROM activity_logs WHERE ip_address_id IN "
+        "(SELECT id FROM ip_addresses WHERE value::inet <<= '10.20.0.0/16') "
+        "AND timestamp >= now() - interval '7 days' ORDER BY timestamp DESC, id DESC LIMIT 101"
+    ),
+    "activity_count_by_16_last_week": (
+        "SELECT count(*) FROM activity_logs WHERE ip_address_id IN "
+        "(SELECT id FROM ip_addresses WHERE value::inet <<= '10.20.0.0/16') "
+        "AND timestamp >= now() - interval '7 days'"
+    ),
+    "activity_by_24": (
+        "SELECT * FROM activity_logs WHERE ip_address_id IN "
+        "(SELECT id FROM ip_addresses WHERE value::inet <<= '10.20.3.0/24') "
+        "ORDER BY timestamp DESC, id DESC LIMIT 101"
+    ),
+    "active_sessions_by_16": (
+        "SELECT * FROM sessions WHERE ip_address::inet <<= '10.20.0.0/16' AND is_valid AND expires_at > now() "
+        "ORDER BY date_created DESC, id DESC LIMIT 101"
+    ),
+    "active_sessions_by_24": (
+        "SELECT * FROM sessions WHERE ip_address::inet <<= '10.20.3.0/24' AND is_valid AND expires_at > now() "
+        "ORDER BY date_created DESC, id DESC LIMIT 101"
+    ),
+}
+
+
+async def _seed(conn, args) -> None:
+    params = {"users": args.users, "addresses": args.addresses, "logs": args.logs, "sessions": args.sessions}
+    for sql in SEED_SQL:
+        bound = {key: value for key, value in params.items() if f":{key}" in sql}
+        await conn.execute(text(sql), bound)
+    for table in ("users", "ip_addresses", "activity_logs", "sessions"):
+        await conn.execute(text(f"ANALYZE {table}"))
+
+
+async def _run(args) -> dict:
+    engine = create_async_engine(args.url)
+    report = {"label": args.label, "plans": {}}
+    try:
+        if args.seed:
+            async with engine.begin() as conn:
+                await _seed(conn, args)
+        async with engine.connect() as conn:
+            for name, sql in QUERIES.items():
+                runs = [await _explain(conn, sql, {}) for _ in range(args.repeat)]
+                best = min(runs, key=lambda run: run["execution_ms"])
+                best["nodes"] = _node_types(best["plan"])
+                report["plans"][name] = best
+    finally:
+        await engine.dispose()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=settings.DATABASE_URL)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--seed", action="store_true", help="insert benchmark data first (at revision 0007)")
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--addresses", type=int, default=50_000)
+    parser.add_argument("--logs", type=int, default=5_000_000)
+    parser.add_argument("--sessions", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=3, help="EXPLAIN ANALYZE runs per query, best kept")
+    parser.add_argument("--out", default=None, help="write the full report (with plans) as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(_run(args))
+
+    print(f"\n[{report['label']}]")
+    print(f"{'query':<32} {'exec ms':>9}  plan")
+    for name, result in report["plans"].items():
+        print(f"{name:<32} {result['execution_ms']:>9.3f}  {' > '.join(result['nodes'])}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
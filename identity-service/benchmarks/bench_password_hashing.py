@@ -0,0 +1,63 @@
+"""
+Login throughput with bcrypt inline on the event loop vs. on the hashing process pool.
+
+Run from identity-service/ with the usual environment (DATABASE_URL must be set because
+importing `app` builds the settings and the engine; no database connection is made):
+
+    python -m benchmarks.bench_password_hashing --concurrency 1 8 32 --duration 5
+"""
+import argparse
+import asyncio
+import os
+import time
+from app.utils.password_hasher import PasswordHasher, pwd_context
+
+PASSWORD = "CorrectHorseBatteryStaple1!"
+
+
+async def _run_clients(verify, concurrency: int, duration: float) -> int:
+    hashed = pwd_context.hash(PASSWORD)
+    deadline = time.perf_counter() + duration
+    done = 0
+
+    async def client():
+        nonlocal done
+        while time.perf_counter() < deadline:
+            assert await verify(PASSWORD, hashed)
+            done += 1
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return done
+
+
+async def _inline_verify(password: str, hashed: str) -> bool:
+    # What an async handler does today: bcrypt runs on the event loop thread
+    return pwd_context.verify(password, hashed)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    hasher = PasswordHasher(workers=args.workers, max_pending=10_000)
+    hasher.start()
+    try:
+        print(f"{'mode':<8} {'clients':>7} {'logins/s':>10} {'cores':>6} {'logins/s/core':>14}")
+        for concurrency in args.concurrency:
+            for mode, verify, cores in (
+                ("inline", _inline_verify, 1),
+                ("pool", hasher.verify, hasher.workers),
+            ):
+                count = asyncio.run(_run_clients(verify, concurrency, args.duration))
+                rate = count / args.duration
+                print(f"{mode:<8} {concurrency:>7} {rate:>10.1f} {cores:>6} {rate / cores:>14.1f}")
+        print(hasher.stats())
+    finally:
+        hasher.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+RestrictionService.enforce: the compiled decision table vs. the previous if/elif chains.
+
+Run from identity-service/ with the usual environment (DATABASE_URL must be set because
+importing `app` builds the settings and the engine; no database connection is made):
+
+    python -m benchmarks.bench_restrictions --calls 1000000
+
+Before timing anything it checks that both implementations reach the same decision
+(allowed, or the same status code and detail) for every actor role, target role,
+action (plus one unknown action) and self/other combination, and exits non-zero if not.
+"""
+import argparse
+import itertools
+import sys
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+from fastapi import HTTPException
+from app.models.staff_model import StaffRole
+from app.services.restriction_service import ACTIONS, RestrictionService
+from tests.legacy_restrictions import LegacyRestrictionService
+
+
+def _decision(enforce, actor, target, action):
+    try:
+        enforce(actor, target, action)
+    except HTTPException as exc:
+        return exc.status_code, exc.detail
+    return None
+
+
+def _cases():
+    for actor_role, target_role, action, is_self in itertools.product(
+        StaffRole, StaffRole, ACTIONS + ("unlisted_action",), (False, True)
+    ):
+        actor = SimpleNamespace(id=uuid4(), role=actor_role)
+        target = SimpleNamespace(id=actor.id if is_self else uuid4(), role=target_role)
+        yield actor, target, action
+
+
+def _check_equivalence() -> int:
+    mismatches = 0
+    cases = list(_cases())
+    for actor, target, action in cases:
+        expected = _decision(LegacyRestrictionService.enforce, actor, target, action)
+        actual = _decision(RestrictionService.enforce, actor, target, action)
+        if expected != actual:
+            mismatches += 1
+            print(f"MISMATCH actor={actor.role.value} target={target.role.value} action={action} "
+                  f"self={actor.id == target.id}: legacy={expected} compiled={actual}")
+    print(f"equivalence: {len(cases) - mismatches}/{len(cases)} cases agree")
+    return mismatches
+
+
+def _time(enforce, cases, calls: int) -> float:
+    rounds = max(1, calls // len(cases))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for actor, target, action in cases:
+            try:
+                enforce(actor, target, action)
+            except HTTPException:
+                pass
+    return (time.perf_counter() - start) / (rounds * len(cases)) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=1_000_000, help="enforce calls per implementation and mix")
+    args = parser.parse_args()
+
+    if _check_equivalence():
+        sys.exit(1)
+
+    cases = list(_cases())
+    mixes = {
+        # What staff get/update/delete and log_activity mostly see: targets with no restrictions
+        "unrestricted": [case for case in cases if case[1].role not in (StaffRole.SUPERUSER, StaffRole.ADMIN)],
+        "all": cases,
+    }
+    print(f"\n{'mix':<14} {'legacy ns/call':>15} {'compiled ns/call':>17}")
+    for name, mix in mixes.items():
+        legacy = _time(LegacyRestrictionService.enforce, mix, args.calls)
+        compiled = _time(RestrictionService.enforce, mix, args.calls)
+        print(f"{name:<14} {legacy:>15.1f} {compiled:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
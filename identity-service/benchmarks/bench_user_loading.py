@@ -0,0 +1,205 @@
+"""
+Rows transferred and per-request memory of User loading, eager KYC join vs per-use-case loading.
+
+Point DATABASE_URL at a scratch database migrated to head, then from identity-service/:
+
+    python -m benchmarks.bench_user_loading --seed --users 2000 --kyc-per-user 5
+
+"before" reproduces the old mapping (KYC history joined into every User load, no deferred
+columns, latest KYC sorted in Python); "after" runs the queries the services now issue.
+Every SQL statement a scenario emits is captured and replayed to count the rows and the
+approximate bytes the database sends back; peak Python memory comes from tracemalloc.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import joinedload, selectinload, undefer
+from app.config import settings
+from app.models.kyc_model import KYCVerification
+from app.models.staff_model import Staff
+from app.models.user_model import User
+
+SEED_SQL = (
+    """
+    INSERT INTO users (id, date_created, date_updated, username, email, phone_number,
+                       hashed_password, is_verified, is_superuser, status, twofa_secret)
+    SELECT gen_random_uuid(), now() - g * interval '1 minute', now(), 'kycbench_' || g,
+           'kycbench_' || g || '@example.com', '+2' || lpad(g::text, 10, '0'),
+           repeat('h', 60), true, false, 'ACTIVE', repeat('s', 32)
+    FROM generate_series(1, :users) AS g
+    """,
+    """
+    INSERT INTO kyc_verifications (id, date_created, date_updated, user_id, full_name, nationality,
+                                   address_line1, city, country, document_type, document_number,
+                                   document_image_url, selfie_image_url, kyc_notes, status)
+    SELECT gen_random_uuid(), now() - g * interval '1 day', now(), u.id, 'Bench User', 'Nowhere',
+           '1 Bench Street', 'Bench City', 'Benchland', 'passport', md5(u.id::text || g),
+           'https://example.com/doc/' || g, 'https://example.com/selfie/' || g,
+           repeat('n', :notes_size), 'PENDING'
+    FROM (SELECT id FROM users WHERE username LIKE 'kycbench_%') AS u,
+         generate_series(1, :kyc_per_user) AS g
+    """,
+)
+
+# The old mapping: lazy="joined" history and every column loaded
+EAGER = (
+    joinedload(User.kyc_verifications).undefer(KYCVerification.kyc_notes),
+    undefer(User.hashed_password),
+    undefer(User.twofa_secret),
+)
+
+
+async def auth_before(session: AsyncSession, user_id):
+    result = await session.execute(
+        select(User)
+        .options(*EAGER, joinedload(User.staff_profile).selectinload(Staff.permissions))
+        .where(User.id == user_id)
+    )
+    return result.unique().scalar_one()
+
+
+async def auth_after(session: AsyncSession, user_id):
+    result = await session.execute(
+        select(User)
+        .options(joinedload(User.staff_profile).selectinload(Staff.permissions))
+        .where(User.id == user_id)
+    )
+    return result.scalar_one()
+
+
+def _users_page():
+    return (
+        select(User)
+        .where(User.is_superuser == False)
+        .order_by(User.date_created.desc(), User.id.desc())
+        .limit(101)
+    )
+
+
+async def list_before(session: AsyncSession, user_id):
+    result = await session.execute(_users_page().options(*EAGER))
+    return result.unique().scalars().all()
+
+
+async def list_after(session: AsyncSession, user_id):
+    result = await session.execute(_users_page())
+    return result.scalars().all()
+
+
+async def latest_kyc_before(session: AsyncSession, user_id):
+    result = await session.execute(select(User).options(*EAGER).where(User.id == user_id))
+    user = result.unique().scalar_one()
+    return sorted(user.kyc_verifications, key=lambda k: k.date_created)[-1]
+
+
+async def latest_kyc_after(session: AsyncSession, user_id):
+    result = await session.execute(
+        select(KYCVerification)
+        .where(KYCVerification.user_id == user_id)
+        .order_by(KYCVerification.date_created.desc())
+        .limit(1)
+    )
+    return result.scalar_one()
+
+
+async def history_after(session: AsyncSession, user_id):
+    result = await session.execute(
+        select(User).options(selectinload(User.kyc_verifications)).where(User.id == user_id)
+    )
+    return result.scalar_one().kyc_verifications
+
+
+SCENARIOS = {
+    "get_current_user": (auth_before, auth_after),
+    "list_users": (list_before, list_after),
+    "latest_kyc": (latest_kyc_before, latest_kyc_after),
+    "kyc_history": (latest_kyc_before, history_after),
+}
+
+
+async def _transferred(engine, statements) -> tuple[int, int]:
+    """Replay captured statements and count the rows (and approximate bytes) they return."""
+    rows = size = 0
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            for row in (await conn.exec_driver_sql(statement, parameters)).all():
+                rows += 1
+                size += sum(len(str(value)) for value in row if value is not None)
+    return rows, size
+
+
+async def _measure(engine, scenario, user_id, repeat: int) -> dict:
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    timings, peaks = [], []
+    for i in range(repeat):
+        if i == 0:
+            event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        tracemalloc.start()
+        started = time.perf_counter()
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            await scenario(session, user_id)
+        timings.append(time.perf_counter() - started)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        if i == 0:
+            event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    rows, size = await _transferred(engine, statements)
+    return {
+        "queries": len(statements),
+        "rows": rows,
+        "kb": size / 1024,
+        "peak_kb": statistics.median(peaks) / 1024,
+        "ms": statistics.median(timings) * 1000,
+    }
+
+
+async def _run(args) -> None:
+    engine = create_async_engine(args.url)
+    try:
+        if args.seed:
+            async with engine.begin() as conn:
+                for sql in SEED_SQL:
+                    await conn.execute(text(sql), {
+                        "users": args.users, "kyc_per_user": args.kyc_per_user, "notes_size": args.notes_size,
+                    })
+                await conn.execute(text("ANALYZE users"))
+                await conn.execute(text("ANALYZE kyc_verifications"))
+
+        async with engine.connect() as conn:
+            user_id = (await conn.execute(text(
+                "SELECT user_id FROM kyc_verifications GROUP BY user_id ORDER BY count(*) DESC LIMIT 1"
+            ))).scalar_one()
+
+        print(f"{'scenario':<18} {'':<7} {'queries':>7} {'rows':>7} {'KB sent':>9} {'peak KB':>9} {'ms':>8}")
+        for name, (before, after) in SCENARIOS.items():
+            for label, scenario in (("before", before), ("after", after)):
+                r = await _measure(engine, scenario, user_id, args.repeat)
+                print(f"{name:<18} {label:<7} {r['queries']:>7} {r['rows']:>7} {r['kb']:>9.1f} "
+                      f"{r['peak_kb']:>9.1f} {r['ms']:>8.2f}")
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=settings.DATABASE_URL)
+    parser.add_argument("--seed", action="store_true", help="insert benchmark users and KYC history first")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--kyc-per-user", type=int, default=5)
+    parser.add_argument("--notes-size", type=int, default=2000, help="bytes of kyc_notes per record")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+USER_STATUS = postgresql.ENUM("ACTIVE", "INACTIVE", "SUSPENDED", "PENDING_KYC", "KYC_REJECTED", name="userstatus")
+STAFF_ROLE = postgresql.ENUM("SUPERUSER", "ADMIN", "SUPPORT", "COMPLIANCE", "MANAGER", "GENERAL", name="staffrole")
+DEPARTMENT = postgresql.ENUM(
+    "SUPERUSER", "FINANCE", "MARKETING", "SUPPORT", "COMPLIANCE", "MANAGEMENT", "GENERAL", name="department"
+)
+KYC_STATUS = postgresql.ENUM("PENDING", "APPROVED", "REJECTED", name="kycstatus")
+
+
+def _base_columns():
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, unique=True, nullable=False),
+        sa.Column("date_created", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("date_updated", sa.DateTime(timezone=True), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    # --- users ---
+    op.create_table(
+        "users",
+        *_base_columns(),
+        sa.Column("username", sa.String(50), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("phone_number", sa.String(20), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("is_verified", sa.Boolean(), nullable=True),
+        sa.Column("is_superuser", sa.Boolean(), nullable=False),
+        sa.Column("status", USER_STATUS, nullable=True),
+        sa.Column("twofa_secret", sa.String(64), nullable=True),
+    )
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_phone_number", "users", ["phone_number"])
+    op.create_index("ix_users_is_verified", "users", ["is_verified"])
+    op.create_index("ix_users_is_superuser", "users", ["is_superuser"])
+    op.create_index("ix_users_status", "users", ["status"])
+    op.create_index(
+        "unique_superuser", "users", ["is_superuser"], unique=True,
+        postgresql_where=sa.text("is_superuser IS true"),
+    )
+    op.create_index("ix_users_date_created_id", "users", ["date_created", "id"])
+
+    # --- permissions ---
+    op.create_table(
+        "permissions",
+        *_base_columns(),
+        sa.Column("name", sa.String(100), nullable=False),
+    )
+    op.create_index("ix_permissions_name", "permissions", ["name"], unique=True)
+
+    # --- staffs ---
+    op.create_table(
+        "staffs",
+        *_base_columns(),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("department", DEPARTMENT, nullable=False),
+        sa.Column("role", STAFF_ROLE, nullable=False),
+    )
+    op.create_index("ix_staffs_user_id", "staffs", ["user_id"])
+    op.create_index("ix_staffs_department", "staffs", ["department"])
+    op.create_index("ix_staffs_role", "staffs", ["role"])
+    op.create_index(
+        "uq_staff_superuser_role", "staffs", ["role"], unique=True,
+        postgresql_where=sa.text("role = 'SUPERUSER'"),
+    )
+    op.create_index(
+        "uq_staff_superuser_department", "staffs", ["department"], unique=True,
+        postgresql_where=sa.text("department = 'SUPERUSER'"),
+    )
+    op.create_index("ix_staffs_date_created_id", "staffs", ["date_created", "id"])
+
+    op.create_table(
+        "staff_permissions",
+        sa.Column("staff_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("staffs.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("permission_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("permissions.id", ondelete="CASCADE"), primary_key=True),
+    )
+    op.create_index("ix_staff_permissions_staff_id", "staff_permissions", ["staff_id"])
+    op.create_index("ix_staff_permissions_permission_id", "staff_permissions", ["permission_id"])
+
+    # --- sessions ---
+    op.create_table(
+        "sessions",
+        *_base_columns(),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("refresh_token", sa.String(255), nullable=False),
+        sa.Column("user_agent", sa.String(255), nullable=True),
+        sa.Column("ip_address", sa.String(45), nullable=True),
+        sa.Column("is_valid", sa.Boolean(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_sessions_user_id", "sessions", ["user_id"])
+    op.create_index("ix_sessions_refresh_token", "sessions", ["refresh_token"], unique=True)
+    op.create_index("ix_sessions_ip_address", "sessions", ["ip_address"])
+    op.create_index("ix_sessions_is_valid", "sessions", ["is_valid"])
+    op.create_index("ix_sessions_expires_at", "sessions", ["expires_at"])
+
+    # --- api_keys ---
+    op.create_table(
+        "api_keys",
+        *_base_columns(),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("key_hash", sa.String(255), nullable=False),
+        sa.Column("secret", sa.String(128), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_api_keys_user_id", "api_keys", ["user_id"])
+    op.create_index("ix_api_keys_key_hash", "api_keys", ["key_hash"])
+    op.create_index("ix_api_keys_secret", "api_keys", ["secret"])
+    op.create_index("ix_api_keys_is_active", "api_keys", ["is_active"])
+    op.create_index("ix_api_keys_expires_at", "api_keys", ["expires_at"])
+    op.create_index("ix_api_keys_date_created_id", "api_keys", ["date_created", "id"])
+    op.create_index("ix_api_keys_user_id_date_created_id", "api_keys", ["user_id", "date_created", "id"])
+
+    op.create_table(
+        "api_key_permissions",
+        sa.Column("api_key_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("api_keys.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("permission_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("permissions.id", ondelete="CASCADE"), primary_key=True),
+    )
+    op.create_index("ix_api_key_permissions_api_key_id", "api_key_permissions", ["api_key_id"])
+    op.create_index("ix_api_key_permissions_permission_id", "api_key_permissions", ["permission_id"])
+
+    # --- kyc_verifications ---
+    op.create_table(
+        "kyc_verifications",
+        *_base_columns(),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("full_name", sa.String(255), nullable=True),
+        sa.Column("date_of_birth", sa.Date(), nullable=True),
+        sa.Column("nationality", sa.String(100), nullable=True),
+        sa.Column("address_line1", sa.String(255), nullable=True),
+        sa.Column("address_line2", sa.String(255), nullable=True),
+        sa.Column("city", sa.String(100), nullable=True),
+        sa.Column("state", sa.String(100), nullable=True),
+        sa.Column("postal_code", sa.String(20), nullable=True),
+        sa.Column("country", sa.String(100), nullable=True),
+        sa.Column("document_type", sa.String(50), nullable=True),
+        sa.Column("document_number", sa.String(100), nullable=True),
+        sa.Column("document_image_url", sa.String(500), nullable=True),
+        sa.Column("selfie_image_url", sa.String(500), nullable=True),
+        sa.Column("kyc_notes", sa.Text(), nullable=True),
+        sa.Column("status", KYC_STATUS, nullable=True),
+    )
+    op.create_index("ix_kyc_verifications_nationality", "kyc_verifications", ["nationality"])
+    op.create_index("ix_kyc_verifications_city", "kyc_verifications", ["city"])
+    op.create_index("ix_kyc_verifications_state", "kyc_verifications", ["state"])
+    op.create_index("ix_kyc_verifications_status", "kyc_verifications", ["status"])
+
+    # --- activity_logs ---
+    op.create_table(
+        "activity_logs",
+        *_base_columns(),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("activity_type", sa.String(100), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("ip_address", sa.String(45), nullable=True),
+        sa.Column("user_agent", sa.Text(), nullable=True),
+        sa.Column("timestamp", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_activity_logs_user_id", "activity_logs", ["user_id"])
+    op.create_index("ix_activity_logs_activity_type", "activity_logs", ["activity_type"])
+    op.create_index("ix_activity_logs_ip_address", "activity_logs", ["ip_address"])
+    op.create_index("ix_activity_logs_timestamp", "activity_logs", ["timestamp"])
+    op.create_index("ix_activity_logs_date_created_id", "activity_logs", ["date_created", "id"])
+    op.create_index("ix_activity_logs_user_id_date_created_id", "activity_logs", ["user_id", "date_created", "id"])
+
+
+def downgrade() -> None:
+    for table in (
+        "activity_logs",
+        "kyc_verifications",
+        "api_key_permissions",
+        "api_keys",
+        "sessions",
+        "staff_permissions",
+        "staffs",
+        "permissions",
+        "users",
+    ):
+        op.drop_table(table)
+    for enum in (KYC_STATUS, DEPARTMENT, STAFF_ROLE, USER_STATUS):
+        enum.drop(op.get_bind(), checkfirst=True)
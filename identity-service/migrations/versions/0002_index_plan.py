@@ -0,0 +1,133 @@
+"""index plan tuned to the query shapes
+
+Drops single-column indexes no query uses (booleans, enum columns, API key secret,
+activity IP), indexes that are a leading prefix of a composite or primary key, and the
+redundant UNIQUE(id) constraints next to every primary key. Adds composite and partial
+indexes for the hot lookups (refresh-token lookups are already served by the
+unique ix_sessions_refresh_token):
+
+- api_keys: (key_hash) WHERE is_active
+- activity_logs: (user_id, timestamp, id), (timestamp, id), (activity_type, timestamp)
+
+activity_logs.timestamp becomes timestamptz (the writer already sends aware UTC values)
+and NOT NULL, since it is now the activity-log sort and pagination key.
+
+Index builds and drops run CONCURRENTLY, and rows missing a timestamp are backfilled
+in committed batches of BACKFILL_BATCH_ROWS, so neither blocks writers for long. The
+column type change is NOT online: ALTER COLUMN ... TYPE rewrites activity_logs under
+an ACCESS EXCLUSIVE lock for the whole rewrite, so run this migration in a maintenance
+window (or with activity-log writes paused; the writer spills them to disk meanwhile).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_ROWS = 10000
+
+BASE_TABLES = ("users", "permissions", "staffs", "sessions", "api_keys", "kyc_verifications", "activity_logs")
+
+DROPPED_INDEXES = (
+    # (name, table, columns)
+    ("ix_users_is_verified", "users", ["is_verified"]),
+    ("ix_users_is_superuser", "users", ["is_superuser"]),  # covered by partial unique_superuser
+    ("ix_users_status", "users", ["status"]),
+    ("ix_staffs_department", "staffs", ["department"]),  # only queried for SUPERUSER, covered by uq_staff_superuser_*
+    ("ix_staffs_role", "staffs", ["role"]),
+    ("ix_staff_permissions_staff_id", "staff_permissions", ["staff_id"]),  # leading PK column
+    ("ix_api_key_permissions_api_key_id", "api_key_permissions", ["api_key_id"]),  # leading PK column
+    ("ix_sessions_ip_address", "sessions", ["ip_address"]),
+    ("ix_sessions_is_valid", "sessions", ["is_valid"]),
+    ("ix_sessions_expires_at", "sessions", ["expires_at"]),
+    ("ix_api_keys_user_id", "api_keys", ["user_id"]),  # prefix of ix_api_keys_user_id_date_created_id
+    ("ix_api_keys_key_hash", "api_keys", ["key_hash"]),  # replaced by the partial active-key index
+    ("ix_api_keys_secret", "api_keys", ["secret"]),
+    ("ix_api_keys_is_active", "api_keys", ["is_active"]),
+    ("ix_api_keys_expires_at", "api_keys", ["expires_at"]),
+    ("ix_kyc_verifications_nationality", "kyc_verifications", ["nationality"]),
+    ("ix_kyc_verifications_city", "kyc_verifications", ["city"]),
+    ("ix_kyc_verifications_state", "kyc_verifications", ["state"]),
+    ("ix_activity_logs_user_id", "activity_logs", ["user_id"]),
+    ("ix_activity_logs_activity_type", "activity_logs", ["activity_type"]),
+    ("ix_activity_logs_ip_address", "activity_logs", ["ip_address"]),
+    ("ix_activity_logs_timestamp", "activity_logs", ["timestamp"]),
+    ("ix_activity_logs_date_created_id", "activity_logs", ["date_created", "id"]),
+    ("ix_activity_logs_user_id_date_created_id", "activity_logs", ["user_id", "date_created", "id"]),
+)
+
+CREATED_INDEXES = (
+    # (name, table, columns, where)
+    ("ix_api_keys_active_key_hash", "api_keys", ["key_hash"], "is_active"),
+    ("ix_activity_logs_timestamp_id", "activity_logs", ["timestamp", "id"], None),
+    ("ix_activity_logs_user_id_timestamp_id", "activity_logs", ["user_id", "timestamp", "id"], None),
+    ("ix_activity_logs_activity_type_timestamp", "activity_logs", ["activity_type", "timestamp"], None),
+)
+
+
+def _create_indexes(indexes) -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in indexes:
+            op.create_index(
+                name, table, columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def _drop_indexes(indexes) -> None:
+    with op.get_context().autocommit_block():
+        for name, table, *_ in indexes:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def _backfill_timestamps() -> None:
+    # Before ix_activity_logs_timestamp is dropped: it finds the NULL rows of each batch
+    backfill = sa.text(
+        "UPDATE activity_logs SET timestamp = date_created AT TIME ZONE 'UTC' "
+        "WHERE id IN (SELECT id FROM activity_logs WHERE timestamp IS NULL LIMIT :batch)"
+    )
+    with op.get_context().autocommit_block():
+        while op.get_bind().execute(backfill, {"batch": BACKFILL_BATCH_ROWS}).rowcount:
+            pass
+
+
+def upgrade() -> None:
+    _backfill_timestamps()
+    _drop_indexes(DROPPED_INDEXES)
+
+    for table in BASE_TABLES:
+        op.drop_constraint(f"{table}_id_key", table, type_="unique")
+
+    # Table rewrite under ACCESS EXCLUSIVE, see the module docstring
+    op.alter_column(
+        "activity_logs", "timestamp",
+        type_=sa.DateTime(timezone=True),
+        postgresql_using="timestamp AT TIME ZONE 'UTC'",
+        nullable=False,
+    )
+
+    _create_indexes(CREATED_INDEXES)
+
+
+def downgrade() -> None:
+    _drop_indexes(CREATED_INDEXES)
+
+    op.alter_column(
+        "activity_logs", "timestamp",
+        type_=sa.DateTime(),
+        postgresql_using="timestamp AT TIME ZONE 'UTC'",
+        nullable=True,
+    )
+
+    for table in BASE_TABLES:
+        op.create_unique_constraint(f"{table}_id_key", table, ["id"])
+
+    _create_indexes([(name, table, columns, None) for name, table, columns in DROPPED_INDEXES])
@@ -0,0 +1,37 @@
+"""latest KYC index
+
+Backs KYCService.get_latest_kyc (newest record per user) with (user_id, date_created DESC),
+which also covers the kyc_verifications.user_id foreign key.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_kyc_verifications_user_id_date_created",
+            "kyc_verifications",
+            ["user_id", sa.text("date_created DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_kyc_verifications_user_id_date_created",
+            table_name="kyc_verifications",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
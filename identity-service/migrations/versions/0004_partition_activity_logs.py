@@ -0,0 +1,105 @@
+"""range-partition activity_logs on timestamp
+
+The existing table is renamed, a partitioned activity_logs (primary key (id, timestamp),
+as the partition key must be part of it) is created with partitions covering the stored
+rows plus ACTIVITY_LOG_PARTITIONS_AHEAD future periods and a default partition as a
+safety net, the rows are copied over and the old table is dropped.
+
+The copy holds an exclusive lock on activity_logs for its duration; stop the app (or
+let its log writer buffer) while this runs on a large table.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from datetime import datetime, timezone
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from app.config import settings
+from app.utils.activity_log_partitions import (
+    DEFAULT_PARTITION,
+    create_partition_sql,
+    partition_for,
+    partitions_between,
+)
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+COLUMNS = "id, date_created, date_updated, user_id, activity_type, description, ip_address, user_agent, timestamp"
+
+INDEXES = (
+    ("ix_activity_logs_timestamp_id", ["timestamp", "id"]),
+    ("ix_activity_logs_user_id_timestamp_id", ["user_id", "timestamp", "id"]),
+    ("ix_activity_logs_activity_type_timestamp", ["activity_type", "timestamp"]),
+)
+
+
+def _columns():
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("date_created", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("date_updated", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("activity_type", sa.String(100), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("ip_address", sa.String(45), nullable=True),
+        sa.Column("user_agent", sa.Text(), nullable=True),
+        sa.Column("timestamp", sa.DateTime(timezone=True), nullable=False),
+    ]
+
+
+def _set_aside(old_name: str) -> None:
+    """Rename the current table and its schema-wide names out of the way."""
+    op.rename_table("activity_logs", old_name)
+    op.execute(f"ALTER TABLE {old_name} RENAME CONSTRAINT activity_logs_pkey TO {old_name}_pkey")
+    op.execute(f"ALTER TABLE {old_name} RENAME CONSTRAINT activity_logs_user_id_fkey TO {old_name}_user_id_fkey")
+    for name, _ in INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS {name} RENAME TO {name.replace('activity_logs', old_name)}")
+
+
+def upgrade() -> None:
+    interval = settings.ACTIVITY_LOG_PARTITION_INTERVAL
+    _set_aside("activity_logs_unpartitioned")
+
+    op.create_table(
+        "activity_logs",
+        *_columns(),
+        sa.PrimaryKeyConstraint("id", "timestamp", name="activity_logs_pkey"),
+        postgresql_partition_by="RANGE (timestamp)",
+    )
+    for name, columns in INDEXES:
+        op.create_index(name, "activity_logs", columns)
+
+    bounds = op.get_bind().execute(
+        sa.text("SELECT min(timestamp), max(timestamp) FROM activity_logs_unpartitioned")
+    ).one()
+    now = datetime.now(timezone.utc)
+    partitions = partitions_between(interval, bounds[0] or now, max(bounds[1] or now, now))
+    for _ in range(settings.ACTIVITY_LOG_PARTITIONS_AHEAD):
+        partitions.append(partition_for(interval, partitions[-1].end))
+    for partition in partitions:
+        op.execute(create_partition_sql(partition))
+    op.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF activity_logs DEFAULT")
+
+    op.execute(f"INSERT INTO activity_logs ({COLUMNS}) SELECT {COLUMNS} FROM activity_logs_unpartitioned")
+    op.drop_table("activity_logs_unpartitioned")
+
+
+def downgrade() -> None:
+    _set_aside("activity_logs_partitioned")
+
+    op.create_table(
+        "activity_logs",
+        *_columns(),
+        sa.PrimaryKeyConstraint("id", name="activity_logs_pkey"),
+    )
+    op.execute(f"INSERT INTO activity_logs ({COLUMNS}) SELECT {COLUMNS} FROM activity_logs_partitioned")
+    for name, columns in INDEXES:
+        op.create_index(name, "activity_logs", columns)
+
+    # Drops the attached partitions with it; partitions detached by retention are left alone
+    op.execute("DROP TABLE activity_logs_partitioned CASCADE")
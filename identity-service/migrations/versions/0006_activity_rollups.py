@@ -0,0 +1,54 @@
+"""hourly activity rollups
+
+Rollup tables for /stats/activity (per activity type, per IP and per user, by hour) and
+the watermark the rollup job advances. user_id is deliberately not a foreign key: the
+rollups outlive both users and retired activity_logs partitions.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "activity_rollup_hourly",
+        sa.Column("hour", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("activity_type", sa.String(100), primary_key=True),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+    )
+    op.create_index(
+        "ix_activity_rollup_hourly_activity_type_hour", "activity_rollup_hourly", ["activity_type", "hour"]
+    )
+    op.create_table(
+        "activity_rollup_hourly_ip",
+        sa.Column("hour", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("activity_type", sa.String(100), primary_key=True),
+        sa.Column("ip_address", sa.String(45), primary_key=True),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+    )
+    op.create_table(
+        "activity_rollup_hourly_user",
+        sa.Column("hour", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("activity_type", sa.String(100), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+    )
+    op.create_table(
+        "activity_rollup_state",
+        sa.Column("name", sa.String(50), primary_key=True),
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    for table in ("activity_rollup_state", "activity_rollup_hourly_user", "activity_rollup_hourly_ip", "activity_rollup_hourly"):
+        op.drop_table(table)
@@ -0,0 +1,108 @@
+"""intern activity-log user agents and IP addresses
+
+Creates the user_agents and ip_addresses dimension tables (keyed by the SHA-256 of the
+value) and replaces activity_logs.user_agent / ip_address by integer foreign keys. The
+existing rows are backfilled in batches of BATCH_SIZE along (timestamp, id), each batch
+committed on its own so no long transaction or table-wide lock is held; the old columns
+are dropped afterwards.
+
+Run it with the app stopped (its log writer keeps spilling to disk meanwhile): rows
+written by the previous version during the backfill would otherwise keep only their
+strings. Partitions already detached by retention keep their original columns.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+import uuid
+from datetime import datetime, timezone
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 50000
+
+DIMENSIONS = (
+    # (dimension table, old activity_logs column, new activity_logs column, value type)
+    ("user_agents", "user_agent", "user_agent_id", sa.Text()),
+    ("ip_addresses", "ip_address", "ip_address_id", sa.String(45)),
+)
+
+# Rows in ((lo_ts, lo_id), (hi_ts, hi_id)]; the plain timestamp bounds let the planner prune partitions
+BATCH_RANGE = (
+    "timestamp >= :lo_ts AND timestamp <= :hi_ts "
+    "AND (timestamp, id) > (:lo_ts, :lo_id) AND (timestamp, id) <= (:hi_ts, :hi_id)"
+)
+
+
+def _next_bound(conn, lo_ts, lo_id):
+    """(timestamp, id) of the last row of the next batch, None when no rows are left."""
+    params = {"lo_ts": lo_ts, "lo_id": lo_id}
+    after = "(timestamp, id) > (:lo_ts, :lo_id)"
+    bound = conn.execute(
+        sa.text(f"SELECT timestamp, id FROM activity_logs WHERE {after} ORDER BY timestamp, id OFFSET :skip LIMIT 1"),
+        {**params, "skip": BATCH_SIZE - 1},
+    ).first()
+    if bound is None:
+        bound = conn.execute(
+            sa.text(f"SELECT timestamp, id FROM activity_logs WHERE {after} ORDER BY timestamp DESC, id DESC LIMIT 1"),
+            params,
+        ).first()
+    return bound
+
+
+def _backfill_batch(conn, params: dict) -> None:
+    for table, old_column, _, _ in DIMENSIONS:
+        conn.execute(sa.text(
+            f"INSERT INTO {table} (hash, value) "
+            f"SELECT DISTINCT sha256(convert_to({old_column}, 'UTF8')), {old_column} FROM activity_logs "
+            f"WHERE {BATCH_RANGE} AND {old_column} IS NOT NULL "
+            f"ON CONFLICT (hash) DO NOTHING"
+        ), params)
+    assignments = ", ".join(
+        f"{new_column} = (SELECT d.id FROM {table} AS d WHERE d.hash = sha256(convert_to({old_column}, 'UTF8')))"
+        for table, old_column, new_column, _ in DIMENSIONS
+    )
+    conn.execute(sa.text(f"UPDATE activity_logs SET {assignments} WHERE {BATCH_RANGE}"), params)
+
+
+def upgrade() -> None:
+    for table, _, new_column, value_type in DIMENSIONS:
+        op.create_table(
+            table,
+            sa.Column("id", sa.Integer(), sa.Identity(), primary_key=True),
+            sa.Column("hash", sa.LargeBinary(32), nullable=False, unique=True),
+            sa.Column("value", value_type, nullable=False),
+        )
+        op.add_column("activity_logs", sa.Column(new_column, sa.Integer(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        lo_ts, lo_id = datetime.min.replace(tzinfo=timezone.utc), uuid.UUID(int=0)
+        while True:
+            bound = _next_bound(conn, lo_ts, lo_id)
+            if bound is None:
+                break
+            _backfill_batch(conn, {"lo_ts": lo_ts, "lo_id": lo_id, "hi_ts": bound[0], "hi_id": bound[1]})
+            lo_ts, lo_id = bound
+
+    for table, old_column, new_column, _ in DIMENSIONS:
+        op.drop_column("activity_logs", old_column)
+        op.create_foreign_key(f"activity_logs_{new_column}_fkey", "activity_logs", table, [new_column], ["id"])
+    op.create_index("ix_activity_logs_ip_address_id_timestamp", "activity_logs", ["ip_address_id", "timestamp"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_activity_logs_ip_address_id_timestamp", table_name="activity_logs")
+    for table, old_column, new_column, value_type in DIMENSIONS:
+        op.add_column("activity_logs", sa.Column(old_column, value_type, nullable=True))
+        op.execute(
+            f"UPDATE activity_logs AS l SET {old_column} = d.value FROM {table} AS d WHERE d.id = l.{new_column}"
+        )
+        op.drop_constraint(f"activity_logs_{new_column}_fkey", "activity_logs", type_="foreignkey")
+        op.drop_column("activity_logs", new_column)
+        op.drop_table(table)
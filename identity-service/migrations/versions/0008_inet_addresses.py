@@ -0,0 +1,69 @@
+"""store IP addresses as INET with GiST indexes
+
+ip_addresses.value (the activity-log IP dimension) and sessions.ip_address become INET,
+each with a GiST inet_ops index, so subnet searches (ip <<= '10.20.0.0/16') are index
+scans. Values that are not IP addresses (test clients, proxies passing hostnames) cannot
+be stored as INET: such sessions lose their ip_address and such dimension rows are
+deleted, with the activity logs that referenced them keeping a NULL ip_address_id.
+
+Converting sessions rewrites the table under an exclusive lock.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+# NULL instead of an error for values that are not IP addresses
+SAFE_INET = """
+CREATE FUNCTION pg_temp.safe_inet(value text) RETURNS inet AS $$
+BEGIN
+    RETURN value::inet;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql IMMUTABLE
+"""
+
+
+def upgrade() -> None:
+    op.execute(SAFE_INET)
+
+    invalid = "SELECT id FROM ip_addresses WHERE pg_temp.safe_inet(value) IS NULL"
+    op.execute(f"UPDATE activity_logs SET ip_address_id = NULL WHERE ip_address_id IN ({invalid})")
+    op.execute(f"DELETE FROM ip_addresses WHERE id IN ({invalid})")
+    op.alter_column(
+        "ip_addresses", "value", type_=postgresql.INET(), existing_nullable=False, postgresql_using="value::inet"
+    )
+    op.create_index(
+        "ix_ip_addresses_value", "ip_addresses", ["value"],
+        postgresql_using="gist", postgresql_ops={"value": "inet_ops"},
+    )
+
+    op.alter_column(
+        "sessions", "ip_address", type_=postgresql.INET(), existing_nullable=True,
+        postgresql_using="pg_temp.safe_inet(ip_address)",
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_sessions_ip_address", "sessions", ["ip_address"],
+            postgresql_using="gist", postgresql_ops={"ip_address": "inet_ops"}, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sessions_ip_address", table_name="sessions")
+    op.alter_column(
+        "sessions", "ip_address", type_=sa.String(45), existing_nullable=True, postgresql_using="host(ip_address)"
+    )
+    op.drop_index("ix_ip_addresses_value", table_name="ip_addresses")
+    op.alter_column(
+        "ip_addresses", "value", type_=sa.String(45), existing_nullable=False, postgresql_using="host(value)"
+    )
@@ -0,0 +1,71 @@
+"""bitset-encoded permissions
+
+Gives every permission a stable bit position (permissions.bit, drawn from
+permissions_bit_seq and never reused) and stores each staff member's and API key's
+granted permissions as a BIGINT permission_mask, so a permission check is a single AND.
+Existing permissions get bits in creation order and existing masks are backfilled from
+staff_permissions / api_key_permissions, which stay the source of truth for listing.
+
+A signed BIGINT holds 63 bits, so the upgrade refuses to run with more than 63
+permissions.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+MAX_PERMISSION_BIT = 62
+
+MASK_TABLES = (
+    # (owner table, association table, owner column in the association table)
+    ("staffs", "staff_permissions", "staff_id"),
+    ("api_keys", "api_key_permissions", "api_key_id"),
+)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    count = conn.execute(sa.text("SELECT count(*) FROM permissions")).scalar()
+    if count > MAX_PERMISSION_BIT + 1:
+        raise RuntimeError(f"{count} permissions do not fit a 63-bit permission_mask")
+
+    op.execute(f"CREATE SEQUENCE permissions_bit_seq MINVALUE 0 MAXVALUE {MAX_PERMISSION_BIT} START 0")
+    op.add_column("permissions", sa.Column("bit", sa.SmallInteger(), nullable=True))
+    op.execute(
+        "UPDATE permissions SET bit = ranked.bit FROM "
+        "(SELECT id, row_number() OVER (ORDER BY date_created, name) - 1 AS bit FROM permissions) AS ranked "
+        "WHERE permissions.id = ranked.id"
+    )
+    if count:
+        op.execute(f"SELECT setval('permissions_bit_seq', {count - 1}, true)")
+    op.alter_column(
+        "permissions", "bit", existing_type=sa.SmallInteger(), nullable=False,
+        server_default=sa.text("nextval('permissions_bit_seq')"),
+    )
+    op.execute("ALTER SEQUENCE permissions_bit_seq OWNED BY permissions.bit")
+    op.create_unique_constraint("uq_permissions_bit", "permissions", ["bit"])
+
+    for table, association, owner in MASK_TABLES:
+        op.add_column(table, sa.Column("permission_mask", sa.BigInteger(), nullable=False, server_default="0"))
+        op.execute(
+            f"UPDATE {table} SET permission_mask = granted.mask FROM "
+            f"(SELECT a.{owner} AS owner_id, bit_or(1::bigint << p.bit) AS mask "
+            f"FROM {association} AS a JOIN permissions AS p ON p.id = a.permission_id "
+            f"GROUP BY a.{owner}) AS granted "
+            f"WHERE {table}.id = granted.owner_id"
+        )
+
+
+def downgrade() -> None:
+    for table, _, _ in MASK_TABLES:
+        op.drop_column(table, "permission_mask")
+    op.drop_constraint("uq_permissions_bit", "permissions", type_="unique")
+    # Dropping the column drops the sequence it owns
+    op.drop_column("permissions", "bit")
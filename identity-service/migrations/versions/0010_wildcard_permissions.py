@@ -0,0 +1,63 @@
+"""wildcard permission grants
+
+Adds the wildcard permissions "*" (every permission) and "<namespace>:*" for each
+namespace in use ("staff:*", "apikey:*", ...); they are granted like any other
+permission and take one bit each. The superuser, seeded with every permission row, is
+moved to the single "*" grant and its mask recomputed.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+SUPERUSER_STAFF = "SELECT id FROM staffs WHERE role = 'SUPERUSER'"
+
+
+def upgrade() -> None:
+    op.execute(
+        "INSERT INTO permissions (id, date_created, date_updated, name) "
+        "SELECT gen_random_uuid(), now(), now(), name FROM ("
+        "    SELECT '*' AS name"
+        "    UNION SELECT DISTINCT split_part(name, ':', 1) || ':*' FROM permissions WHERE name LIKE '%:%'"
+        ") AS wildcards ORDER BY name "
+        "ON CONFLICT (name) DO NOTHING"
+    )
+    op.execute(f"DELETE FROM staff_permissions WHERE staff_id IN ({SUPERUSER_STAFF})")
+    op.execute(
+        "INSERT INTO staff_permissions (staff_id, permission_id) "
+        f"SELECT s.id, p.id FROM ({SUPERUSER_STAFF}) AS s, permissions AS p WHERE p.name = '*'"
+    )
+    op.execute(
+        "UPDATE staffs SET permission_mask = 1::bigint << p.bit FROM permissions AS p "
+        f"WHERE p.name = '*' AND staffs.id IN ({SUPERUSER_STAFF})"
+    )
+
+
+def downgrade() -> None:
+    # The superuser gets every concrete permission back
+    op.execute(f"DELETE FROM staff_permissions WHERE staff_id IN ({SUPERUSER_STAFF})")
+    op.execute(
+        "INSERT INTO staff_permissions (staff_id, permission_id) "
+        f"SELECT s.id, p.id FROM ({SUPERUSER_STAFF}) AS s, permissions AS p WHERE p.name NOT LIKE '%*'"
+    )
+    op.execute(
+        "UPDATE staffs SET permission_mask = coalesce("
+        "    (SELECT bit_or(1::bigint << bit) FROM permissions WHERE name NOT LIKE '%*'), 0) "
+        f"WHERE id IN ({SUPERUSER_STAFF})"
+    )
+    # Revoking the wildcards from everyone else too; their bits are not reused
+    op.execute(
+        "UPDATE staffs SET permission_mask = permission_mask & ~coalesce("
+        "    (SELECT bit_or(1::bigint << bit) FROM permissions WHERE name LIKE '%*'), 0)"
+    )
+    op.execute(
+        "UPDATE api_keys SET permission_mask = permission_mask & ~coalesce("
+        "    (SELECT bit_or(1::bigint << bit) FROM permissions WHERE name LIKE '%*'), 0)"
+    )
+    op.execute("DELETE FROM permissions WHERE name LIKE '%*'")
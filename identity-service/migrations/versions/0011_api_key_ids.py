@@ -0,0 +1,40 @@
+"""API key ids for indexed key lookup
+
+Keys are now issued as "krypta_<key_id>.<secret>" and stored as key_id plus the
+SHA-256 of the whole key, so authentication is one point read on the unique key_id
+index. The client-supplied `secret` column (stored as given) is dropped, along with the
+partial key_hash index it was looked up by before. Existing keys keep a NULL key_id and
+cannot authenticate; reissue them.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("api_keys", sa.Column("key_id", sa.String(16), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index("ix_api_keys_key_id", "api_keys", ["key_id"], unique=True, postgresql_concurrently=True)
+        op.drop_index("ix_api_keys_active_key_hash", table_name="api_keys", postgresql_concurrently=True)
+    op.drop_column("api_keys", "secret")
+
+
+def downgrade() -> None:
+    # Secrets were never kept for keys in the new format
+    op.add_column("api_keys", sa.Column("secret", sa.String(128), nullable=False, server_default=""))
+    op.alter_column("api_keys", "secret", server_default=None)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_api_keys_active_key_hash", "api_keys", ["key_hash"],
+            postgresql_where=sa.text("is_active"), postgresql_concurrently=True,
+        )
+        op.drop_index("ix_api_keys_key_id", table_name="api_keys", postgresql_concurrently=True)
+    op.drop_column("api_keys", "key_id")
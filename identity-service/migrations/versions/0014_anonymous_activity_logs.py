@@ -0,0 +1,27 @@
+"""anonymous activity logs
+
+activity_logs.user_id becomes nullable: events without an authenticated subject
+(login_failed, requests rejected before a user is known) were rejected by the NOT NULL
+constraint and never stored. Dropping NOT NULL on the partitioned parent applies to
+every partition and only touches the catalog, no rows are rewritten.
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column("activity_logs", "user_id", nullable=True)
+
+
+def downgrade() -> None:
+    # Anonymous events cannot satisfy NOT NULL again
+    op.execute("DELETE FROM activity_logs WHERE user_id IS NULL")
+    op.alter_column("activity_logs", "user_id", nullable=False)
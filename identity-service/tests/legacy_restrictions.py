@@ -0,0 +1,36 @@
+"""The restriction checks RestrictionService.enforce replaced, kept as the reference for tests and benchmarks."""
+from fastapi import HTTPException, status
+from app.models.staff_model import StaffRole
+
+
+class LegacyRestrictionService:
+    """RestrictionService.enforce as it was before the policy table, kept as the reference."""
+
+    @staticmethod
+    def enforce(actor, target, action: str):
+        if target.role == StaffRole.SUPERUSER:
+            LegacyRestrictionService._enforce_superuser_rules(actor, target, action)
+        elif target.role == StaffRole.ADMIN:
+            LegacyRestrictionService._enforce_admin_rules(actor, target, action)
+
+    @staticmethod
+    def _enforce_superuser_rules(actor, target, action: str):
+        if actor.id != target.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You cannot perform actions on another superuser."
+            )
+        if action in ["edit"]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="The fields 'role' and 'department' for superuser cannot be edited."
+            )
+
+    @staticmethod
+    def _enforce_admin_rules(actor, target, action: str):
+        if actor.role == StaffRole.SUPERUSER:
+            return
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only superuser can manage admins."
+        )
@@ -0,0 +1,36 @@
+"""Archive block index entries, including blocks of anonymous (user_id NULL) rows."""
+from datetime import datetime, timezone
+from app.utils.activity_log_archive import ActivityLogArchive, Block
+
+START = datetime(2026, 10, 1, tzinfo=timezone.utc)
+END = datetime(2026, 10, 2, tzinfo=timezone.utc)
+USER = "5b0c3c9e-1c39-4a4f-9a5e-0d6f1c2b3a4d"
+
+
+def _block(min_user_id=None, max_user_id=None, has_anonymous=False) -> Block:
+    return Block(0, 10, 3, START, END, min_user_id, max_user_id, has_anonymous)
+
+
+def test_anonymous_block_matches_only_unfiltered_searches():
+    block = _block(has_anonymous=True)
+    assert block.may_contain(None, None, None)
+    assert not block.may_contain(USER, None, None)
+
+
+def test_mixed_block_matches_its_user_range():
+    block = _block(USER, USER, has_anonymous=True)
+    assert block.may_contain(USER, START, None)
+    assert not block.may_contain("00000000-0000-0000-0000-000000000000", None, None)
+
+
+def test_summary_skips_anonymous_blocks():
+    summary = ActivityLogArchive._summary([_block(has_anonymous=True), _block(USER, USER)])
+    assert (summary.min_user_id, summary.max_user_id, summary.has_anonymous) == (USER, USER, True)
+    assert ActivityLogArchive._summary([_block(has_anonymous=True)]).min_user_id is None
+
+
+def test_block_json_round_trip_and_old_indexes():
+    block = _block(USER, USER, has_anonymous=True)
+    assert Block.from_json(block.to_json()) == block
+    # Indexes written before has_anonymous existed
+    assert Block.from_json(block.to_json()[:7]) == _block(USER, USER)
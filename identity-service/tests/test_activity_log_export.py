@@ -0,0 +1,29 @@
+"""Range checks of activity-log exports."""
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi import HTTPException
+from app.config import settings
+from app.schemas.activity_log_schema import ActivityLogExportFilters
+from app.services.activity_log_export_service import check_stream_range
+
+SINCE = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def test_naive_bound_is_taken_as_utc():
+    filters = ActivityLogExportFilters(since=SINCE, until=datetime(2026, 10, 2))
+    check_stream_range(filters)
+    assert filters.until == datetime(2026, 10, 2, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("until", [SINCE, SINCE - timedelta(days=1)])
+def test_empty_or_reversed_range_is_rejected(until):
+    with pytest.raises(HTTPException) as exc:
+        check_stream_range(ActivityLogExportFilters(since=SINCE, until=until))
+    assert exc.value.status_code == 400
+
+
+def test_long_range_is_rejected():
+    until = SINCE + timedelta(days=settings.ACTIVITY_LOG_EXPORT_STREAM_MAX_DAYS + 1)
+    with pytest.raises(HTTPException) as exc:
+        check_stream_range(ActivityLogExportFilters(since=SINCE, until=until))
+    assert exc.value.status_code == 400
@@ -0,0 +1,30 @@
+"""The application imports and its routes and request schemas are wired up."""
+from uuid import uuid4
+import pytest
+from pydantic import ValidationError
+from app.config import settings
+from app.schemas.authz_schema import AuthzCheckRequest
+
+
+def test_app_imports_with_routes():
+    from app import app
+
+    # Building the OpenAPI schema also checks every request and response model
+    paths = set(app.openapi()["paths"])
+    assert {"/authz/check", "/authz/check/api-key", "/permissions/bits"} <= paths
+
+
+def test_authz_check_request_limits():
+    check = {"subject_id": str(uuid4()), "permission": "staff:read"}
+    assert len(AuthzCheckRequest(checks=[check]).checks) == 1
+    with pytest.raises(ValidationError):
+        AuthzCheckRequest(checks=[])
+    with pytest.raises(ValidationError):
+        AuthzCheckRequest(checks=[check] * (settings.AUTHZ_CHECK_MAX_BATCH + 1))
+
+
+def test_authz_check_requires_permission_or_action():
+    with pytest.raises(ValidationError):
+        AuthzCheckRequest(checks=[{"subject_id": str(uuid4())}])
+    with pytest.raises(ValidationError):
+        AuthzCheckRequest(checks=[{"subject_id": str(uuid4()), "action": "edit"}])
@@ -0,0 +1,35 @@
+"""SpillLog directories across process restarts."""
+from app.utils.spill_log import SpillLog
+
+OPTIONS = {"segment_bytes": 1 << 20, "fsync_interval": 0.1, "max_bytes": 1 << 24}
+
+
+def test_restart_reopens_own_directory(tmp_path):
+    # A container restart brings back the same hostname and PID, so the same directory
+    previous = SpillLog(str(tmp_path / "host-1"), **OPTIONS)
+    previous.append(b"unreplayed")
+    previous.close()
+
+    log = SpillLog(str(tmp_path / "host-1"), **OPTIONS)
+    try:
+        assert SpillLog.adopt_orphans(str(tmp_path), exclude=log.directory, **OPTIONS) == []
+        records, _ = log.read_batch(10)
+        assert records == [b"unreplayed"]
+    finally:
+        log.close()
+
+
+def test_adopts_directories_of_dead_processes(tmp_path):
+    dead = SpillLog(str(tmp_path / "host-2"), **OPTIONS)
+    dead.append(b"orphaned")
+    dead.close()
+
+    log = SpillLog(str(tmp_path / "host-1"), **OPTIONS)
+    orphans = SpillLog.adopt_orphans(str(tmp_path), exclude=log.directory, **OPTIONS)
+    try:
+        assert [orphan.directory for orphan in orphans] == [str(tmp_path / "host-2")]
+        assert orphans[0].read_batch(10)[0] == [b"orphaned"]
+    finally:
+        for orphan in orphans:
+            orphan.close()
+        log.close()